@@ -26,6 +26,9 @@ class Settings(BaseSettings):
     EMBEDDINGS_API_KEY: Optional[str] = Field(default=None)
     # HTTP timeout for agent calls in seconds (big models may need more time)
     AGENT_TIMEOUT_SECONDS: int = Field(default=120, ge=5, le=1800)
+    # Chat responses kept in a process-wide cache keyed by LLM backend, model and prompts
+    # (0 = no caching). Opt-in: with caching on, reanalyzing a PDF in-process replays earlier answers.
+    AGENT_RESPONSE_CACHE_SIZE: int = Field(default=0, ge=0, le=100_000)
 
     # Embeddings / Ollama (local)
     OLLAMA_HOST: str = Field(default="http://localhost:11434")
@@ -37,11 +40,21 @@ class Settings(BaseSettings):
     # Embedding model when using AGENT endpoint
     AGENT_EMBED_MODEL: str = Field(default="text-embedding-3-small")
     EMBEDDINGS_BASE_URL: str | None = Field(default=None)
+    # Max texts per /v1/embeddings request when using the endpoint backend
+    EMBEDDINGS_BATCH_SIZE: int = Field(default=64, ge=1, le=2048)
+    # Embedding vectors kept in a per-process cache keyed by text (0 = no caching)
+    EMBEDDINGS_CACHE_SIZE: int = Field(default=2048, ge=0, le=1_000_000)
 
     # DOI verification and lookup
     ENABLE_DOI_VERIFICATION: bool = Field(default=True)
     DOI_HTTP_TIMEOUT_SECONDS: int = Field(default=5, ge=1, le=30)
     DOI_CACHE_TTL: int = Field(default=3600, ge=0, le=24 * 3600)
+    # Optional SQLite file persisting DOI/title lookups across restarts (unset = in-memory only)
+    DOI_CACHE_PATH: Optional[str] = Field(default=None)
+    # Most DOI/title lookups kept in process memory; older entries are still served from DOI_CACHE_PATH
+    DOI_MEMORY_CACHE_SIZE: int = Field(default=4096, ge=1, le=1_000_000)
+    # How long a DOI that Crossref reports as unknown (404) stays cached (0 = don't cache misses)
+    DOI_NEGATIVE_CACHE_TTL: int = Field(default=600, ge=0, le=24 * 3600)
     # Which source to prefer when Crossref and OpenAlex scores tie: 'crossref' or 'openalex'
     DOI_TITLE_SEARCH_PREFERRED_SOURCE: str = Field(default="crossref")
 
@@ -71,6 +84,12 @@ class Settings(BaseSettings):
     QUEUE_CONCURRENCY: int = Field(default=1, ge=1)
     # Per-document processing timeout in seconds (skip after timeout)
     DOC_PROCESS_TIMEOUT_SECONDS: int = Field(default=15 * 60, ge=60, le=24 * 60 * 60)
+    # Worker processes for PyMuPDF text extraction (0 = extract in the calling thread). PyMuPDF holds
+    # the GIL while parsing, so concurrent analyses only use several cores when this is > 0.
+    PDF_EXTRACT_PROCESSES: int = Field(default=0, ge=0, le=64)
+    # Threads shared by the network calls an analysis fans out (license prompts, title search);
+    # 0 = five per CPU, since they mostly wait on I/O. Lower it for rate-limited endpoints.
+    IO_THREADS: int = Field(default=0, ge=0, le=256)
 
     # Logging
     LOG_LEVEL: str = Field(default="INFO")  # DEBUG|INFO|WARNING|ERROR|CRITICAL
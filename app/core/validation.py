@@ -2,7 +2,15 @@
 Validation utilities for input sanitization and security.
 """
 import re
-from typing import Optional
+from typing import AbstractSet, Optional
+
+# Compiled once: these helpers run for every harvested DOI candidate and every extracted link.
+_DOI_PREFIX_RE = re.compile(r"^(?:doi:|DOI:|https?://(?:dx\.)?doi\.org/)")
+_DOI_STRICT_RE = re.compile(r"^10\.\d{4,9}/[A-Za-z0-9._\-/:]+$")
+_DOI_LEADING_RE = re.compile(r"^(10\.\d{4,9}/[A-Za-z0-9._\-/:]+)")
+_DOI_TRAILING_PUNCT_RE = re.compile(r"[.,;)\]]+$")
+_DOI_RE = re.compile(r"^10\.\d{4,9}/[^\s\"<>]+$")
+_URL_RE = re.compile(r"^https?://[a-zA-Z0-9][\w\-\.]*\.[a-zA-Z]{2,}(/[^\s]*)?$")
 
 
 def is_pdf_bytes(data: bytes) -> bool:
@@ -33,7 +41,7 @@ def validate_doi(doi: Optional[str]) -> Optional[str]:
     doi = doi.strip()
 
     # Remove common prefixes and URLs
-    doi = re.sub(r"^(?:doi:|DOI:|https?://(?:dx\.)?doi\.org/)", "", doi)
+    doi = _DOI_PREFIX_RE.sub("", doi)
     doi = doi.strip()
 
     # Attempt to cut off trailing author/text fragments often appended in PDFs
@@ -41,20 +49,19 @@ def validate_doi(doi: Optional[str]) -> Optional[str]:
     if "(" in doi:
         idx = doi.find("(")
         prefix = doi[:idx].strip()
-        if re.match(r"^10\.\d{4,9}/[A-Za-z0-9._\-/:]+$", prefix):
+        if _DOI_STRICT_RE.match(prefix):
             doi = prefix
 
     # Extract the longest valid-looking DOI prefix
-    m = re.match(r"^(10\.\d{4,9}/[A-Za-z0-9._\-/:]+)", doi)
+    m = _DOI_LEADING_RE.match(doi)
     if m:
         doi = m.group(1)
 
     # Clean up trailing punctuation
-    doi = re.sub(r"[.,;)\]]+$", "", doi)
+    doi = _DOI_TRAILING_PUNCT_RE.sub("", doi)
 
     # Basic DOI pattern validation - must start with 10.
-    doi_pattern = r"^10\.\d{4,9}/[^\s\"<>]+$"
-    if re.match(doi_pattern, doi):
+    if _DOI_RE.match(doi):
         return doi
 
     return None
@@ -74,8 +81,7 @@ def validate_url(url: str) -> bool:
         return False
 
     # Basic URL pattern check
-    url_pattern = r"^https?://[a-zA-Z0-9][\w\-\.]*\.[a-zA-Z]{2,}(/[^\s]*)?$"
-    return bool(re.match(url_pattern, url))
+    return bool(_URL_RE.match(url))
 
 
 def sanitize_filename(filename: str) -> str:
@@ -110,7 +116,7 @@ def sanitize_filename(filename: str) -> str:
     return filename or "unnamed.pdf"
 
 
-def validate_file_extension(filename: str, allowed_extensions: set) -> bool:
+def validate_file_extension(filename: str, allowed_extensions: AbstractSet[str]) -> bool:
     """
     Check if a filename has an allowed extension.
 
@@ -124,5 +130,6 @@ def validate_file_extension(filename: str, allowed_extensions: set) -> bool:
     if not filename:
         return False
 
-    ext = filename.lower().rsplit(".", 1)[-1] if "." in filename else ""
-    return f".{ext}" in allowed_extensions or ext in {e.lstrip(".") for e in allowed_extensions}
+    ext = filename.rpartition(".")[2].lower() if "." in filename else ""
+    # Entries may be given with or without the leading dot ({'.pdf'} or {'pdf'})
+    return f".{ext}" in allowed_extensions or ext in allowed_extensions
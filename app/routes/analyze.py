@@ -1,7 +1,10 @@
 import os
 import hashlib
 import asyncio
-from typing import List, Literal, Optional
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.config import settings
@@ -26,6 +29,14 @@ def _is_admin(user: dict) -> bool:
     return email in (settings.ADMIN_EMAILS or [])
 
 MAX_BYTES = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+# Read size used when spooling uploads to disk for synchronous analysis
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+_PDF_EXTENSIONS = frozenset({".pdf"})
+# Batch uploads spooled and stored in GridFS at the same time
+_BATCH_STORE_CONCURRENCY = 4
+# Job status reads skip the document_ids array; documents only need what becomes a result
+_JOB_STATUS_PROJECTION = {"document_ids": 0}
+_RESULT_DOC_PROJECTION = {"status": 1, "filename": 1, "error": 1, "analysis": 1}
 
 _security = HTTPBearer(auto_error=False)
 
@@ -70,10 +81,6 @@ async def _get_required_user(credentials: Optional[HTTPAuthorizationCredentials]
 
 
 
-def _compute_sha256(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
-
-
 def _validate_pdf(file: UploadFile):
     """Validate that the uploaded file is a PDF."""
     if not file.filename:
@@ -83,12 +90,131 @@ def _validate_pdf(file: UploadFile):
     safe_filename = sanitize_filename(file.filename)
 
     # Check extension
-    if not validate_file_extension(safe_filename, {".pdf"}):
+    if not validate_file_extension(safe_filename, _PDF_EXTENSIONS):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
 
     return safe_filename
 
 
+async def _prevalidate_batch(files: List[UploadFile]) -> List[str]:
+    """
+    Check names, sizes and PDF headers for the whole batch before anything is stored, so a
+    bad file late in the batch is rejected without leaving earlier uploads orphaned in GridFS.
+    Only the leading bytes of each upload are read; streams are rewound afterwards.
+    """
+    safe_names: List[str] = []
+    for f in files:
+        safe_filename = _validate_pdf(f)
+        if f.size is not None and f.size > MAX_BYTES:
+            raise HTTPException(status_code=400, detail=f"File {safe_filename} exceeds {settings.MAX_FILE_SIZE_MB} MB limit")
+        head = await f.read(8)
+        await f.seek(0)
+        if not is_pdf_bytes(head):
+            raise HTTPException(status_code=400, detail=f"File {safe_filename} is not a valid PDF (bad header)")
+        safe_names.append(safe_filename)
+    return safe_names
+
+
+async def _spool_upload(file: UploadFile, safe_filename: str, hasher: Optional[Any] = None) -> str:
+    """
+    Copy an upload to a private temp file in fixed-size chunks and return its path.
+    PDF readers open the document by path, so the full PDF never has to be held in memory;
+    oversized uploads are rejected as soon as the limit is crossed. When a hashlib object is
+    passed, it is fed the same chunks so the checksum needs no second pass.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.getpid()}_", suffix=f"_{safe_filename}")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(_UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_BYTES:
+                    raise HTTPException(status_code=400, detail=f"File exceeds {settings.MAX_FILE_SIZE_MB} MB limit")
+                out.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return tmp_path
+
+
+# Spooled uploads still being read by analyses that outlived their request, keyed by path
+_abandoned_analyses: Dict[str, Future] = {}
+
+
+@lru_cache(maxsize=1)
+def _analysis_executor() -> ThreadPoolExecutor:
+    """
+    Dedicated pool for in-request analyses. A timed-out analysis keeps its thread until it
+    returns, so it must not occupy the event loop's default executor that Motor relies on.
+    """
+    return ThreadPoolExecutor(max_workers=settings.QUEUE_CONCURRENCY + 4, thread_name_prefix="ecoopen-sync-analyze")
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _discard_upload(tmp_path: str) -> None:
+    """Remove a spooled upload, or defer it until an abandoned analysis stops reading it."""
+    future = _abandoned_analyses.pop(tmp_path, None)
+    if future is None:
+        _remove_quietly(tmp_path)
+        return
+    # Runs immediately if the analysis finished in the meantime
+    future.add_done_callback(lambda _f: _remove_quietly(tmp_path))
+
+
+async def _run_analysis(tmp_path: str) -> PDFAnalysisResultModel:
+    """
+    Analyze a spooled PDF in a worker thread, bounded by DOC_PROCESS_TIMEOUT_SECONDS like queued
+    documents. The watchdog is the awaiting coroutine, so it works from any thread and platform.
+    A thread cannot be interrupted, so on timeout the analysis is recorded as abandoned and
+    _discard_upload leaves the temp file in place until it returns.
+    """
+    agent = AgentRunner()
+    future = _analysis_executor().submit(agent.analyze, tmp_path)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=settings.DOC_PROCESS_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        # Cancelling the wrapper only drops analyses that never started
+        if not future.done():
+            _abandoned_analyses[tmp_path] = future
+        raise TimeoutError(f"Processing timed out after {settings.DOC_PROCESS_TIMEOUT_SECONDS} seconds") from None
+
+
+async def _analyze_upload_sync(file: UploadFile, safe_filename: str) -> PDFAnalysisResultModel:
+    """Run the analysis in-process on a spooled copy of the upload (no DB dependency)."""
+    tmp_path = await _spool_upload(file, safe_filename)
+    try:
+        model_res = await _run_analysis(tmp_path)
+        model_res.source_file = safe_filename
+        return model_res
+    except EmbeddingModelMissingError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "model": settings.OLLAMA_EMBED_MODEL, "code": "embed_model_missing"})
+    except InvalidPDFError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LLMServiceError as e:
+        # Vital dependency; surface as 502 Bad Gateway
+        raise HTTPException(status_code=502, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
+    finally:
+        _discard_upload(tmp_path)
+
+
 def _to_result_model(analysis: dict, source_file: str) -> PDFAnalysisResultModel:
     return PDFAnalysisResultModel(
         title=analysis.get("title"),
@@ -113,92 +239,78 @@ async def analyze(file: UploadFile = File(...),
     Analyze a single PDF file for data and code availability information. Requires authentication.
     """
     safe_filename = _validate_pdf(file)
-    content = await file.read()
-    if len(content) > MAX_BYTES:
+    if file.size is not None and file.size > MAX_BYTES:
         raise HTTPException(status_code=400, detail=f"File exceeds {settings.MAX_FILE_SIZE_MB} MB limit")
-    # Magic header check to ensure it's a PDF
-    if not is_pdf_bytes(content):
+    # Magic header check to ensure it's a PDF (only the leading bytes are read here)
+    head = await file.read(8)
+    await file.seek(0)
+    if not is_pdf_bytes(head):
         raise HTTPException(status_code=400, detail="Invalid PDF content (bad header)")
 
     # Synchronous path focuses on core PDF reading and analysis without DB dependency
     if mode == "sync":
-        tmp_path = f"/tmp/{os.getpid()}_{safe_filename}"
-        with open(tmp_path, "wb") as f:
-            f.write(content)
-        try:
-            agent = AgentRunner()
-            model_res = await asyncio.to_thread(agent.analyze, tmp_path)
-            model_res.source_file = safe_filename
-            return model_res
-        except EmbeddingModelMissingError as e:
-            raise HTTPException(status_code=400, detail={"message": str(e), "model": settings.OLLAMA_EMBED_MODEL, "code": "embed_model_missing"})
-        except InvalidPDFError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except LLMServiceError as e:
-            # Vital dependency; surface as 502 Bad Gateway
-            raise HTTPException(status_code=502, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
-        finally:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
+        return await _analyze_upload_sync(file, safe_filename)
 
     # Default: queue mode uses Mongo + worker, with polling and sync fallback
     # Lazily import Mongo-dependent modules to allow sync mode without Mongo/motor installed
     try:
-        from app.services.db import put_file  # type: ignore
-        from app.services.mongo_ops import (
-            create_document,
-            set_document_status,
-            set_document_analysis,
-            get_document,
-            create_job,
-            set_document_job_id,
-            inc_job_progress,
-            set_job_status,
-            append_job_log,
-            get_job,
-        )  # type: ignore
+        import app.services.db  # type: ignore  # noqa: F401
+        import app.services.mongo_ops  # type: ignore  # noqa: F401
     except ImportError:
         # If queue was explicitly requested, surface 503. Otherwise, fall back to sync.
         if mode == "queue":
             raise HTTPException(status_code=503, detail="Queue mode requires Mongo dependencies (motor/pymongo). Install them or use mode=sync.")
         # Fallback to synchronous processing to keep UX working without Mongo
-        tmp_path = f"/tmp/{os.getpid()}_{safe_filename}"
-        with open(tmp_path, "wb") as f:
-            f.write(content)
-        try:
-            agent = AgentRunner()
-            model_res = await asyncio.to_thread(agent.analyze, tmp_path)
-            model_res.source_file = safe_filename
-            return model_res
-        except EmbeddingModelMissingError as e:
-            raise HTTPException(status_code=400, detail={"message": str(e), "model": settings.OLLAMA_EMBED_MODEL, "code": "embed_model_missing"})
-        except InvalidPDFError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except LLMServiceError as e:
-            # Vital dependency; surface as 502 Bad Gateway
-            raise HTTPException(status_code=502, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
-        finally:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
+        return await _analyze_upload_sync(file, safe_filename)
 
-    checksum = _compute_sha256(content)
-    grid_id = await put_file(content, safe_filename, file.content_type or "application/pdf", {
+    # Spool to disk while hashing; GridFS upload and the sync fallback both read the temp file
+    hasher = hashlib.sha256()
+    tmp_path = await _spool_upload(file, safe_filename, hasher=hasher)
+    try:
+        return await _analyze_queued(
+            tmp_path,
+            checksum=hasher.hexdigest(),
+            content_type=file.content_type or "application/pdf",
+            safe_filename=safe_filename,
+            user=user,
+        )
+    finally:
+        _discard_upload(tmp_path)
+
+
+async def _analyze_queued(
+    tmp_path: str,
+    *,
+    checksum: str,
+    content_type: str,
+    safe_filename: str,
+    user: dict,
+) -> PDFAnalysisResultModel:
+    """Store a spooled upload, queue it for the worker and wait briefly; analyze inline if no worker answers."""
+    from app.services.db import put_file_from_path  # type: ignore
+    from app.services.mongo_ops import (
+        create_document,
+        set_document_status,
+        set_document_analysis,
+        get_document,
+        create_job,
+        set_document_job_id,
+        inc_job_progress,
+        set_job_status,
+        append_job_log,
+        get_job,
+    )  # type: ignore
+
+    size = os.path.getsize(tmp_path)
+    grid_id = await put_file_from_path(tmp_path, safe_filename, content_type, {
         "filename": safe_filename,
-        "size": len(content),
+        "size": size,
         "sha256": checksum,
     })
     doc_id = await create_document(
         filename=safe_filename,
-        content_type=file.content_type or "application/pdf",
-        size=len(content),
+        content_type=content_type,
+        size=size,
         sha256=checksum,
         gridfs_id=grid_id,
         job_id=None,
@@ -215,10 +327,13 @@ async def analyze(file: UploadFile = File(...),
     interval_s = 0.5
     waited = 0.0
     while waited < timeout_s:
-        d = await get_document(doc_id)
+        # Poll only the status fields; the full analysis is read once the document is done
+        d = await get_document(doc_id, projection={"status": 1, "error": 1})
         if d and d.get("status") in {"done", "error"}:
-            if d.get("status") == "done" and d.get("analysis"):
-                return _to_result_model(d["analysis"], d.get("filename") or safe_filename)
+            if d.get("status") == "done":
+                d = await get_document(doc_id) or d
+                if d.get("analysis"):
+                    return _to_result_model(d["analysis"], d.get("filename") or safe_filename)
             err = d.get("error") or "Analysis failed"
             raise HTTPException(status_code=500, detail=err)
         await asyncio.sleep(interval_s)
@@ -226,32 +341,18 @@ async def analyze(file: UploadFile = File(...),
 
     # Fallback: no worker picked it up; do sync and finalize the job to prevent stuck 'pending'
     await set_document_status(doc_id, "processing")
-    tmp_path = f"/tmp/{os.getpid()}_{safe_filename}"
-    with open(tmp_path, "wb") as f:
-        f.write(content)
     try:
-        agent = AgentRunner()
-        model_res = await asyncio.to_thread(agent.analyze, tmp_path)
+        model_res = await _run_analysis(tmp_path)
         model_res.source_file = safe_filename
         # Persist analysis and progress; finalize job as done
         try:
-            await set_document_analysis(doc_id, {
-                "title": model_res.title,
-                "title_source": getattr(model_res, "title_source", None),
-                "doi": model_res.doi,
-                "data_availability_statement": model_res.data_availability_statement,
-                "code_availability_statement": model_res.code_availability_statement,
-                "data_sharing_license": model_res.data_sharing_license,
-                "code_license": model_res.code_license,
-                "data_links": model_res.data_links,
-                "code_links": model_res.code_links,
-                "confidence_scores": model_res.confidence_scores,
-            })
+            # Same payload the queue worker stores, so the field list lives only in the model
+            await set_document_analysis(doc_id, model_res.model_dump())
         except Exception:
             pass
         # Best-effort job progress + status/logs to avoid lingering 'pending'
         try:
-            job = await get_job(job_id)
+            job = await get_job(job_id, projection={"_id": 1})
             if job:
                 await inc_job_progress(job_id, by=1)
                 await set_job_status(job_id, "done")
@@ -284,6 +385,13 @@ async def analyze(file: UploadFile = File(...),
         except Exception:
             pass
         raise HTTPException(status_code=502, detail=str(e))
+    except TimeoutError as e:
+        try:
+            await set_job_status(job_id, "error", error=str(e))
+            await append_job_log(job_id, level="error", op="timeout", phase="error", message=str(e))
+        except Exception:
+            pass
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         try:
             await set_job_status(job_id, "error", error=str(e))
@@ -291,11 +399,6 @@ async def analyze(file: UploadFile = File(...),
         except Exception:
             pass
         raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
-    finally:
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
 
 
 @router.post("/analyze/batch", response_model=BatchStatusModel)
@@ -305,46 +408,70 @@ async def analyze_batch(files: List[UploadFile] = File(...), user: dict = Depend
         raise HTTPException(status_code=400, detail="No files uploaded")
 
     try:
-        from app.services.db import put_file  # type: ignore
+        from app.services.db import put_file_from_path, delete_file  # type: ignore
         from app.services.mongo_ops import (
             create_document,
             create_job,
-            set_document_job_id,
-            set_document_status,
+            delete_documents,
+            queue_documents,
         )  # type: ignore
     except ImportError:
         raise HTTPException(status_code=503, detail="Batch analyze requires Mongo dependencies (motor/pymongo).")
 
-    doc_ids: List[str] = []
-    for f in files:
-        safe_filename = _validate_pdf(f)
-        content = await f.read()
-        if len(content) > MAX_BYTES:
-            raise HTTPException(status_code=400, detail=f"File {safe_filename} exceeds {settings.MAX_FILE_SIZE_MB} MB limit")
-        if not is_pdf_bytes(content):
-            raise HTTPException(status_code=400, detail=f"File {safe_filename} is not a valid PDF (bad header)")
-        checksum = _compute_sha256(content)
-        grid_id = await put_file(content, safe_filename, f.content_type or "application/pdf", {
-            "filename": safe_filename,
-            "size": len(content),
-            "sha256": checksum,
-        })
-        doc_id = await create_document(
-            filename=safe_filename,
-            content_type=f.content_type or "application/pdf",
-            size=len(content),
-            sha256=checksum,
-            gridfs_id=grid_id,
-            job_id=None,
-            user_id=user["id"],
+    safe_names = await _prevalidate_batch(files)
+
+    # Each upload is spooled to disk while hashing and streamed into GridFS from there, a few
+    # files at a time: storage round trips overlap and no whole PDF is held in memory
+    store_slots = asyncio.Semaphore(_BATCH_STORE_CONCURRENCY)
+    grid_ids: List[str] = []
+
+    async def _store(f: UploadFile, safe_filename: str) -> str:
+        async with store_slots:
+            hasher = hashlib.sha256()
+            tmp_path = await _spool_upload(f, safe_filename, hasher=hasher)
+            try:
+                size = os.path.getsize(tmp_path)
+                checksum = hasher.hexdigest()
+                content_type = f.content_type or "application/pdf"
+                grid_id = await put_file_from_path(tmp_path, safe_filename, content_type, {
+                    "filename": safe_filename,
+                    "size": size,
+                    "sha256": checksum,
+                })
+                grid_ids.append(grid_id)
+                return await create_document(
+                    filename=safe_filename,
+                    content_type=content_type,
+                    size=size,
+                    sha256=checksum,
+                    gridfs_id=grid_id,
+                    job_id=None,
+                    user_id=user["id"],
+                )
+            finally:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    # Every upload runs to completion before a failure is raised, so the rollback below sees
+    # all files and documents the batch created and no sibling keeps writing afterwards
+    stored = await asyncio.gather(*(_store(f, name) for f, name in zip(files, safe_names)), return_exceptions=True)
+    failure = next((r for r in stored if isinstance(r, BaseException)), None)
+    if failure is not None:
+        # All or nothing, like the prevalidation: drop what the successful uploads left behind
+        # (best effort; cleanup errors must not mask the original failure)
+        await asyncio.gather(
+            delete_documents([r for r in stored if not isinstance(r, BaseException)]),
+            *(delete_file(grid_id) for grid_id in grid_ids),
+            return_exceptions=True,
         )
-        doc_ids.append(doc_id)
+        raise failure
+    doc_ids: List[str] = list(stored)
 
     job_id = await create_job(total=len(doc_ids), document_ids=doc_ids, user_id=user["id"], user_email=(user.get("email") if user else None))
 
-    for did in doc_ids:
-        await set_document_job_id(did, job_id)
-        await set_document_status(did, "queued")
+    await queue_documents(doc_ids, job_id)
 
     # Leave job in pending; dispatcher/worker will promote when ready
     return BatchStatusModel(job_id=job_id, status="pending", progress=BatchProgress(current=0, total=len(doc_ids)), results=[])
@@ -363,12 +490,16 @@ async def get_job(job_id: str, user: dict = Depends(_get_required_user)):
     except ImportError:
         raise HTTPException(status_code=503, detail="Job status requires Mongo dependencies (motor/pymongo).")
 
-    job = await (get_job(job_id) if _is_admin(user) else get_job_for_user(job_id, user["id"]))
+    job = await (
+        get_job(job_id, projection=_JOB_STATUS_PROJECTION)
+        if _is_admin(user)
+        else get_job_for_user(job_id, user["id"], projection=_JOB_STATUS_PROJECTION)
+    )
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     # Build results from finished documents
-    docs = await list_job_documents(job_id)
+    docs = await list_job_documents(job_id, projection=_RESULT_DOC_PROJECTION)
     results: List[PDFAnalysisResultModel] = []
     for d in docs:
         if d.get("status") == "done" and d.get("analysis"):
@@ -1,5 +1,6 @@
 import csv
 import io
+from typing import Iterable, Iterator
 from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -37,6 +38,84 @@ def _is_admin(user: dict) -> bool:
     return email in (settings.ADMIN_EMAILS or [])
 
 
+_CSV_FIELDNAMES = [
+    "source_file",
+    "filename",
+    "title",
+    "title_source",
+    "doi",
+    "doi_from_title_search",
+    "data_availability_statement",
+    "code_availability_statement",
+    "data_sharing_license",
+    "code_license",
+    "data_links_count",
+    "code_links_count",
+    "data_links",
+    "code_links",
+    "error",
+]
+
+
+# Only the fields _csv_row reads; skips debug diagnostics and other analysis payload
+_EXPORT_PROJECTION = {
+    "filename": 1,
+    "status": 1,
+    "error": 1,
+    **{
+        f"analysis.{key}": 1
+        for key in (
+            "title",
+            "title_source",
+            "doi",
+            "data_availability_statement",
+            "code_availability_statement",
+            "data_sharing_license",
+            "code_license",
+            "data_links",
+            "code_links",
+            "error",
+        )
+    },
+}
+
+
+def _csv_row(d: dict) -> dict:
+    analysis = d.get("analysis") or {}
+    filename = d.get("filename") or "unknown.pdf"
+    data_links = analysis.get("data_links") or []
+    code_links = analysis.get("code_links") or []
+    return {
+        "source_file": filename,
+        "filename": filename.split("/")[-1],
+        "title": analysis.get("title") or "",
+        "title_source": analysis.get("title_source") or "",
+        "doi": analysis.get("doi") or "",
+        "doi_from_title_search": "",  # optional enrichment could be added server-side
+        "data_availability_statement": analysis.get("data_availability_statement") or "",
+        "code_availability_statement": analysis.get("code_availability_statement") or "",
+        "data_sharing_license": analysis.get("data_sharing_license") or "",
+        "code_license": analysis.get("code_license") or "",
+        "data_links_count": len(data_links),
+        "code_links_count": len(code_links),
+        "data_links": "; ".join(data_links),
+        "code_links": "; ".join(code_links),
+        "error": d.get("error") or analysis.get("error") or "",
+    }
+
+
+def _iter_csv(docs: Iterable[dict]) -> Iterator[str]:
+    """Yield the CSV header and rows one at a time instead of buffering the whole export."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=_CSV_FIELDNAMES)
+    writer.writeheader()
+    for d in docs:
+        writer.writerow(_csv_row(d))
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
 @router.get("/export/csv/{job_id}")
 async def export_csv(job_id: str, user: dict = Depends(_get_current_user)):
     try:
@@ -48,60 +127,12 @@ async def export_csv(job_id: str, user: dict = Depends(_get_current_user)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    docs = await list_job_documents(job_id)
-    finished = [d for d in docs if d.get("status") in {"done", "error"}]
+    finished = await list_job_documents(job_id, projection=_EXPORT_PROJECTION, statuses=("done", "error"))
     if not finished:
         raise HTTPException(status_code=400, detail="Job has no results yet")
 
-    buf = io.StringIO()
-    fieldnames = [
-        "source_file",
-        "filename",
-        "title",
-        "title_source",
-        "doi",
-        "doi_from_title_search",
-        "data_availability_statement",
-        "code_availability_statement",
-        "data_sharing_license",
-        "code_license",
-        "data_links_count",
-        "code_links_count",
-        "data_links",
-        "code_links",
-        "error",
-    ]
-    writer = csv.DictWriter(buf, fieldnames=fieldnames)
-    writer.writeheader()
-
-    for d in finished:
-        analysis = d.get("analysis") or {}
-        filename = d.get("filename") or "unknown.pdf"
-        data_links = analysis.get("data_links") or []
-        code_links = analysis.get("code_links") or []
-        writer.writerow(
-            {
-                "source_file": filename,
-                "filename": filename.split("/")[-1],
-                "title": analysis.get("title") or "",
-                "title_source": analysis.get("title_source") or "",
-                "doi": analysis.get("doi") or "",
-                "doi_from_title_search": "",  # optional enrichment could be added server-side
-                "data_availability_statement": analysis.get("data_availability_statement") or "",
-                "code_availability_statement": analysis.get("code_availability_statement") or "",
-                "data_sharing_license": analysis.get("data_sharing_license") or "",
-                "code_license": analysis.get("code_license") or "",
-                "data_links_count": len(data_links),
-                "code_links_count": len(code_links),
-                "data_links": "; ".join(data_links),
-                "code_links": "; ".join(code_links),
-                "error": d.get("error") or analysis.get("error") or "",
-            }
-        )
-
-    buf.seek(0)
     return StreamingResponse(
-        buf,
+        _iter_csv(finished),
         media_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="analysis_{job_id}.csv"'},
     )
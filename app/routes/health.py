@@ -1,3 +1,6 @@
+import asyncio
+from typing import Dict, Optional
+
 from fastapi import APIRouter
 import httpx
 from app.core.config import settings
@@ -5,115 +8,126 @@ from app.models.schemas import HealthModel
 
 router = APIRouter()
 
-@router.get("/health", response_model=HealthModel)
-async def health() -> HealthModel:
-    agent_ok = False
-    embed_ok = False
 
-    # Check agent/LLM endpoint (OpenAI-compatible /models or Ollama /api/tags)
+async def _probe(
+    client: httpx.AsyncClient, url: str, headers: Dict[str, str], timeout: float
+) -> Optional[httpx.Response]:
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            headers = {}
-            if settings.AGENT_API_KEY:
-                headers["Authorization"] = f"Bearer {settings.AGENT_API_KEY}"
-            base = settings.AGENT_BASE_URL.rstrip("/")
-            bases = {base, base.removesuffix("/v1")} if base.endswith("/v1") else {base}
-            paths = []
-            for b in bases:
-                paths.extend([f"{b}/models", f"{b}/v1/models", f"{b}/api/tags"])  # Ollama
-            agent_ok = False
-            for url in paths:
-                try:
-                    r = await client.get(url, headers=headers)
-                except Exception:
-                    continue
-                if r.status_code == 200:
-                    try:
-                        data = r.json()
-                        # OpenAI style
-                        models = data.get("data") or data.get("models")
-                        if isinstance(models, list) and len(models) >= 1:
-                            agent_ok = True
-                            break
-                        # Ollama style
-                        if isinstance(data, dict) and isinstance(data.get("models"), list) and len(data["models"]) >= 1:
-                            agent_ok = True
-                            break
-                    except Exception:
-                        continue
+        return await client.get(url, headers=headers, timeout=timeout)
+    except Exception:
+        return None
+
+
+def _lists_models(r: httpx.Response) -> bool:
+    """True for a 200 model listing with at least one entry (OpenAI 'data' or Ollama 'models')."""
+    if r.status_code != 200:
+        return False
+    try:
+        data = r.json()
+        models = data.get("data") or data.get("models")
+    except Exception:
+        return False
+    return isinstance(models, list) and len(models) >= 1
+
+
+async def _check_agent(client: httpx.AsyncClient) -> bool:
+    """Agent/LLM endpoint lists models (OpenAI-compatible /models or Ollama /api/tags)."""
+    agent_ok = False
+    try:
+        headers = {}
+        if settings.AGENT_API_KEY:
+            headers["Authorization"] = f"Bearer {settings.AGENT_API_KEY}"
+        base = settings.AGENT_BASE_URL.rstrip("/")
+        bases = {base, base.removesuffix("/v1")} if base.endswith("/v1") else {base}
+        paths = []
+        for b in bases:
+            paths.extend([f"{b}/models", f"{b}/v1/models", f"{b}/api/tags"])  # Ollama
+        # Probe every candidate path at once; the slowest unreachable one no longer delays the rest
+        responses = await asyncio.gather(*(_probe(client, url, headers, 5.0) for url in paths))
+        agent_ok = any(r is not None and _lists_models(r) for r in responses)
     except Exception:
         agent_ok = False
+    return agent_ok
 
-    # Check embeddings backend
+
+async def _check_embeddings(client: httpx.AsyncClient) -> bool:
+    """Embeddings backend is reachable and serves the configured embedding model."""
+    embed_ok = False
     try:
         if (settings.EMBEDDINGS_BACKEND or "ollama").lower() == "endpoint":
             # Use AGENT_BASE_URL and verify the embedding model exists in /models
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                headers = {}
-                auth_key = settings.EMBEDDINGS_API_KEY or settings.AGENT_API_KEY
-                if auth_key:
-                    headers["Authorization"] = f"Bearer {auth_key}"
-                base = (settings.EMBEDDINGS_BASE_URL or settings.AGENT_BASE_URL).rstrip("/")
-                bases = {base, base.removesuffix("/v1")} if base.endswith("/v1") else {base}
-                paths = []
-                for b in bases:
-                    paths.extend([f"{b}/models", f"{b}/v1/models"])  # OpenAI-compatible
-                for url in paths:
-                    try:
-                        r = await client.get(url, headers=headers)
-                    except Exception:
-                        continue
-                    if r.status_code < 500:
-                        embed_ok = True
-                        try:
-                            data = r.json()
-                            items = data.get("data") or data.get("models") or []
-                            required = settings.AGENT_EMBED_MODEL
-                            found = False
-                            for it in items:
-                                if isinstance(it, dict):
-                                    mid = it.get("id") or it.get("model") or it.get("name")
-                                else:
-                                    mid = str(it)
-                                if not mid:
-                                    continue
-                                if mid == required or str(mid).startswith(f"{required}:"):
-                                    found = True
-                                    break
-                            if not found and items:
-                                embed_ok = False
-                        except Exception:
-                            # If parsing fails, leave embed_ok as reachability indicator
-                            pass
-                        break
-        else:
-            # Ollama host + required embed model available
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                r = await client.get(f"{settings.OLLAMA_HOST.rstrip('/')}/api/tags")
-                if r.status_code < 500:
+            headers = {}
+            auth_key = settings.EMBEDDINGS_API_KEY or settings.AGENT_API_KEY
+            if auth_key:
+                headers["Authorization"] = f"Bearer {auth_key}"
+            base = (settings.EMBEDDINGS_BASE_URL or settings.AGENT_BASE_URL).rstrip("/")
+            bases = {base, base.removesuffix("/v1")} if base.endswith("/v1") else {base}
+            paths = []
+            for b in bases:
+                paths.extend([f"{b}/models", f"{b}/v1/models"])  # OpenAI-compatible
+            # Probe the candidate paths together, then judge the first one that answered
+            responses = await asyncio.gather(*(_probe(client, url, headers, 3.0) for url in paths))
+            for r in responses:
+                if r is not None and r.status_code < 500:
                     embed_ok = True
                     try:
                         data = r.json()
-                        models = data.get("models") or []
-                        names = {m.get("name") or m.get("model") for m in models}
-                        # Accept names that match exactly or with a tag suffix like ":latest"
-                        required = settings.OLLAMA_EMBED_MODEL
+                        items = data.get("data") or data.get("models") or []
+                        required = settings.AGENT_EMBED_MODEL
                         found = False
-                        for n in names:
-                            if not n:
+                        for it in items:
+                            if isinstance(it, dict):
+                                mid = it.get("id") or it.get("model") or it.get("name")
+                            else:
+                                mid = str(it)
+                            if not mid:
                                 continue
-                            if n == required or str(n).startswith(f"{required}:"):
+                            if mid == required or str(mid).startswith(f"{required}:"):
                                 found = True
                                 break
-                        if not found:
+                        if not found and items:
                             embed_ok = False
                     except Exception:
-                        # If we can't parse, leave embed_ok as host reachability indicator
+                        # If parsing fails, leave embed_ok as reachability indicator
                         pass
-                else:
-                    embed_ok = False
+                    break
+        else:
+            # Ollama host + required embed model available
+            r = await client.get(f"{settings.OLLAMA_HOST.rstrip('/')}/api/tags", timeout=3.0)
+            if r.status_code < 500:
+                embed_ok = True
+                try:
+                    data = r.json()
+                    models = data.get("models") or []
+                    names = {m.get("name") or m.get("model") for m in models}
+                    # Accept names that match exactly or with a tag suffix like ":latest"
+                    required = settings.OLLAMA_EMBED_MODEL
+                    found = False
+                    for n in names:
+                        if not n:
+                            continue
+                        if n == required or str(n).startswith(f"{required}:"):
+                            found = True
+                            break
+                    if not found:
+                        embed_ok = False
+                except Exception:
+                    # If we can't parse, leave embed_ok as host reachability indicator
+                    pass
+            else:
+                embed_ok = False
     except Exception:
         embed_ok = False
+    return embed_ok
+
+
+@router.get("/health", response_model=HealthModel)
+async def health() -> HealthModel:
+    # The two backends are independent; probe them side by side so the response waits for
+    # the slower check rather than their sum. One client serves both, so a backend shared by
+    # the agent and embeddings settings reuses the same pooled connections.
+    async with httpx.AsyncClient() as client:
+        agent_ok, embed_ok = await asyncio.gather(_check_agent(client), _check_embeddings(client))
 
     return HealthModel(
         status="ok" if agent_ok and embed_ok else "degraded",
@@ -18,6 +18,12 @@ logger = logging.getLogger(__name__)
 
 _security = HTTPBearer(auto_error=False)
 
+# Job reads skip the document_ids array, which grows with the batch size
+_JOB_EXISTS_PROJECTION = {"_id": 1}
+_JOB_STATUS_PROJECTION = {"document_ids": 0}
+# Document fields the status endpoint turns into results
+_RESULT_DOC_PROJECTION = {"status": 1, "filename": 1, "error": 1, "analysis": 1}
+
 
 def _is_admin(user: dict) -> bool:
     try:
@@ -52,26 +58,20 @@ async def list_tasks(
     user: dict = Depends(_get_required_user),
 ):
     try:
-        from app.services.mongo_ops import list_user_jobs, list_all_jobs, get_queue_position  # type: ignore
+        from app.services.mongo_ops import list_user_jobs, list_all_jobs, get_queue_positions  # type: ignore
     except Exception:
         raise HTTPException(status_code=503, detail="Listing tasks requires Mongo dependencies (motor/pymongo).")
 
     rows = await (list_all_jobs(limit=limit, status=status) if _is_admin(user) else list_user_jobs(user_id=user["id"], limit=limit, status=status))
 
-    # Collect all pending job IDs to batch-calculate queue positions
+    # Resolve queue positions for all pending jobs with one scan of the pending queue
     pending_job_ids = [str(j.get("_id")) for j in rows if j.get("status") == "pending"]
     queue_positions: Dict[str, int] = {}
-    
-    # Calculate queue positions for all pending jobs
-    for job_id in pending_job_ids:
+    if pending_job_ids:
         try:
-            pos = await get_queue_position(job_id)
-            if pos is not None:
-                queue_positions[job_id] = pos
-                logger.info(f"Queue position for job {job_id}: {pos}")
+            queue_positions = await get_queue_positions(pending_job_ids)
         except Exception as e:
-            logger.error(f"Failed to get queue position for job {job_id}: {e}")
-            pass
+            logger.error("Failed to get queue positions for %d pending jobs: %s", len(pending_job_ids), e)
 
     def map_row(j: dict) -> dict:
         jid = str(j.get("_id"))
@@ -128,11 +128,15 @@ async def get_task_detail(job_id: str, user: dict = Depends(_get_required_user))
     except Exception:
         raise HTTPException(status_code=503, detail="Job status requires Mongo dependencies (motor/pymongo).")
 
-    job = await (get_job(job_id) if _is_admin(user) else get_job_for_user(job_id, user["id"]))
+    job = await (
+        get_job(job_id, projection=_JOB_STATUS_PROJECTION)
+        if _is_admin(user)
+        else get_job_for_user(job_id, user["id"], projection=_JOB_STATUS_PROJECTION)
+    )
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    docs = await list_job_documents(job_id)
+    docs = await list_job_documents(job_id, projection=_RESULT_DOC_PROJECTION)
     results: List[PDFAnalysisResultModel] = []
     for d in docs:
         if d.get("status") == "done" and d.get("analysis"):
@@ -253,7 +257,7 @@ async def rerun_task(job_id: str, user: dict = Depends(_get_required_user)):
             # Copy the document data but create fresh document for new job
             gridfs_id = doc.get("gridfs_id")
             if not gridfs_id:
-                logger.warning(f"Document {doc.get('_id')} has no gridfs_id, skipping")
+                logger.warning("Document %s has no gridfs_id, skipping", doc.get("_id"))
                 continue
                 
             new_doc_id = await create_document(
@@ -268,7 +272,7 @@ async def rerun_task(job_id: str, user: dict = Depends(_get_required_user)):
             new_document_ids.append(new_doc_id)
         except Exception as e:
             # Log error but continue with other documents
-            logger.warning(f"Failed to copy document {doc.get('_id')} for rerun: {e}")
+            logger.warning("Failed to copy document %s for rerun: %s", doc.get("_id"), e)
 
     # Update the new job with the document IDs
     try:
@@ -295,8 +299,8 @@ async def delete_task(job_id: str, user: dict = Depends(_get_required_user)):
     db = get_db()
     fs = get_fs()
 
-    # Delete associated documents and GridFS files (best-effort)
-    docs = await db["documents"].find({"job_id": job_id}).to_list(length=10000)
+    # Delete associated documents and GridFS files (best-effort); only the file ids are needed
+    docs = await db["documents"].find({"job_id": job_id}, {"gridfs_id": 1}).to_list(length=10000)
     for d in docs:
         gid = d.get("gridfs_id")
         if gid:
@@ -331,7 +335,7 @@ async def get_job_logs(
         raise HTTPException(status_code=503, detail="Logs require Mongo dependencies (motor/pymongo).")
 
     # Optional existence check to return clearer 404s
-    job = await get_job(job_id)
+    job = await get_job(job_id, projection=_JOB_EXISTS_PROJECTION)
     if not job:
         logger.info("logs endpoint: job not found for id=%s", job_id)
         raise HTTPException(status_code=404, detail="Job not found")
@@ -370,7 +374,7 @@ async def download_job_logs(
     except Exception:
         raise HTTPException(status_code=503, detail="Logs require Mongo dependencies (motor/pymongo).")
 
-    job = await get_job(job_id)
+    job = await get_job(job_id, projection=_JOB_EXISTS_PROJECTION)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -1,7 +1,24 @@
 import contextlib
+import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Iterator, Any
 
+from app.core.config import settings
+
+
+@lru_cache(maxsize=1)
+def shared_io_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool for blocking network calls fanned out within an analysis (license
+    prompts, Crossref/OpenAlex title search). The threads mostly wait on sockets, so the pool
+    is sized well past the CPU count and reused instead of spawning a pool per call.
+    """
+    workers = settings.IO_THREADS or 5 * (os.cpu_count() or 1)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ecoopen-io")
+
 
 def _kv(ctx: Dict[str, Any]) -> str:
     parts = []
@@ -15,6 +32,10 @@ def _kv(ctx: Dict[str, Any]) -> str:
 
 @contextlib.contextmanager
 def log_timing(logger, op: str, **ctx: Any) -> Iterator[None]:
+    # The key=value message is built eagerly, so skip it entirely when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        yield
+        return
     t0 = time.perf_counter()
     try:
         yield
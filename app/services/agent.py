@@ -1,24 +1,21 @@
+import hashlib
 import itertools
 import json
 import logging
 import re
+import time
+from array import array
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
-import chromadb
 import httpx
 
-try:
-    import pdfplumber  # type: ignore
-except ImportError:  # pragma: no cover - pdfplumber provided via requirements
-    pdfplumber = None
-from chromadb.config import Settings as ChromaSettings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain_core.embeddings import Embeddings
 
 from app.core.config import settings
@@ -29,27 +26,160 @@ from app.core.errors import (
 )
 from app.core.validation import validate_doi
 from app.models.schemas import PDFAnalysisResultModel
-from app.services import log_timing
+from app.services import log_timing, shared_io_executor
 from app.services.availability import AvailabilityEngine
 from app.services.llm_client import ChatMessage, get_llm_client
-from app.services.text_normalizer import PDFTextNormalizer, ParagraphBlock
+from app.services.pdf_extractor_fitz import PyMuPDFExtractor, extract_in_process, fitz
+from app.services.text_normalizer import (
+    PDFPLUMBER_AVAILABLE,
+    PDFTextNormalizer,
+    ParagraphBlock,
+    normalize_extracted_text,
+)
+
+# Chroma, the Ollama embeddings and the PyPDF loader are imported where they are first used:
+# together they add about a second to importing this module, which the API and every worker pay
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import Chroma
 
 logger = logging.getLogger(__name__)
 
+# One DOI pattern covering bare DOIs and their "doi:" / doi.org URL forms; group 1 is the DOI.
+_DOI_RE = re.compile(r"(?:doi:\s*)?(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,9}/[^\s\"<>]+)", re.IGNORECASE)
+# Start of the reference list; DOI candidates are harvested from the front matter before it
+_REFERENCES_HEADING_RE = re.compile(r"(?im)^\s*(references|bibliography)\b")
+
+# Any hint that a license is stated; without one the license extraction is skipped.
+_LICENSE_HINT_RE = re.compile(
+    r"licen[cs]|creative\s+commons|\bcc[- ]?(?:by|0)\b|\bgpl|\bapache\b|\bbsd\b|\bmit\b|public\s+domain",
+    re.IGNORECASE,
+)
+
+# License phrase -> identifier, checked in order (more specific phrases first).
+_LICENSE_PATTERNS = tuple(
+    (re.compile(pat), rep)
+    for pat, rep in (
+        (r"creative\s+commons\s+attribution\s+4\.0", "CC-BY-4.0"),
+        (r"creative\s+commons\s+attribution", "CC-BY"),
+        (r"cc[- ]by[- ]4\.0", "CC-BY-4.0"),
+        (r"cc[- ]by", "CC-BY"),
+        (r"mit\s+license", "MIT"),
+        (r"gpl\s*v?3", "GPL-3.0"),
+        (r"apache\s+2", "Apache-2.0"),
+        (r"bsd\s+3", "BSD-3-Clause"),
+        (r"bsd\s+2", "BSD-2-Clause"),
+        (r"cc0", "CC0"),
+    )
+)
+_WS_RE = re.compile(r"\s+")
+
+
+def _doi_candidates(text: str, skip_prefixes: Tuple[str, ...]) -> List[str]:
+    """Valid DOIs found in ``text`` in first-seen order, without those under ``skip_prefixes``.
+
+    Running headers repeat the article DOI on every page, so each distinct raw match is validated once.
+    """
+    seen: Dict[str, None] = {}
+    out: Dict[str, None] = {}
+    for m in _DOI_RE.finditer(text):
+        raw = m.group(1)
+        if raw in seen:
+            continue
+        seen[raw] = None
+        val = validate_doi(raw)
+        if val and not val.startswith(skip_prefixes):
+            out[val] = None
+    return list(out)
+
+
+# Availability status phrase families, highest priority first. One alternation with a named
+# group per family finds the families present in a single pass over the lowercased statement.
+# Phrases must start at a word boundary (their end is left open so "upon requests" still
+# counts). Higher-priority phrases are tried first at each position, and no phrase starts at a
+# word boundary inside a lower-priority one, so a match is never hidden by a lesser family.
+_STATUS_PHRASES = (
+    (
+        "future",
+        (
+            "will be available",
+            "will be made available",
+            "will become available",
+            "will be deposited",
+            "will be archived",
+            "available after",
+            "available upon publication",
+        ),
+    ),
+    (
+        "restricted",
+        (
+            "upon request",
+            "reasonable request",
+            "from the corresponding author",
+            "available by request",
+            "requests to the corresponding author",
+        ),
+    ),
+    (
+        "embedded",
+        (
+            "in the paper",
+            "in the article",
+            "within the article",
+            "in the supplement",
+            "supplementary material",
+            "supporting information only",
+        ),
+    ),
+)
+_STATUS_PHRASES_RE = re.compile(
+    "|".join(f"(?P<{name}>\\b(?:{'|'.join(re.escape(p) for p in phrases)}))" for name, phrases in _STATUS_PHRASES)
+)
+
+
+def _norm_license(txt: Optional[str]) -> Optional[str]:
+    """Normalize license identifiers for consistency."""
+    if not txt:
+        return None
+    t = txt.strip()
+    low = t.lower()
+    for pat, rep in _LICENSE_PATTERNS:
+        if pat.search(low):
+            return rep
+    # Fallback: collapse whitespace
+    return _WS_RE.sub(" ", t)
+
+
+@lru_cache(maxsize=1)
+def _shared_embeddings_client() -> httpx.Client:
+    """
+    Pooled client for the embeddings endpoint. Each document sends one request per batch
+    (plus retries) to the same host, so a kept-alive connection skips repeated TCP/TLS setup.
+    """
+    return httpx.Client(timeout=60.0)
+
 
 class EndpointEmbeddings(Embeddings):
     def __init__(self, base_url: str, api_key: Optional[str], model: str) -> None:
         self._base = base_url.rstrip("/")
         self._api_key = api_key or None
         self._model = model
-
-    def _headers(self):
-        h = {"Content-Type": "application/json"}
+        self._request_headers: Dict[str, str] = {"Content-Type": "application/json"}
         if self._api_key:
-            h["Authorization"] = f"Bearer {self._api_key}"
-        return h
+            self._request_headers["Authorization"] = f"Bearer {self._api_key}"
+
+    def _headers(self) -> Dict[str, str]:
+        return self._request_headers
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Send fixed-size batches: bounded request bodies, one round trip per batch instead of per text
+        size = max(1, int(settings.EMBEDDINGS_BATCH_SIZE))
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), size):
+            vectors.extend(self._embed_batch(texts[start : start + size]))
+        return vectors
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         base = self._base
         try:
             base = base.removesuffix("/v1")
@@ -61,39 +191,37 @@ class EndpointEmbeddings(Embeddings):
         last_err: Optional[Exception] = None
         for delay in delays:
             if delay:
-                import time as _t
-                _t.sleep(delay)
+                time.sleep(delay)
             try:
-                with httpx.Client(timeout=60.0) as client:
-                    r = client.post(url, json=payload, headers=self._headers())
-                    if 200 <= r.status_code < 300:
+                r = _shared_embeddings_client().post(url, json=payload, headers=self._headers())
+                if 200 <= r.status_code < 300:
+                    data = r.json()
+                    items = data.get("data") or []
+                    if not items:
+                        raise LLMServiceError("Embedding response missing data")
+                    vectors: List[List[float]] = []
+                    for item in items:
+                        vec = item.get("embedding") or item.get("vector")
+                        if not isinstance(vec, list):
+                            raise LLMServiceError("Invalid embedding format from endpoint")
+                        vectors.append(vec)
+                    return vectors
+                if r.status_code in (404, 405):
+                    body = (r.text or "")[:200]
+                    msg = "Embeddings endpoint /v1/embeddings unavailable or model not found"
+                    try:
                         data = r.json()
-                        items = data.get("data") or []
-                        if not items:
-                            raise LLMServiceError("Embedding response missing data")
-                        vectors: List[List[float]] = []
-                        for item in items:
-                            vec = item.get("embedding") or item.get("vector")
-                            if not isinstance(vec, list):
-                                raise LLMServiceError("Invalid embedding format from endpoint")
-                            vectors.append(vec)
-                        return vectors
-                    if r.status_code in (404, 405):
-                        body = (r.text or "")[:200]
-                        msg = "Embeddings endpoint /v1/embeddings unavailable or model not found"
-                        try:
-                            data = r.json()
-                            if isinstance(data, dict):
-                                errtxt = data.get("error") or data.get("message") or ""
-                                if errtxt:
-                                    msg = f"Embeddings 404: {errtxt[:180]}"
-                        except Exception:
-                            pass
-                        raise LLMServiceError(msg)
-                    if r.status_code in (408, 429) or 500 <= r.status_code < 600:
-                        last_err = LLMServiceError(f"Embeddings error {r.status_code}: {r.text[:200]}")
-                        continue
-                    raise LLMServiceError(f"Embeddings error {r.status_code}: {r.text[:200]}")
+                        if isinstance(data, dict):
+                            errtxt = data.get("error") or data.get("message") or ""
+                            if errtxt:
+                                msg = f"Embeddings 404: {errtxt[:180]}"
+                    except Exception:
+                        pass
+                    raise LLMServiceError(msg)
+                if r.status_code in (408, 429) or 500 <= r.status_code < 600:
+                    last_err = LLMServiceError(f"Embeddings error {r.status_code}: {r.text[:200]}")
+                    continue
+                raise LLMServiceError(f"Embeddings error {r.status_code}: {r.text[:200]}")
             except (httpx.TimeoutException, httpx.ConnectError) as e:
                 last_err = LLMServiceError(f"Embeddings service unavailable: {e}")
                 continue
@@ -107,6 +235,138 @@ class EndpointEmbeddings(Embeddings):
         return self.embed_documents([text])[0]
 
 
+@lru_cache(maxsize=4)
+def _shared_availability_engine(
+    data_allowed_domains: Tuple[str, ...],
+    code_allowed_domains: Tuple[str, ...],
+    deny_substrings: Tuple[str, ...],
+    dataset_doi_prefixes: Tuple[str, ...],
+) -> AvailabilityEngine:
+    """One engine (and its compiled patterns) per distinct link configuration, shared by all runners."""
+    return AvailabilityEngine(
+        data_allowed_domains=data_allowed_domains,
+        code_allowed_domains=code_allowed_domains,
+        deny_substrings=deny_substrings,
+        dataset_doi_prefixes=dataset_doi_prefixes,
+    )
+
+
+@lru_cache(maxsize=1)
+def _diagnostics_dir() -> Path:
+    """Availability diagnostics directory, created once per process rather than per analysis."""
+    log_dir = Path(__file__).resolve().parent.parent / "logs" / "availability"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir
+
+
+@lru_cache(maxsize=1)
+def _shared_chroma_client():
+    """
+    Chroma client, created on first use and then shared. Runners that never reach the vector
+    store step (failed extraction, worker start-up) don't pay for Chroma's system start.
+    """
+    import chromadb
+    from chromadb.config import Settings as ChromaSettings
+
+    try:
+        return chromadb.EphemeralClient(settings=ChromaSettings(anonymized_telemetry=False))
+    except Exception:
+        return chromadb.PersistentClient(
+            path=settings.CHROMA_DB_PATH, settings=ChromaSettings(anonymized_telemetry=False)
+        )
+
+
+@lru_cache(maxsize=1)
+def _shared_text_splitter() -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=1800,
+        chunk_overlap=250,
+        length_function=len,
+    )
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Process-wide embedding cache in front of any embeddings backend, keyed by a blake2b digest
+    of the text. Reruns of the same PDF and the fixed retrieval queries are served from memory
+    instead of being re-embedded; only cache misses reach the backend, in a single batch.
+    Vectors are held as float32 arrays (a quarter of a list of Python floats) and at most
+    EMBEDDINGS_CACHE_SIZE of them are kept.
+    """
+
+    _cache: Dict[str, array] = {}
+
+    def __init__(self, inner: Embeddings, namespace: str) -> None:
+        self._inner = inner
+        self._namespace = namespace
+
+    def _key(self, text: str, kind: str) -> str:
+        # Backends may embed queries and documents differently (instruction prefixes)
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+        return f"{self._namespace}:{kind}:{digest}"
+
+    def _store(self, key: str, vector: List[float]) -> None:
+        max_entries = settings.EMBEDDINGS_CACHE_SIZE
+        if not max_entries:
+            return
+        while len(self._cache) >= max_entries:
+            # Evict the oldest entry (dicts keep insertion order)
+            try:
+                del self._cache[next(iter(self._cache))]
+            except (StopIteration, KeyError, RuntimeError):
+                break
+        self._cache[key] = array("f", vector)
+
+    def _cached(self, key: str) -> Optional[List[float]]:
+        vec = self._cache.get(key)
+        return vec.tolist() if vec is not None else None
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(t, "doc") for t in texts]
+        vectors: List[Optional[List[float]]] = [self._cached(k) for k in keys]
+        # First position of each distinct uncached text; repeated texts are embedded once
+        missing: Dict[str, int] = {}
+        for i, v in enumerate(vectors):
+            if v is None:
+                missing.setdefault(keys[i], i)
+        if missing:
+            fresh = dict(zip(missing, self._inner.embed_documents([texts[i] for i in missing.values()])))
+            for key, vec in fresh.items():
+                self._store(key, vec)
+            vectors = [v if v is not None else fresh[k] for v, k in zip(vectors, keys)]
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text, "query")
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        vec = self._inner.embed_query(text)
+        self._store(key, vec)
+        return vec
+
+
+# Process-wide chat response cache (opt-in via AGENT_RESPONSE_CACHE_SIZE), keyed by a blake2b
+# digest of the LLM backend, model and prompts. Chats run at temperature 0, so a prompt seen before
+# (a journal's template availability statement) is answered from memory rather than by the LLM again.
+_chat_cache: Dict[str, str] = {}
+
+
+def _chat_backend() -> str:
+    """Identity of the endpoint answering chats, so two backends serving one model name never share replies."""
+    if settings.MCP_ENABLED:
+        return f"mcp:{settings.MCP_SERVER_URL}:{settings.MCP_TOOL_NAME}"
+    return f"http:{settings.AGENT_BASE_URL}"
+
+
+def _chat_key(backend: str, model: str, system_prompt: str, user_prompt: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in (backend, model, system_prompt, user_prompt):
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
 class AgentRunner:
     """
     Agent-based PDF analysis runner that extracts structured information from scientific papers.
@@ -131,57 +391,81 @@ class AgentRunner:
             )
         else:
             # Default to Ollama
+            from langchain_community.embeddings import OllamaEmbeddings
+
             self._embed_backend = "ollama"
             self.embeddings = OllamaEmbeddings(
                 model=settings.OLLAMA_EMBED_MODEL,
                 base_url=settings.OLLAMA_HOST,
             )
+        embed_model = settings.AGENT_EMBED_MODEL if self._embed_backend == "endpoint" else settings.OLLAMA_EMBED_MODEL
+        self.embeddings = CachedEmbeddings(self.embeddings, namespace=f"{self._embed_backend}:{embed_model}")
 
-        try:
-            self._chroma_client = chromadb.EphemeralClient(settings=ChromaSettings(anonymized_telemetry=False))
-        except Exception:
-            self._chroma_client = chromadb.PersistentClient(
-                path=settings.CHROMA_DB_PATH, settings=ChromaSettings(anonymized_telemetry=False)
-            )
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1800,
-            chunk_overlap=250,
-            length_function=len,
-        )
+        # Stateless helpers are shared across runners (the worker builds one runner per document)
+        self.text_splitter = _shared_text_splitter()
         # OpenAI-compatible endpoint config (HTTP-based client)
         self._agent_base_url = settings.AGENT_BASE_URL.rstrip("/")
         self._agent_model = settings.AGENT_MODEL
         self._agent_api_key = settings.AGENT_API_KEY
-        self._text_normalizer = PDFTextNormalizer() if pdfplumber is not None else None
-        self._availability_engine = AvailabilityEngine(
-            data_allowed_domains=settings.DATA_LINK_ALLOWED_DOMAINS,
-            code_allowed_domains=settings.CODE_LINK_ALLOWED_DOMAINS,
-            deny_substrings=settings.LINK_DENY_SUBSTRINGS,
-            dataset_doi_prefixes=settings.DATA_LINK_DATASET_DOI_PREFIXES,
+        # PyMuPDF is the primary (native, fastest) text backend; pdfplumber and pypdf are fallbacks
+        self._fitz_extractor = PyMuPDFExtractor() if fitz is not None else None
+        self._text_normalizer = PDFTextNormalizer() if PDFPLUMBER_AVAILABLE else None
+        self._availability_engine = _shared_availability_engine(
+            tuple(settings.DATA_LINK_ALLOWED_DOMAINS),
+            tuple(settings.CODE_LINK_ALLOWED_DOMAINS),
+            tuple(settings.LINK_DENY_SUBSTRINGS),
+            tuple(settings.DATA_LINK_DATASET_DOI_PREFIXES),
         )
 
     def _chat(self, system_prompt: str, user_prompt: str) -> str:
         """Send a chat completion via configured LLM client (HTTP or MCP)."""
+        max_entries = settings.AGENT_RESPONSE_CACHE_SIZE
+        key = _chat_key(_chat_backend(), self._agent_model, system_prompt, user_prompt) if max_entries else None
+        if key is not None:
+            cached = _chat_cache.get(key)
+            if cached is not None:
+                return cached
         client = get_llm_client()
         messages = [
             ChatMessage(role="system", content=system_prompt),
             ChatMessage(role="user", content=user_prompt),
         ]
         with log_timing(logger, "llm_chat", model=self._agent_model, **self._ctx):
-            return client.chat_complete(messages, model=self._agent_model, temperature=0.0)
+            out = client.chat_complete(messages, model=self._agent_model, temperature=0.0)
+        # Empty replies are not cached so a flaky backend gets another chance next time
+        if key is not None and out:
+            if len(_chat_cache) >= max_entries:
+                # Evict the oldest entry (dicts keep insertion order)
+                try:
+                    del _chat_cache[next(iter(_chat_cache))]
+                except (StopIteration, KeyError, RuntimeError):
+                    pass
+            _chat_cache[key] = out
+        return out
 
     def _load_pdf_blocks(self, pdf_path: str) -> List[ParagraphBlock]:
         try:
             # Try PyMuPDF first (fastest and cleanest for text PDFs)
-            try:
-                from app.services.pdf_extractor_fitz import PyMuPDFExtractor
-                extractor = PyMuPDFExtractor()
-                blocks = extractor.extract(pdf_path)
-                if blocks:
-                    logger.debug("Used PyMuPDF for text extraction")
-                    return blocks
-            except Exception as exc:
-                logger.debug("PyMuPDF extraction failed: %s", exc)
+            if self._fitz_extractor is not None:
+                try:
+                    if settings.PDF_EXTRACT_PROCESSES > 0:
+                        blocks = extract_in_process(
+                            pdf_path, settings.PDF_EXTRACT_PROCESSES, timeout=settings.DOC_PROCESS_TIMEOUT_SECONDS
+                        )
+                    else:
+                        blocks = self._fitz_extractor.extract(pdf_path)
+                    if blocks:
+                        logger.debug("Used PyMuPDF for text extraction")
+                        return blocks
+                except FuturesTimeoutError:
+                    raise InvalidPDFError(
+                        f"PDF extraction timed out after {settings.DOC_PROCESS_TIMEOUT_SECONDS}s"
+                    ) from None
+                except BrokenProcessPool as exc:
+                    # Retried once on a fresh pool already; not a property of this PDF alone
+                    logger.warning("PyMuPDF extraction worker pool failed: %s", exc)
+                except Exception as exc:
+                    logger.debug("PyMuPDF extraction failed: %s", exc)
             
             # Fall back to pdfplumber (better for complex layouts, OCR)
             if self._text_normalizer is not None:
@@ -195,6 +479,8 @@ class AgentRunner:
 
             # Final fallback: PyPDFLoader (basic)
             logger.debug("Falling back to PyPDFLoader")
+            from langchain_community.document_loaders import PyPDFLoader
+
             loader = PyPDFLoader(pdf_path)
             docs = loader.load()
             fallback_blocks: List[ParagraphBlock] = []
@@ -220,116 +506,7 @@ class AgentRunner:
             raise InvalidPDFError(f"Failed to read PDF: {e}")
 
     def _normalize_text(self, text: str) -> str:
-        # de-hyphenate across line breaks
-        t = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
-        # join URLs broken across line breaks (e.g., http-\n s://)
-        t = re.sub(r"(https?)\s*:\s*//\s*", r"\1://", t, flags=re.IGNORECASE)
-        # normalize newlines and spaces
-        t = t.replace("\r\n", "\n").replace("\r", "\n")
-        t = re.sub(r"[ \t]{2,}", " ", t)
-
-        # Join lines that don't end with sentence-ending punctuation
-        # This handles text that wraps across lines mid-sentence
-        lines = t.split("\n")
-        merged_lines = []
-        current_line = ""
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                # Preserve paragraph breaks
-                if current_line:
-                    merged_lines.append(current_line)
-                    current_line = ""
-                if merged_lines and merged_lines[-1] != "":
-                    merged_lines.append("")
-                continue
-
-            # Check if previous line ended with sentence-ending punctuation
-            if current_line and current_line[-1] in ".!?;":
-                merged_lines.append(current_line)
-                current_line = line
-            else:
-                # Continue the sentence from previous line
-                if current_line:
-                    current_line += " " + line
-                else:
-                    current_line = line
-
-        # Add any remaining line
-        if current_line:
-            merged_lines.append(current_line)
-
-        # Join merged lines
-        t = "\n".join(merged_lines)
-        
-        # Protect URLs from OCR repair by temporarily replacing them
-        url_placeholders: List[Tuple[str, str]] = []
-        url_pattern = re.compile(r'https?://[^\s]+', re.IGNORECASE)
-        for idx, match in enumerate(url_pattern.finditer(t)):
-            placeholder = f"__URL_PLACEHOLDER_{idx}__"
-            url_placeholders.append((placeholder, match.group(0)))
-        for placeholder, url in url_placeholders:
-            t = t.replace(url, placeholder, 1)
-        
-        # Repair intra-word spaced letters caused by OCR (e.g., 't r o p i c a l i z a t i o n')
-        # Only match sequences of 5+ single letters to avoid false positives
-        def _compact_word_sequence(match: re.Match) -> str:
-            seq = match.group(0)
-            letters = seq.split()
-            # Only compact if all parts are single letters
-            if len(letters) >= 5 and all(len(letter) == 1 and letter.isalpha() for letter in letters):
-                return "".join(letters)
-            return seq
-        t = re.sub(r"(?:\b[a-zA-Z]\b\s+){4,}[a-zA-Z]\b", _compact_word_sequence, t)
-        
-        # Restore URLs
-        for placeholder, url in url_placeholders:
-            t = t.replace(placeholder, url)
-
-        # Now extract sentences and ensure proper separation
-        # Split on sentence-ending punctuation (. ! ? ;) followed by whitespace
-        parts = re.split(r"([.!?;])\s+", t)
-
-        sentences = []
-        current_sentence = ""
-
-        for i, part in enumerate(parts):
-            if not part:
-                continue
-
-            # If this is a punctuation mark
-            if part in ".!?;":
-                current_sentence = current_sentence.rstrip() + part
-                # Check if next part starts with capital letter or is empty (end of text)
-                if i + 1 < len(parts):
-                    next_part = parts[i + 1].strip()
-                    # Add sentence if it's complete (next part starts with capital/digit or is empty)
-                    if current_sentence.strip() and (not next_part or next_part[0].isupper() or next_part[0].isdigit()):
-                        sentences.append(current_sentence.strip())
-                        current_sentence = ""
-                    elif current_sentence.strip():
-                        # Keep building the sentence (e.g., for abbreviations)
-                        current_sentence += " "
-                else:
-                    # Last punctuation mark
-                    if current_sentence.strip():
-                        sentences.append(current_sentence.strip())
-                        current_sentence = ""
-            else:
-                current_sentence += part.strip() + " "
-
-        # Add any remaining text as final sentence
-        if current_sentence.strip():
-            sentences.append(current_sentence.strip())
-
-        # Join sentences with newlines to ensure proper separation
-        result = "\n".join(sentences)
-
-        # Clean up excessive newlines
-        result = re.sub(r"\n{3,}", "\n\n", result)
-
-        return result
+        return normalize_extracted_text(text)
 
     def _heuristic_title(self, blocks: Sequence[ParagraphBlock]) -> Optional[str]:
         stopword_pattern = re.compile(
@@ -347,7 +524,8 @@ class AgentRunner:
                 break
             if block.column > 0:
                 continue
-            candidate = self._normalize_text(block.text).strip()
+            normalized = block.normalized if block.normalized is not None else self._normalize_text(block.text)
+            candidate = normalized.strip()
             candidate = re.sub(r"\s+", " ", candidate)
             
             # Skip journal headers (e.g., "Molecular Ecology (2000) 9, 1319-1324")
@@ -374,23 +552,30 @@ class AgentRunner:
     def _chunk(self, text: str) -> List[str]:
         return self.text_splitter.split_text(text)
 
-    def _vector_store(self, chunks: List[str]) -> Chroma:
+    def _vector_store(self, chunks: List[str]) -> "Chroma":
+        from langchain_community.vectorstores import Chroma
+
         collection_name = f"pdf_analysis_{uuid4().hex[:8]}"
+        # Repeated chunks (running headers, boilerplate pages) would each be embedded and
+        # stored, then crowd out distinct passages in similarity search; keep one of each
+        unique_chunks = [c for c in dict.fromkeys(chunks) if c.strip()]
         return Chroma.from_texts(
-            texts=chunks,
+            texts=unique_chunks,
             embedding=self.embeddings,
-            client=self._chroma_client,
+            client=_shared_chroma_client(),
             collection_name=collection_name,
         )
 
-    def _similarity_context(self, vs: Chroma, query: str, k: int) -> str:
+    def _similarity_context(self, vs: "Chroma", query: str, k: int) -> str:
         docs = vs.similarity_search(query, k=k)
         return "\n".join([d.page_content for d in docs])
 
-    def _similarity_context_multi(self, vs: Chroma, queries: List[str], k_each: int = 4, max_chars: int = 12000) -> str:
+    def _similarity_context_multi(self, vs: "Chroma", queries: List[str], k_each: int = 4, max_chars: int = 12000) -> str:
         seen = set()
         parts: List[str] = []
-        for q in queries:
+        total = 0
+        # Repeated queries would only return chunks already collected
+        for q in dict.fromkeys(queries):
             try:
                 docs = vs.similarity_search(q, k=k_each)
             except (ValueError, RuntimeError):
@@ -400,14 +585,15 @@ class AgentRunner:
                 if t and t not in seen:
                     seen.add(t)
                     parts.append(t)
-            if sum(len(p) for p in parts) >= max_chars:
+                    total += len(t)
+            if total >= max_chars:
                 break
         ctx = "\n".join(parts)
         if len(ctx) > max_chars:
             ctx = ctx[:max_chars]
         return ctx
 
-    def _extract_single(self, vs: Chroma, query: str, system: str, label: str, k: int = 6) -> Optional[str]:
+    def _extract_single(self, vs: "Chroma", query: str, system: str, label: str, k: int = 6) -> Optional[str]:
         ctx = self._similarity_context(vs, query=query, k=k)
         user = f"Text:\n{ctx}\n\nReturn ONLY the {label} or 'None'."
         out = self._chat(system, user)
@@ -422,16 +608,14 @@ class AgentRunner:
         if not s:
             return None
         s = s.strip()
-        m = re.search(r"(?:doi:\s*)?(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,9}/[^\s\"<>]+)", s, flags=re.IGNORECASE)
+        m = _DOI_RE.search(s)
         if m:
             return validate_doi(m.group(1))
         return validate_doi(s)
 
     def _persist_diagnostics(self, diagnostics: Dict[str, object]) -> None:
         try:
-            base_dir = Path(__file__).resolve().parent.parent
-            log_dir = base_dir / "logs" / "availability"
-            log_dir.mkdir(parents=True, exist_ok=True)
+            log_dir = _diagnostics_dir()
             timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
             context_id = str(
                 self._ctx.get("doc_id")
@@ -449,6 +633,8 @@ class AgentRunner:
             with logfile.open("w", encoding="utf-8") as fh:
                 json.dump(payload, fh, ensure_ascii=False, indent=2)
         except Exception:
+            # Directory may have been removed underneath us; re-create it on the next run
+            _diagnostics_dir.cache_clear()
             logger.exception("Failed to persist availability diagnostics")
 
     def analyze(self, pdf_path: str) -> PDFAnalysisResultModel:
@@ -456,12 +642,19 @@ class AgentRunner:
         with log_timing(logger, "load_pdf", **self._ctx):
             blocks = self._load_pdf_blocks(pdf_path)
         with log_timing(logger, "normalize_text", **self._ctx):
-            normalized_pages = [self._normalize_text(block.text) for block in blocks]
+            # Blocks from extraction worker processes arrive already normalized
+            normalized_pages = []
+            for block in blocks:
+                if block.normalized is None:
+                    block.normalized = self._normalize_text(block.text)
+                normalized_pages.append(block.normalized)
             normalized = "\n\n".join(normalized_pages)
+        # Blocks come in page order, so first-page stats stop at the first block of page 2
+        first_page = list(itertools.takewhile(lambda b: b.page == 1, blocks))
         normalizer_meta = {
             "block_count": len(blocks),
-            "first_page_blocks": sum(1 for b in blocks if b.page == 1),
-            "columns_first_page": len({b.column for b in blocks if b.page == 1}),
+            "first_page_blocks": len(first_page),
+            "columns_first_page": len({b.column for b in first_page}),
             "first_block_preview": blocks[0].text[:200] if blocks else None,
         }
 
@@ -501,196 +694,199 @@ class AgentRunner:
         sys_data_license = "Extract ONLY explicit data sharing license text if present.\n" "Return 'None' if absent."
         sys_code_license = "Extract ONLY explicit code/software license text if present.\n" "Return 'None' if absent."
 
-        availability = self._availability_engine.extract(
-            normalized_pages,
-            chat_fn=lambda system, user: self._chat(system, user),
-            diagnostics=True,
-        )
-        if availability.diagnostics:
-            availability.diagnostics.setdefault("normalizer", normalizer_meta)
-            logger.debug("availability_diagnostics %s", availability.diagnostics)
-            self._persist_diagnostics(availability.diagnostics)
-
-        data_stmt = availability.data_statement
-        code_stmt = availability.code_statement
-        data_links = availability.data_links
-        code_links = availability.code_links
-        confidence_scores: Dict[str, float] = dict(availability.confidence_scores)
-        debug_info = availability.diagnostics if settings.EXPOSE_AVAILABILITY_DEBUG else None
-
-        # DOI: harvest candidates from front matter with heuristic scoring
-        doi = None
-        doi_candidates: List[str] = []
-        refs_match = re.search(r"(?im)^\s*(references|bibliography)\b", normalized)
-        front_matter = normalized[: refs_match.start()] if refs_match else normalized
-        front_matter = front_matter[:20000]
-
-        doi_patterns = [
-            r"(?:doi:\s*)?(?:https?://(?:dx\.)?doi\.org/)?(10\.\d{4,9}/[^\s\"<>]+)",
-            r"10\.\d{4,9}/[^\s\"<>]+",
-        ]
-        for pat in doi_patterns:
-            for m in re.finditer(pat, front_matter, flags=re.IGNORECASE):
-                grp = m.group(1) if m.lastindex else m.group(0)
-                val = validate_doi(grp)
-                if val:
-                    # Avoid dataset DOIs (zenodo/dryad/osf) being mistaken as article DOI
-                    if any(val.startswith(p + "/") for p in settings.DATA_LINK_DATASET_DOI_PREFIXES):
-                        continue
-                    doi_candidates.append(val)
-        if not doi_candidates:
-            for pat in doi_patterns:
-                for m in re.finditer(pat, normalized, flags=re.IGNORECASE):
-                    grp = m.group(1) if m.lastindex else m.group(0)
-                    val = validate_doi(grp)
-                    if val:
-                        if any(val.startswith(p + "/") for p in settings.DATA_LINK_DATASET_DOI_PREFIXES):
-                            continue
-                        doi_candidates.append(val)
-        # Deduplicate preserve order
-        seen_d = set()
-        ordered_candidates: List[str] = []
-        for c in doi_candidates:
-            if c not in seen_d:
-                seen_d.add(c)
-                ordered_candidates.append(c)
-
-        # Score candidates
-        candidate_scores: Dict[str, float] = {}
-        candidate_pos: Dict[str, int] = {}
-        for c in ordered_candidates:
-            pos = front_matter.find(c)
-            if pos < 0:
-                pos = normalized.find(c)
-            base = 1.0 if 0 <= pos < 5000 else 0.6
-            ctx = normalized[max(0, pos - 30): pos + len(c) + 30] if pos >= 0 else ""
-            boost = 0.0
-            if re.search(r"doi:\s*" + re.escape(c), ctx, flags=re.IGNORECASE):
-                boost += 0.4
-            if re.search(r"https?://(?:dx\.)?doi\.org/" + re.escape(c), ctx, flags=re.IGNORECASE):
-                boost += 0.3
-            score = round(base + boost, 3)
-            candidate_scores[c] = float(score)
-            candidate_pos[c] = int(pos)
-
-        # Select preliminary DOI by score
-        doi_prelim = None
-        if candidate_scores:
-            doi_prelim = max(candidate_scores.keys(), key=lambda k: candidate_scores[k])
-            doi = doi_prelim
-            confidence_scores["doi"] = min(1.0, float(candidate_scores[doi_prelim]))
-
-        # If still no DOI, LLM fallback with hallucination guard
-        if not doi:
-            doi_ctx = self._similarity_context_multi(
-                vs,
-                [
-                    "DOI digital object identifier citation reference",
-                    "https doi.org 10. journal article identifier",
-                    "front matter citation DOI",
-                ],
-                k_each=4,
-                max_chars=4000,
+        # Licenses: two independent, network-bound LLM round trips that only need the vector
+        # store. Start them now so they overlap the availability, DOI and title work below.
+        # Papers that never mention a license get no LLM calls at all (the answer would be 'None').
+        license_futures = None
+        if _LICENSE_HINT_RE.search(normalized):
+            license_pool = shared_io_executor()
+            license_futures = (
+                license_pool.submit(
+                    self._extract_single,
+                    vs,
+                    query="data sharing license Creative Commons CC BY MIT GPL Apache proprietary dataset license",
+                    system=sys_data_license,
+                    label="data sharing license",
+                    k=6,
+                ),
+                license_pool.submit(
+                    self._extract_single,
+                    vs,
+                    query="code license software license MIT GPL Apache BSD Creative Commons proprietary licensing",
+                    system=sys_code_license,
+                    label="code license",
+                    k=6,
+                ),
             )
-            if doi_ctx:
-                if len(doi_ctx) > 4000:
-                    doi_ctx = doi_ctx[:4000]
-                try:
-                    doi_raw = self._chat(sys_doi, f"Text:\n{doi_ctx}\n\nReturn ONLY the DOI or 'None'.")
-                except LLMServiceError as exc:
-                    logger.warning("doi_chat_failed: %s", exc)
-                    doi_raw = None
-                cand = self._validate_doi(doi_raw) if doi_raw else None
-                if cand and cand in normalized:
-                    doi = cand
-                    confidence_scores["doi"] = 0.5
-        if not doi:
-            # Final regex sweep
-            for pat in [
-                r"10\.\d{4,9}/[^\s\"<>]+",
-                r"doi:\s*(10\.\d{4,9}/[^\s\"<>]+)",
-                r"https?://(?:dx\.)?doi\.org/(10\.\d{4,9}/[^\s\"<>]+)",
-            ]:
-                m2 = re.search(pat, normalized, flags=re.IGNORECASE)
-                if m2:
-                    grp = m2.group(1) if m2.lastindex else m2.group(0)
-                    cand = validate_doi(grp)
-                    if cand and not any(cand.startswith(p + "/") for p in settings.DATA_LINK_DATASET_DOI_PREFIXES):
+
+        data_license = code_license = None
+        try:
+            availability = self._availability_engine.extract(
+                normalized_pages,
+                chat_fn=lambda system, user: self._chat(system, user),
+                diagnostics=True,
+            )
+            if availability.diagnostics:
+                availability.diagnostics.setdefault("normalizer", normalizer_meta)
+                logger.debug("availability_diagnostics %s", availability.diagnostics)
+                self._persist_diagnostics(availability.diagnostics)
+
+            data_stmt = availability.data_statement
+            code_stmt = availability.code_statement
+            data_links = availability.data_links
+            code_links = availability.code_links
+            confidence_scores: Dict[str, float] = dict(availability.confidence_scores)
+            debug_info = availability.diagnostics if settings.EXPOSE_AVAILABILITY_DEBUG else None
+
+            # DOI: harvest candidates from front matter with heuristic scoring
+            doi = None
+            # Dataset DOI registrant prefixes ("10.5061/"...), matched with one startswith(tuple)
+            dataset_doi_prefixes = tuple(p + "/" for p in settings.DATA_LINK_DATASET_DOI_PREFIXES)
+            refs_match = _REFERENCES_HEADING_RE.search(normalized)
+            front_matter = normalized[: refs_match.start()] if refs_match else normalized
+            front_matter = front_matter[:20000]
+
+            # Dataset DOIs (zenodo/dryad/osf) are skipped so they are not mistaken for the article DOI.
+            # The full-text pass runs only when the front matter has no candidate and is already
+            # the final sweep: if it finds nothing, a later scan of the same text cannot either.
+            ordered_candidates: List[str] = _doi_candidates(front_matter, dataset_doi_prefixes)
+            if not ordered_candidates:
+                ordered_candidates = _doi_candidates(normalized, dataset_doi_prefixes)
+
+            # Score candidates
+            candidate_scores: Dict[str, float] = {}
+            candidate_pos: Dict[str, int] = {}
+            for c in ordered_candidates:
+                pos = front_matter.find(c)
+                if pos < 0:
+                    pos = normalized.find(c)
+                base = 1.0 if 0 <= pos < 5000 else 0.6
+                ctx = normalized[max(0, pos - 30): pos + len(c) + 30] if pos >= 0 else ""
+                boost = 0.0
+                if re.search(r"doi:\s*" + re.escape(c), ctx, flags=re.IGNORECASE):
+                    boost += 0.4
+                if re.search(r"https?://(?:dx\.)?doi\.org/" + re.escape(c), ctx, flags=re.IGNORECASE):
+                    boost += 0.3
+                score = round(base + boost, 3)
+                candidate_scores[c] = float(score)
+                candidate_pos[c] = int(pos)
+
+            # Select preliminary DOI by score
+            doi_prelim = None
+            if candidate_scores:
+                doi_prelim = max(candidate_scores.keys(), key=lambda k: candidate_scores[k])
+                doi = doi_prelim
+                confidence_scores["doi"] = min(1.0, float(candidate_scores[doi_prelim]))
+
+            # If still no DOI, LLM fallback with hallucination guard
+            if not doi:
+                doi_ctx = self._similarity_context_multi(
+                    vs,
+                    [
+                        "DOI digital object identifier citation reference",
+                        "https doi.org 10. journal article identifier",
+                        "front matter citation DOI",
+                    ],
+                    k_each=4,
+                    max_chars=4000,
+                )
+                if doi_ctx:
+                    if len(doi_ctx) > 4000:
+                        doi_ctx = doi_ctx[:4000]
+                    try:
+                        doi_raw = self._chat(sys_doi, f"Text:\n{doi_ctx}\n\nReturn ONLY the DOI or 'None'.")
+                    except LLMServiceError as exc:
+                        logger.warning("doi_chat_failed: %s", exc)
+                        doi_raw = None
+                    cand = self._validate_doi(doi_raw) if doi_raw else None
+                    if cand and cand in normalized:
                         doi = cand
-                        confidence_scores["doi"] = max(confidence_scores.get("doi", 0.4), 0.45)
-                        break
+                        confidence_scores["doi"] = 0.5
 
-        # Prepare DOI diagnostics (verification added after title resolution)
-        scored_list = [
-            {"value": c, "pos": candidate_pos.get(c, -1), "score": candidate_scores.get(c, 0.0)}
-            for c in ordered_candidates
-        ]
-        scored_list.sort(key=lambda d: float(d.get("score", 0.0)), reverse=True)
-        doi_selected_score = candidate_scores.get(doi, 0.0) if doi else 0.0
-        doi_verification_meta = None
-        if availability.diagnostics is not None:
-            availability.diagnostics["doi_debug"] = {
-                "candidates": ordered_candidates,
-                "scored": scored_list,
-                "selected": doi,
-                "prelim_score": doi_selected_score,
-            }
-            if settings.EXPOSE_AVAILABILITY_DEBUG:
-                debug_info = availability.diagnostics
+            # Prepare DOI diagnostics (verification added after title resolution)
+            scored_list = [
+                {"value": c, "pos": candidate_pos.get(c, -1), "score": candidate_scores.get(c, 0.0)}
+                for c in ordered_candidates
+            ]
+            scored_list.sort(key=lambda d: float(d.get("score", 0.0)), reverse=True)
+            doi_selected_score = candidate_scores.get(doi, 0.0) if doi else 0.0
+            doi_verification_meta = None
+            if availability.diagnostics is not None:
+                availability.diagnostics["doi_debug"] = {
+                    "candidates": ordered_candidates,
+                    "scored": scored_list,
+                    "selected": doi,
+                    "prelim_score": doi_selected_score,
+                }
+                if settings.EXPOSE_AVAILABILITY_DEBUG:
+                    debug_info = availability.diagnostics
 
-        # Title: prefer LLM if configured, with heuristics/enrichment as fallback
-        title_source = "heuristic"
-        heuristic_title = self._heuristic_title(blocks)
-        title = None
+            # Title: prefer LLM if configured, with heuristics/enrichment as fallback
+            title_source = "heuristic"
+            heuristic_title = self._heuristic_title(blocks)
+            title = None
         
-        # Debug: Log heuristic title extraction
-        logger.debug(f"Heuristic title extracted: '{heuristic_title}' from {len(blocks)} blocks")
-
-        def _llm_title_from_front() -> Optional[str]:
-            front_blocks: List[str] = []
-            for b in blocks:
-                if b.page != 1:
-                    break
-                if b.column != 0:
-                    continue
-                txt = (b.text or '').strip()
-                if txt:
-                    front_blocks.append(re.sub(r"\s+", " ", txt))
-            front_ctx = "\n".join(front_blocks[:6])
-            if not front_ctx:
+            # Debug: Log heuristic title extraction
+            logger.debug("Heuristic title extracted: '%s' from %d blocks", heuristic_title, len(blocks))
+
+            def _llm_title_from_front() -> Optional[str]:
+                front_blocks: List[str] = []
+                for b in blocks:
+                    if b.page != 1:
+                        break
+                    if b.column != 0:
+                        continue
+                    txt = (b.text or '').strip()
+                    if txt:
+                        front_blocks.append(re.sub(r"\s+", " ", txt))
+                front_ctx = "\n".join(front_blocks[:6])
+                if not front_ctx:
+                    return None
+                try:
+                    enhanced_prompt = f"Front Matter (first page):\n{front_ctx}\n\n"
+                    enhanced_prompt += "Note: Journal headers like 'Journal Name (Year) Volume, Pages' are NOT titles. "
+                    enhanced_prompt += "Look for the actual research title that describes the study content.\n\n"
+                    enhanced_prompt += "Return ONLY the title or 'None'."
+                    logger.debug("LLM title extraction prompt: %.200s...", enhanced_prompt)
+                    raw = self._chat(sys_title, enhanced_prompt)
+                    logger.debug("LLM title raw response: '%s'", raw)
+                except LLMServiceError:
+                    raw = None
+                    logger.debug("LLM title extraction failed with LLMServiceError")
+                if raw:
+                    cleaned = raw.strip()
+                    if cleaned.lower() not in {"none", "not found", "n/a", "na", ""} and 5 <= len(cleaned) <= 300:
+                        return cleaned
                 return None
-            try:
-                enhanced_prompt = f"Front Matter (first page):\n{front_ctx}\n\n"
-                enhanced_prompt += "Note: Journal headers like 'Journal Name (Year) Volume, Pages' are NOT titles. "
-                enhanced_prompt += "Look for the actual research title that describes the study content.\n\n"
-                enhanced_prompt += "Return ONLY the title or 'None'."
-                logger.debug(f"LLM title extraction prompt: {enhanced_prompt[:200]}...")
-                raw = self._chat(sys_title, enhanced_prompt)
-                logger.debug(f"LLM title raw response: '{raw}'")
-            except LLMServiceError:
-                raw = None
-                logger.debug("LLM title extraction failed with LLMServiceError")
-            if raw:
-                cleaned = raw.strip()
-                if cleaned.lower() not in {"none", "not found", "n/a", "na", ""} and 5 <= len(cleaned) <= 300:
-                    return cleaned
-            return None
 
-        if settings.ENABLE_TITLE_LLM_PREFERRED:
-            cand = _llm_title_from_front()
-            if not cand:
-                cand = self._extract_single(
-                    vs,
-                    query="title abstract introduction paper study research",
-                    system=sys_title,
-                    label="title",
-                    k=4,
-                )
-            if cand and (10 <= len(cand) <= 300):
-                title = cand
-                title_source = "llm"
+            if settings.ENABLE_TITLE_LLM_PREFERRED:
+                cand = _llm_title_from_front()
+                if not cand:
+                    cand = self._extract_single(
+                        vs,
+                        query="title abstract introduction paper study research",
+                        system=sys_title,
+                        label="title",
+                        k=4,
+                    )
+                if cand and (10 <= len(cand) <= 300):
+                    title = cand
+                    title_source = "llm"
+                else:
+                    # Fallback to heuristic/enrichment
+                    title = heuristic_title
+                    if settings.ENABLE_TITLE_ENRICHMENT:
+                        try:
+                            from app.services.title_resolver import TitleResolver
+                            resolver = TitleResolver()
+                            enriched = resolver.resolve(blocks)
+                            if enriched.title:
+                                title = enriched.title
+                                title_source = enriched.source
+                        except Exception:
+                            pass
             else:
-                # Fallback to heuristic/enrichment
+                # Original order: heuristic -> enrichment -> LLM
                 title = heuristic_title
                 if settings.ENABLE_TITLE_ENRICHMENT:
                     try:
@@ -702,154 +898,117 @@ class AgentRunner:
                             title_source = enriched.source
                     except Exception:
                         pass
-        else:
-            # Original order: heuristic -> enrichment -> LLM
-            title = heuristic_title
-            if settings.ENABLE_TITLE_ENRICHMENT:
-                try:
-                    from app.services.title_resolver import TitleResolver
-                    resolver = TitleResolver()
-                    enriched = resolver.resolve(blocks)
-                    if enriched.title:
-                        title = enriched.title
-                        title_source = enriched.source
-                except Exception:
-                    pass
-            if not title:
-                cand = _llm_title_from_front() or self._extract_single(
-                    vs,
-                    query="title abstract introduction paper study research",
-                    system=sys_title,
-                    label="title",
-                    k=4,
-                )
-                if cand and (10 <= len(cand) <= 300):
-                    title = cand
-                    title_source = "llm"
-
-        if availability.diagnostics is not None:
-            availability.diagnostics["title_debug"] = {
-                "heuristic": heuristic_title,
-                "final": title,
-                "source": title_source if title else None,
-            }
-            if settings.EXPOSE_AVAILABILITY_DEBUG:
-                debug_info = availability.diagnostics
+                if not title:
+                    cand = _llm_title_from_front() or self._extract_single(
+                        vs,
+                        query="title abstract introduction paper study research",
+                        system=sys_title,
+                        label="title",
+                        k=4,
+                    )
+                    if cand and (10 <= len(cand) <= 300):
+                        title = cand
+                        title_source = "llm"
+
+            if availability.diagnostics is not None:
+                availability.diagnostics["title_debug"] = {
+                    "heuristic": heuristic_title,
+                    "final": title,
+                    "source": title_source if title else None,
+                }
+                if settings.EXPOSE_AVAILABILITY_DEBUG:
+                    debug_info = availability.diagnostics
 
-        # Crossref-based verification and reconciliation using title and DOI
-        if settings.ENABLE_DOI_VERIFICATION and (title or heuristic_title):
-            try:
-                from app.services.doi_registry import DOIRegistry
-                reg = DOIRegistry()
-                title_text = title or heuristic_title
-
-                # Title search: may provide a DOI candidate
-                title_rec = reg.search_by_title(title_text)
-                title_sim = reg.title_similarity(title_rec.get("title") if title_rec else None, title_text)
-
-                # Existing DOI verification, if any
-                doi_rec = reg.lookup(doi) if doi else None
-                doi_sim = reg.title_similarity(doi_rec.get("title") if doi_rec else None, title_text)
-
-                # Decide DOI based on sims
-                replaced_by_title_search = False
-                base_conf = float(confidence_scores.get("doi", 0.0))
-                strong_harvest = bool(doi and (base_conf >= 0.9))
-                if not doi and title_rec and title_rec.get("doi") and title_sim >= 0.4:
-                    doi = title_rec.get("doi")
-                    confidence_scores["doi"] = min(1.0, 0.6 + float(title_sim))
-                    replaced_by_title_search = True
-                elif doi:
-                    if not doi_rec or doi_sim < 0.2:
-                        # Only allow replacement of an existing DOI if it wasn't harvested strongly
-                        # and the title search match is clearly stronger
-                        if (not strong_harvest) and title_rec and title_rec.get("doi") and title_sim >= max(0.6, doi_sim + 0.25):
-                            doi = title_rec.get("doi")
-                            confidence_scores["doi"] = min(1.0, 0.55 + float(title_sim))
-                            replaced_by_title_search = True
+            # Crossref-based verification and reconciliation using title and DOI
+            if settings.ENABLE_DOI_VERIFICATION and (title or heuristic_title):
+                try:
+                    from app.services.doi_registry import DOIRegistry
+                    reg = DOIRegistry()
+                    title_text = title or heuristic_title
+
+                    # Existing DOI verification, if any
+                    doi_rec = reg.lookup(doi) if doi else None
+                    doi_sim = reg.title_similarity(doi_rec.get("title") if doi_rec else None, title_text)
+
+                    # Title search: may provide a DOI candidate. A DOI already confirmed by its own
+                    # registry record never gets replaced, so skip the two extra registry round trips.
+                    title_rec = None
+                    title_sim = 0.0
+                    title_search_skipped = bool(doi and doi_rec and doi_sim >= 0.2)
+                    if not title_search_skipped:
+                        title_rec = reg.search_by_title(title_text)
+                        title_sim = reg.title_similarity(title_rec.get("title") if title_rec else None, title_text)
+
+                    # Decide DOI based on sims
+                    replaced_by_title_search = False
+                    base_conf = float(confidence_scores.get("doi", 0.0))
+                    strong_harvest = bool(doi and (base_conf >= 0.9))
+                    if not doi and title_rec and title_rec.get("doi") and title_sim >= 0.4:
+                        doi = title_rec.get("doi")
+                        confidence_scores["doi"] = min(1.0, 0.6 + float(title_sim))
+                        replaced_by_title_search = True
+                    elif doi:
+                        if not doi_rec or doi_sim < 0.2:
+                            # Only allow replacement of an existing DOI if it wasn't harvested strongly
+                            # and the title search match is clearly stronger
+                            if (not strong_harvest) and title_rec and title_rec.get("doi") and title_sim >= max(0.6, doi_sim + 0.25):
+                                doi = title_rec.get("doi")
+                                confidence_scores["doi"] = min(1.0, 0.55 + float(title_sim))
+                                replaced_by_title_search = True
+                            else:
+                                base_conf = float(confidence_scores.get("doi", 0.5))
+                                confidence_scores["doi"] = max(base_conf * 0.7, 0.3)
                         else:
                             base_conf = float(confidence_scores.get("doi", 0.5))
-                            confidence_scores["doi"] = max(base_conf * 0.7, 0.3)
-                    else:
-                        base_conf = float(confidence_scores.get("doi", 0.5))
-                        confidence_scores["doi"] = min(1.0, max(base_conf, base_conf + 0.2 + float(doi_sim)))
-
-                if availability.diagnostics is not None:
-                    dd = availability.diagnostics.get("doi_debug")
-                    if not isinstance(dd, dict):
-                        dd = {}
-                    dd["verification"] = {
-                        "registry_record": doi_rec,
-                        "title_similarity": doi_sim,
-                        "verified": bool(doi_rec and doi_sim >= 0.2),
-                    }
-                    dd["title_search"] = {
-                        "record": title_rec,
-                        "title_similarity": title_sim,
-                        "used": replaced_by_title_search,
-                    }
-                    availability.diagnostics["doi_debug"] = dd
-
-                if availability.diagnostics is not None:
-                    td = availability.diagnostics.get("title_debug")
-                    if not isinstance(td, dict):
-                        td = {}
-                    td["title_verification"] = {
-                        "search_record": title_rec,
-                        "similarity": title_sim,
-                        "verified": bool(title_rec and title_sim >= 0.4),
-                    }
-                    availability.diagnostics["title_debug"] = td
+                            confidence_scores["doi"] = min(1.0, max(base_conf, base_conf + 0.2 + float(doi_sim)))
+
+                    if availability.diagnostics is not None:
+                        dd = availability.diagnostics.get("doi_debug")
+                        if not isinstance(dd, dict):
+                            dd = {}
+                        dd["verification"] = {
+                            "registry_record": doi_rec,
+                            "title_similarity": doi_sim,
+                            "verified": bool(doi_rec and doi_sim >= 0.2),
+                        }
+                        dd["title_search"] = {
+                            "record": title_rec,
+                            "title_similarity": title_sim,
+                            "used": replaced_by_title_search,
+                            "skipped": title_search_skipped,
+                        }
+                        availability.diagnostics["doi_debug"] = dd
+
+                    if availability.diagnostics is not None:
+                        td = availability.diagnostics.get("title_debug")
+                        if not isinstance(td, dict):
+                            td = {}
+                        td["title_verification"] = {
+                            "search_record": title_rec,
+                            "similarity": doi_sim if title_search_skipped else title_sim,
+                            "verified": title_search_skipped or bool(title_rec and title_sim >= 0.4),
+                        }
+                        availability.diagnostics["title_debug"] = td
 
-                if settings.EXPOSE_AVAILABILITY_DEBUG:
-                    debug_info = availability.diagnostics
-            except Exception:
-                pass
+                    if settings.EXPOSE_AVAILABILITY_DEBUG:
+                        debug_info = availability.diagnostics
+                except Exception:
+                    pass
 
-        # Licenses
-        data_license = self._extract_single(
-            vs,
-            query="data sharing license Creative Commons CC BY MIT GPL Apache proprietary dataset license",
-            system=sys_data_license,
-            label="data sharing license",
-            k=6,
-        )
+            # Licenses were submitted before the availability step; collect them now
+            if license_futures is not None:
+                data_license = license_futures[0].result()
+                code_license = license_futures[1].result()
+        finally:
+            # If any step above raised, drop license prompts that have not started yet
+            if license_futures is not None:
+                for future in license_futures:
+                    future.cancel()
         if data_license and len(data_license) < 5:
             data_license = None
-
-        code_license = self._extract_single(
-            vs,
-            query="code license software license MIT GPL Apache BSD Creative Commons proprietary licensing",
-            system=sys_code_license,
-            label="code license",
-            k=6,
-        )
         if code_license and len(code_license) < 5:
             code_license = None
         # Normalize license identifiers for consistency
-        def _norm_license(txt: Optional[str]) -> Optional[str]:
-            if not txt:
-                return None
-            t = txt.strip()
-            low = t.lower()
-            patterns = [
-                (r"creative\s+commons\s+attribution\s+4\.0", "CC-BY-4.0"),
-                (r"creative\s+commons\s+attribution", "CC-BY"),
-                (r"cc[- ]by[- ]4\.0", "CC-BY-4.0"),
-                (r"cc[- ]by", "CC-BY"),
-                (r"mit\s+license", "MIT"),
-                (r"gpl\s*v?3", "GPL-3.0"),
-                (r"apache\s+2", "Apache-2.0"),
-                (r"bsd\s+3", "BSD-3-Clause"),
-                (r"bsd\s+2", "BSD-2-Clause"),
-                (r"cc0", "CC0"),
-            ]
-            for pat, rep in patterns:
-                if re.search(pat, low):
-                    return rep
-            # Fallback: collapse whitespace and capitalize common tokens
-            t = re.sub(r"\s+", " ", t)
-            return t
         data_license = _norm_license(data_license)
         code_license = _norm_license(code_license)
 
@@ -891,45 +1050,14 @@ class AgentRunner:
         def _status_from(statement: Optional[str], links: List[str], kind: str) -> Optional[str]:
             if not statement:
                 return "none"
-            s = statement.lower()
-            # Future availability patterns
-            future_phrases = [
-                "will be available",
-                "will be made available",
-                "will become available",
-                "will be deposited",
-                "will be archived",
-                "available after",
-                "available upon publication",
-            ]
-            if any(p in s for p in future_phrases):
+            found = {m.lastgroup for m in _STATUS_PHRASES_RE.finditer(statement.lower())}
+            if "future" in found:
                 return "future"
-            # Restricted availability patterns
-            restricted_phrases = [
-                "upon request",
-                "available upon request",
-                "reasonable request",
-                "from the corresponding author",
-                "available from the corresponding author",
-                "available by request",
-                "requests to the corresponding author",
-            ]
-            if any(p in s for p in restricted_phrases):
+            if "restricted" in found:
                 return "restricted"
             # Embedded only (no external repository)
-            embedded_phrases = [
-                "in the paper",
-                "in the article",
-                "within the article",
-                "in the supplementary",
-                "in the supplement",
-                "supplementary material",
-                "supporting information only",
-                "supplementary materials",
-            ]
-            if kind == "data" and any(p in s for p in embedded_phrases):
-                if not links:
-                    return "embedded"
+            if kind == "data" and not links and "embedded" in found:
+                return "embedded"
             if links:
                 return "open"
             return "none"
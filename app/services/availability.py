@@ -1,26 +1,33 @@
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from app.core.validation import validate_url
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Paragraph:
     """Lightweight paragraph representation with metadata for validation."""
 
     text: str
     label: Optional[str]
     index: int
+    # Lowercased once here; both the data and the code ranking pass read it
+    lower: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self.lower = self.text.lower()
 
-@dataclass
+
+@dataclass(slots=True)
 class RankedContext:
     """Scored context fed to the LLM."""
 
@@ -51,8 +58,140 @@ class AvailabilityExtraction:
         return scores
 
 
+_WS_RE = re.compile(r"\s+")
+
+
 def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text.strip())
+    return _WS_RE.sub(" ", text.strip())
+
+
+# Invisible characters that break URLs in extracted text: zero-width space / non-joiner / joiner,
+# soft hyphen and zero-width no-break space (BOM)
+_INVISIBLE_CHARS = str.maketrans("", "", "\u200b\u200c\u200d\u00ad\ufeff")
+# Sentence boundary: terminal punctuation, whitespace, then an uppercase letter or digit
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[\.!?])\s+(?=[A-Z0-9])")
+_DOI_HOSTS = frozenset({"doi.org", "dx.doi.org"})
+# Paragraph breaks inside a page: two or more consecutive newlines
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+# Colon ending an inline heading ("Data availability: ..."); the "://" of an https URL (or of
+# an http URL opening the line) doesn't count
+_HEADING_COLON_RE = re.compile(r"(?<!https)(?<!^http):|:(?!//)", re.IGNORECASE)
+# One http(s) URL per match; a run stops where the next scheme begins, so fused URLs
+# ("https://a.orghttps://b.org") come out already split
+_URL_RUN_RE = re.compile(r"https?://(?:(?!https?://)[^\s)])*")
+# Zero-width split point in front of every http(s) scheme, for fused LLM link entries
+_SCHEME_START_RE = re.compile(r"(?=https?://)")
+
+_KEYWORD_PADDING = r"[-\s\w,;:/\(\)]{0,80}"
+# Subject ... availability-verb patterns used to confirm a candidate statement; compiled once and
+# shared by every engine instead of being rebuilt for each sentence checked.
+_AVAILABILITY_VERBS = {
+    "data": r"(available|accessible|deposited|provided|shared|request|archiv|badge)",
+    "code": r"(available|accessible|provided|shared|repository|github|gitlab|bitbucket)",
+}
+_AVAILABILITY_PATTERNS: Dict[str, re.Pattern] = {
+    "data": re.compile(
+        r"(?:code\s+and\s+raw\s+data|data(?:set|s)?|supplementary(?:\s+materials)?|raw data|materials|open data|data availability statement)"
+        + _KEYWORD_PADDING
+        + _AVAILABILITY_VERBS["data"],
+        re.IGNORECASE,
+    ),
+    "code": re.compile(
+        r"(code|software|scripts?|analysis|notebook|pipeline|source code|code availability statement)"
+        + _KEYWORD_PADDING
+        + _AVAILABILITY_VERBS["code"],
+        re.IGNORECASE,
+    ),
+}
+# Prefilter for the patterns above: the verbs contain no whitespace, so a text without any of
+# them cannot match in any of its sentences (or sentence pairs) either
+_AVAILABILITY_VERB_RES: Dict[str, re.Pattern] = {
+    label: re.compile(verbs, re.IGNORECASE) for label, verbs in _AVAILABILITY_VERBS.items()
+}
+
+
+_URLDEFENSE_PREFIX_RE = re.compile(r"https?://\s*urlde\s*fense\s*\.\s*com\s*/\s*v3\s*/\s*__\s*/?", re.IGNORECASE)
+_URLDEFENSE_SUFFIX_RE = re.compile(
+    r"(__\s*;?\s*!!\s*[A-Za-z0-9!$\-_\s+/=]+?)(\s+(?:and|the|on|at|in|from|or|to|is|are)\b|$)"
+)
+# Repository names split by extraction ("zenod o", "git lab"); each group is named after the
+# repaired spelling, so one substitution pass fixes all of them
+_SPACED_DOMAIN_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>" + r"\s*".join(name) + ")"
+        for name in ("zenodo", "dryad", "github", "gitlab", "osf")
+    ),
+    re.IGNORECASE,
+)
+_URL_FRAGMENT_RE = re.compile(r"(https?://[^\s]+)\s+([^\s])")
+# Spacing repairs applied to LLM quotes and fallback contexts
+_LINE_BREAK_HYPHEN_RE = re.compile(r"(\w)-\s+(\w)")
+_SPACE_BEFORE_COLON_RE = re.compile(r"\s+:")
+_URL_HOST_RE = re.compile(r"^https?://([^/]+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _canonicalize_urls(text: str) -> str:
+    """
+    Repair URLs broken by PDF extraction (invisible characters, urldefense wrappers, spaced
+    domains and fragments). Memoized: the same context text is canonicalized for ranking,
+    quote checks and link filtering, often for both the data and the code label.
+    """
+    # Step 0: Remove invisible Unicode characters (zero-width spaces, soft hyphens, etc)
+    # These are common in PDF text extraction artifacts; one C-level pass via str.translate
+    text = text.translate(_INVISIBLE_CHARS)
+    
+    # Remove urldefense wrappers (with spaces)
+    cleaned = _URLDEFENSE_PREFIX_RE.sub('', text)
+    
+    # Remove urldefense artifact suffixes like: __;!!N11eV2iwtfs!6catv...
+    # These appear after URLs as: .git__;!!randomchars$ 
+    # Stop before common words
+    cleaned = _URLDEFENSE_SUFFIX_RE.sub(r'\2', cleaned)  # Keep only the trailing word/space
+    
+    # Fix intra-domain spacing like "zenod o", "git lab"
+    cleaned = _SPACED_DOMAIN_RE.sub(lambda m: m.lastgroup, cleaned)
+
+    # Merge URL fragments
+    for _ in range(10):  # Limit iterations
+        def repl(match: re.Match[str]) -> str:
+            follower = match.group(2)
+            tail = match.string[match.end(0) : match.end(0) + 12]
+            if follower in "/?-_=.":
+                return match.group(1) + follower
+            if any(ch in "/?-_=." for ch in tail):
+                return match.group(1) + follower
+            if match.group(1).endswith(("=", "-", "_")):
+                return match.group(1) + follower
+            return match.group(1) + " " + follower
+
+        updated = _URL_FRAGMENT_RE.sub(repl, cleaned)
+        if updated == cleaned:
+            break
+        cleaned = updated
+    
+    return cleaned
+
+
+def _expand_links(links: object) -> Iterator[str]:
+    """Yield the string entries of an LLM ``links`` list, splitting fused ones at each new scheme."""
+    if not isinstance(links, (list, tuple)):
+        return
+    for entry in links:
+        if not isinstance(entry, str):
+            continue
+        if entry.count("http") > 1:
+            for part in _SCHEME_START_RE.split(entry):
+                part = part.strip()
+                if part:
+                    yield part
+        else:
+            yield entry
+
+
+def _rank_key(ctx: RankedContext) -> Tuple[float, int]:
+    # Highest score first; earlier paragraphs win ties
+    return (ctx.score, -ctx.index)
 
 
 class AvailabilityEngine:
@@ -70,6 +209,10 @@ class AvailabilityEngine:
         self._data_allowed_domains = frozenset(d.lower() for d in data_allowed_domains)
         self._code_allowed_domains = frozenset(d.lower() for d in code_allowed_domains)
         self._deny_substrings = tuple(s.lower() for s in deny_substrings)
+        # Any deny substring in one scan of the lowercased text (None when nothing is denied)
+        self._deny_re = (
+            re.compile("|".join(map(re.escape, self._deny_substrings))) if self._deny_substrings else None
+        )
         self._dataset_doi_prefixes = tuple(p.lower() for p in dataset_doi_prefixes)
         self._max_contexts = max(2, max_contexts)
 
@@ -87,6 +230,16 @@ class AvailabilityEngine:
             "code and data availability",
             "availability of code",
         )
+        # One anchored alternation per heading family: a single C-level match instead of a
+        # startswith() loop over every token for every paragraph.
+        self._heading_re = re.compile(
+            r"(?P<data>"
+            + "|".join(map(re.escape, self._data_heading_tokens))
+            + r")|(?P<code>"
+            + "|".join(map(re.escape, self._code_heading_tokens))
+            + r")",
+            re.IGNORECASE,
+        )
         self._data_keywords = (
             "data availability",
             "data availability statement",
@@ -119,6 +272,12 @@ class AvailabilityEngine:
             "open source",
             "repository",
         )
+        # Cheap prefilter for ranking: one regex scan tells whether any keyword occurs at all,
+        # so the per-keyword tally only runs for the few paragraphs that can score.
+        self._keyword_res = {
+            "data": re.compile("|".join(map(re.escape, self._data_keywords))),
+            "code": re.compile("|".join(map(re.escape, self._code_keywords))),
+        }
 
     # ------------------------------------------------------------------ public API
     def extract(
@@ -129,34 +288,12 @@ class AvailabilityEngine:
         diagnostics: bool = False,
     ) -> AvailabilityExtraction:
         paragraphs = self._segment_pages(pages)
-        data_contexts = self._rank_contexts(paragraphs, label="data")
-        code_contexts = self._rank_contexts(paragraphs, label="code")
-
-        trimmed_data = data_contexts[: self._max_contexts]
-        trimmed_code = code_contexts[: self._max_contexts]
+        trimmed_data = self._rank_contexts(paragraphs, label="data", limit=self._max_contexts)
+        trimmed_code = self._rank_contexts(paragraphs, label="code", limit=self._max_contexts)
         
         # Clean contexts before sending to LLM (remove invisible chars, fix URLs)
-        cleaned_data_contexts = []
-        for ctx in trimmed_data:
-            cleaned_text = self._canonicalize_urls(ctx.text)
-            cleaned_data_contexts.append(RankedContext(
-                label=ctx.label,
-                text=cleaned_text,
-                score=ctx.score,
-                source=ctx.source,
-                index=ctx.index
-            ))
-        
-        cleaned_code_contexts = []
-        for ctx in trimmed_code:
-            cleaned_text = self._canonicalize_urls(ctx.text)
-            cleaned_code_contexts.append(RankedContext(
-                label=ctx.label,
-                text=cleaned_text,
-                score=ctx.score,
-                source=ctx.source,
-                index=ctx.index
-            ))
+        cleaned_data_contexts = self._clean_contexts(trimmed_data)
+        cleaned_code_contexts = self._clean_contexts(trimmed_code)
 
         llm_payload = None
         llm_raw = None
@@ -211,69 +348,56 @@ class AvailabilityEngine:
         for raw_page in pages:
             if not raw_page:
                 continue
-            blocks = [block.strip() for block in re.split(r"\n{2,}", raw_page) if block.strip()]
+            blocks = [block.strip() for block in _BLANK_LINES_RE.split(raw_page) if block.strip()]
             for block in blocks:
                 normalized = _normalize_text(block)
                 label = self._infer_heading(normalized)
                 # Inline heading case: "Data availability: ..." -> split once
                 # BUT: make sure we don't split on colons inside URLs (https:// or http://)
                 if label in {"data", "code"}:
-                    # Look for heading pattern like "Data Availability:" at start of line
-                    # Use a more precise check: colon within first 80 chars, but NOT part of a URL
-                    first_line = block.split("\n")[0][:80]
-                    if ":" in first_line:
-                        # Check if this is a heading (colon not part of URL)
-                        # Find first colon that's not part of http:// or https://
-                        colon_pos = -1
-                        for i, ch in enumerate(first_line):
-                            if ch == ':':
-                                # Check if this is part of http:// or https://
-                                if i > 0 and first_line[max(0, i-5):i+3].lower() in ('http://', 'https://'):
-                                    continue
-                                # Found a real heading colon
-                                colon_pos = i
-                                break
-                        
-                        if colon_pos > 0:
-                            # Split on first non-URL colon in the whole block
-                            # Find the same position in the full block
-                            block_colon_pos = block.find(':', 0, 100)  # Search first 100 chars
-                            # Make sure it's not a URL colon
-                            if block_colon_pos > 0:
-                                before_colon = block[max(0, block_colon_pos-5):block_colon_pos].lower()
-                                after_colon = block[block_colon_pos:block_colon_pos+3]
-                                if not (before_colon.endswith(('http', 'https')) or after_colon.startswith('//')):
-                                    # This is a real heading
-                                    head = block[:block_colon_pos]
-                                    rest = block[block_colon_pos+1:]
-                                    paragraphs.append(Paragraph(text=_normalize_text(head) + ":", label=label, index=idx))
+                    # Look for heading pattern like "Data Availability:" at start of line:
+                    # colon within first 80 chars, but NOT part of a URL
+                    first_line = block.partition("\n")[0][:80]
+                    colon = _HEADING_COLON_RE.search(first_line)
+                    if colon and colon.start() > 0:
+                        # Split on first non-URL colon in the whole block
+                        # Find the same position in the full block
+                        block_colon_pos = block.find(':', 0, 100)  # Search first 100 chars
+                        # Make sure it's not a URL colon
+                        if block_colon_pos > 0:
+                            before_colon = block[max(0, block_colon_pos-5):block_colon_pos].lower()
+                            after_colon = block[block_colon_pos:block_colon_pos+3]
+                            if not (before_colon.endswith(('http', 'https')) or after_colon.startswith('//')):
+                                # This is a real heading
+                                head = block[:block_colon_pos]
+                                rest = block[block_colon_pos+1:]
+                                paragraphs.append(Paragraph(text=_normalize_text(head) + ":", label=label, index=idx))
+                                idx += 1
+                                remainder = rest.strip()
+                                if remainder:
+                                    paragraphs.append(Paragraph(text=_normalize_text(remainder), label=None, index=idx))
                                     idx += 1
-                                    remainder = rest.strip()
-                                    if remainder:
-                                        paragraphs.append(Paragraph(text=_normalize_text(remainder), label=None, index=idx))
-                                        idx += 1
-                                    continue
+                                continue
                 
                 paragraphs.append(Paragraph(text=normalized, label=label, index=idx))
                 idx += 1
         return paragraphs
 
     def _infer_heading(self, text: str) -> Optional[str]:
-        lowered = text.lower()
-        for token in self._data_heading_tokens:
-            if lowered.startswith(token):
-                return "data"
-        for token in self._code_heading_tokens:
-            if lowered.startswith(token):
-                return "code"
+        match = self._heading_re.match(text)
+        if match:
+            return "data" if match.group("data") else "code"
         if len(text.split()) <= 6 and text.isupper():
             return "generic"
         return None
 
     # ------------------------------------------------------------------ ranking
-    def _rank_contexts(self, paragraphs: Sequence[Paragraph], *, label: str) -> List[RankedContext]:
+    def _rank_contexts(
+        self, paragraphs: Sequence[Paragraph], *, label: str, limit: Optional[int] = None
+    ) -> List[RankedContext]:
         contexts: List[RankedContext] = []
         keywords = self._data_keywords if label == "data" else self._code_keywords
+        keyword_re = self._keyword_res[label]
         heading_label = label
 
         # Identify heading indices to boost the immediate following paragraphs
@@ -287,7 +411,7 @@ class AvailabilityEngine:
             if not para.text:
                 continue
             score = 0.0
-            lower = para.text.lower()
+            lower = para.lower
 
             if para.label == heading_label:
                 score += 5.0
@@ -298,9 +422,10 @@ class AvailabilityEngine:
             if para.index in neighbor_indices:
                 score += 2.2
 
-            for kw in keywords:
-                if kw in lower:
-                    score += 1.4
+            if keyword_re.search(lower):
+                for kw in keywords:
+                    if kw in lower:
+                        score += 1.4
 
             if "available" in lower and label in lower:
                 score += 1.2
@@ -309,10 +434,11 @@ class AvailabilityEngine:
             if "supplementary" in lower or "supporting information" in lower:
                 score += 0.4
 
-            if any(deny in lower for deny in self._deny_substrings):
+            if self._deny_re is not None and self._deny_re.search(lower):
                 score -= 1.5
 
-            if para.text.strip().endswith(":") and len(para.text.strip()) < 80:
+            stripped = para.text.strip()
+            if stripped.endswith(":") and len(stripped) < 80:
                 score -= 3.0
 
             if score <= 0.5:
@@ -326,9 +452,24 @@ class AvailabilityEngine:
             merged = " ".join(p.text for p in paragraphs)
             contexts.append(RankedContext(label=label, text=_normalize_text(merged), score=1.0, source="global", index=0))
 
-        contexts.sort(key=lambda c: (c.score, -c.index), reverse=True)
+        if limit is not None:
+            # Only the top few are sent to the LLM; a bounded heap avoids sorting every scored paragraph
+            return heapq.nlargest(limit, contexts, key=_rank_key)
+        contexts.sort(key=_rank_key, reverse=True)
         return contexts
 
+    def _clean_contexts(self, contexts: Sequence[RankedContext]) -> List[RankedContext]:
+        return [
+            RankedContext(
+                label=ctx.label,
+                text=self._canonicalize_urls(ctx.text),
+                score=ctx.score,
+                source=ctx.source,
+                index=ctx.index,
+            )
+            for ctx in contexts
+        ]
+
     # ------------------------------------------------------------------ prompt + parsing
     def _build_prompt(self, data_ctx: Sequence[RankedContext], code_ctx: Sequence[RankedContext]) -> Tuple[str, str]:
         system = (
@@ -413,19 +554,8 @@ class AvailabilityEngine:
             if verdict == "present" and raw_text and raw_text.lower() != "none":
                 canonical_raw = self._canonicalize_urls(self._repair_spacing(raw_text))
                 if self._quote_in_contexts(canonical_raw, contexts) and self._contains_availability_keywords(canonical_raw, label=label):
-                    safe_links = links if isinstance(links, (list, tuple)) else []
-                    # Split fused links by looking ahead at new http(s) schemes
-                    expanded_links: List[str] = []
-                    for entry in safe_links:
-                        if isinstance(entry, str) and entry.count("http") > 1:
-                            parts = re.split(r"(?=https?://)", entry)
-                            for p in parts:
-                                p = p.strip()
-                                if p:
-                                    expanded_links.append(p)
-                        elif isinstance(entry, str):
-                            expanded_links.append(entry)
-                    filtered_links = self._filter_links(canonical_raw, expanded_links, label=label)
+                    # Fused links are split lazily while _filter_links consumes them
+                    filtered_links = self._filter_links(canonical_raw, _expand_links(links), label=label)
                     final_statement_raw = str(clean_stmt).strip() if isinstance(clean_stmt, str) and clean_stmt.strip().lower() != "none" else canonical_raw
                     final_statement = self._canonicalize_urls(self._repair_spacing(final_statement_raw))
                     conf = self._normalize_confidence(confidence, base=0.75)
@@ -457,21 +587,8 @@ class AvailabilityEngine:
         return False
 
     def _contains_availability_keywords(self, text: str, *, label: str) -> bool:
-        lower = text.lower()
-        padding = r"[-\s\w,;:/\(\)]{0,80}"
-        pattern_data = re.compile(
-            r"(?:code\s+and\s+raw\s+data|data(?:set|s)?|supplementary(?:\s+materials)?|raw data|materials|open data|data availability statement)"
-            + padding
-            + r"(available|accessible|deposited|provided|shared|request|archiv|badge)",
-            re.IGNORECASE,
-        )
-        pattern_code = re.compile(
-            r"(code|software|scripts?|analysis|notebook|pipeline|source code|code availability statement)"
-            + padding
-            + r"(available|accessible|provided|shared|repository|github|gitlab|bitbucket)",
-            re.IGNORECASE,
-        )
-        return bool(pattern_data.search(text) if label == "data" else pattern_code.search(text))
+        pattern = _AVAILABILITY_PATTERNS["data"] if label == "data" else _AVAILABILITY_PATTERNS["code"]
+        return bool(pattern.search(text))
 
     def _normalize_confidence(self, value: object, *, base: float) -> float:
         if isinstance(value, (int, float)):
@@ -482,115 +599,66 @@ class AvailabilityEngine:
         return base
 
     def _trim_sentences(self, text: str, *, label: str) -> Optional[str]:
-        sentences = re.split(r"(?<=[\.!?])\s+(?=[A-Z0-9])", text.strip())
-        sentences = [s.strip() for s in sentences if s.strip()]
+        # Most fallback contexts have no availability verb at all; skip splitting and the
+        # per-sentence and sentence-pair pattern checks for them
+        key = "data" if label == "data" else "code"
+        if not _AVAILABILITY_VERB_RES[key].search(text):
+            return None
+        sentences = [s for s in map(str.strip, _SENTENCE_SPLIT_RE.split(text.strip())) if s]
         if not sentences:
             return None
+        # Bound search of the label's pattern, resolved once for every sentence and pair below
+        search = _AVAILABILITY_PATTERNS[key].search
         for sentence in sentences:
-            if self._contains_availability_keywords(sentence, label=label):
+            if search(sentence):
                 return sentence
-        for i in range(len(sentences) - 1):
-            combo = f"{sentences[i]} {sentences[i + 1]}"
-            if self._contains_availability_keywords(combo, label=label):
+        for first, second in zip(sentences, sentences[1:]):
+            combo = f"{first} {second}"
+            if search(combo):
                 return combo
         return None
 
     def _repair_spacing(self, text: str) -> str:
-        repaired = re.sub(r"(\w)-\s+(\w)", r"\1\2", text)
-        repaired = re.sub(r"\s+", " ", repaired.replace(" - ", "-"))
+        repaired = _LINE_BREAK_HYPHEN_RE.sub(r"\1\2", text)
+        repaired = _WS_RE.sub(" ", repaired.replace(" - ", "-"))
         repaired = repaired.replace(" ,", ",").replace(" .", ".")
-        repaired = re.sub(r"\s+:", ":", repaired)
+        repaired = _SPACE_BEFORE_COLON_RE.sub(":", repaired)
         return repaired.strip()
 
     def _canonicalize_urls(self, text: str) -> str:
-        # Step 0: Remove invisible Unicode characters (zero-width spaces, soft hyphens, etc)
-        # These are common in PDF text extraction artifacts
-        invisible_chars = [
-            '\u200B',  # Zero-width space
-            '\u200C',  # Zero-width non-joiner
-            '\u200D',  # Zero-width joiner
-            '\u00AD',  # Soft hyphen
-            '\uFEFF',  # Zero-width no-break space (BOM)
-        ]
-        for char in invisible_chars:
-            text = text.replace(char, '')
-        
-        # Remove urldefense wrappers (with spaces)
-        cleaned = re.sub(
-            r'https?://\s*urlde\s*fense\s*\.\s*com\s*/\s*v3\s*/\s*__\s*/?',
-            '',
-            text,
-            flags=re.IGNORECASE,
-        )
-        
-        # Remove urldefense artifact suffixes like: __;!!N11eV2iwtfs!6catv...
-        # These appear after URLs as: .git__;!!randomchars$ 
-        # Stop before common words
-        cleaned = re.sub(
-            r'(__\s*;?\s*!!\s*[A-Za-z0-9!$\-_\s+/=]+?)(\s+(?:and|the|on|at|in|from|or|to|is|are)\b|$)',
-            r'\2',  # Keep only the trailing word/space
-            cleaned
-        )
-        
-        # Fix intra-domain spacing like "zenod o", "git lab"
-        fixed_domains = [
-            (r"z\s*e\s*n\s*o\s*d\s*o", "zenodo"),
-            (r"d\s*r\s*y\s*a\s*d", "dryad"),
-            (r"g\s*i\s*t\s*h\s*u\s*b", "github"),
-            (r"g\s*i\s*t\s*l\s*a\s*b", "gitlab"),
-            (r"o\s*s\s*f", "osf"),
-        ]
-        for pat, rep in fixed_domains:
-            cleaned = re.sub(pat, rep, cleaned, flags=re.IGNORECASE)
-        
-        # Merge URL fragments
-        pattern = re.compile(r"(https?://[^\s]+)\s+([^\s])")
-        for _ in range(10):  # Limit iterations
-            def repl(match: re.Match[str]) -> str:
-                follower = match.group(2)
-                tail = match.string[match.end(0) : match.end(0) + 12]
-                if follower in "/?-_=.":
-                    return match.group(1) + follower
-                if any(ch in "/?-_=." for ch in tail):
-                    return match.group(1) + follower
-                if match.group(1).endswith(("=", "-", "_")):
-                    return match.group(1) + follower
-                return match.group(1) + " " + follower
-
-            updated = pattern.sub(repl, cleaned)
-            if updated == cleaned:
-                break
-            cleaned = updated
-        
-        return cleaned
+        return _canonicalize_urls(text)
 
     def _filter_links(self, context_text: str, links: Iterable[object], *, label: str) -> List[str]:
         collected: List[str] = []
+        # Companion set for the duplicate check; the list keeps first-seen order
+        seen: Set[str] = set()
         # Canonicalize any spaced/broken URLs in the context first
         context_text = self._canonicalize_urls(context_text)
 
         def _maybe_add(url: str) -> None:
             clean = url.strip().rstrip(".,;)]}")
+            low = clean.lower()
             if not clean.startswith(("http://", "https://")):
-                if clean.lower().startswith("www."):
+                if low.startswith("www."):
                     clean = "https://" + clean
+                    low = "https://" + low
                 else:
                     return
-            low = clean.lower()
-            if any(sub in low for sub in self._deny_substrings):
+            if self._deny_re is not None and self._deny_re.search(low):
                 return
             domain = self._domain(clean)
             if not domain:
                 return
             allowed = self._data_allowed_domains if label == "data" else self._code_allowed_domains
             # Treat dx.doi.org as doi.org for dataset DOIs; only count dataset DOIs for data, not code
-            is_doi_domain = domain in {"doi.org", "dx.doi.org"}
+            is_doi_domain = domain in _DOI_HOSTS
             ok = False
             if domain in allowed:
                 ok = True
-            elif is_doi_domain and label == "data" and self._is_dataset_doi(clean):
+            elif is_doi_domain and label == "data" and self._is_dataset_doi(low):
                 ok = True
-            if ok and validate_url(clean) and clean not in collected:
+            if ok and clean not in seen and validate_url(clean):
+                seen.add(clean)
                 collected.append(clean)
 
         if links:
@@ -599,27 +667,13 @@ class AvailabilityEngine:
                     _maybe_add(entry)
 
         if not collected:
-            # First pass simple pattern
-            pattern = r"http[s]?://[^\s\)]+"
-            raw_matches = re.findall(pattern, context_text)
-            # Detect fused URLs and split on subsequent http(s) occurrences
-            fixed_matches: List[str] = []
-            for m in raw_matches:
-                if m.count("http") > 1:
-                    parts = re.split(r"(?=https?://)", m)
-                    for p in parts:
-                        p = p.strip()
-                        if p:
-                            fixed_matches.append(p)
-                else:
-                    fixed_matches.append(m)
-            for match in fixed_matches:
+            for match in _URL_RUN_RE.findall(context_text):
                 _maybe_add(match)
 
         return collected
 
     def _domain(self, url: str) -> Optional[str]:
-        match = re.match(r"^https?://([^/]+)", url, flags=re.IGNORECASE)
+        match = _URL_HOST_RE.match(url)
         if not match:
             return None
         domain = match.group(1).lower()
@@ -627,8 +681,9 @@ class AvailabilityEngine:
             domain = domain[4:]
         return domain
 
-    def _is_dataset_doi(self, url: str) -> bool:
-        if "doi.org/" not in url.lower():
+    def _is_dataset_doi(self, low: str) -> bool:
+        """``low`` is the already-lowercased URL (_filter_links lowercases each link once)."""
+        if "doi.org/" not in low:
             return False
-        doi = url.lower().split("doi.org/", 1)[1]
-        return any(doi.startswith(prefix) for prefix in self._dataset_doi_prefixes)
+        doi = low.split("doi.org/", 1)[1]
+        return doi.startswith(self._dataset_doi_prefixes)
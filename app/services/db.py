@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import hashlib
 from contextlib import asynccontextmanager
 import logging
 from typing import Any, AsyncIterator, Dict, Optional, TYPE_CHECKING
@@ -86,15 +85,17 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             Database.client.close()
 
 
-def compute_sha256(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
-
-
-async def put_file(content: bytes, filename: str, content_type: str, metadata: Dict[str, Any]) -> str:
+async def put_file_from_path(path: str, filename: str, content_type: str, metadata: Dict[str, Any]) -> str:
+    """Upload a file already on disk to GridFS in 1MB chunks, without loading it into memory."""
     fs = get_fs()
     stream = fs.open_upload_stream(filename, metadata={**metadata, "content_type": content_type})
     try:
-        await stream.write(content)
+        with open(path, "rb") as src:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                await stream.write(chunk)
     finally:
         await stream.close()
     return str(stream._id)
@@ -132,3 +133,14 @@ async def read_file_to_path(file_id: str, path: str) -> None:
                 pass
 
 
+
+
+async def delete_file(file_id: str) -> None:
+    """Remove a GridFS file and its chunks, e.g. to roll back an upload that was not queued."""
+    fs = get_fs()
+    try:
+        from bson import ObjectId as _ObjectId  # lazy import to avoid import-time failure
+    except Exception as e:
+        raise RuntimeError(f"BSON dependency not available: {e}")
+    oid = _ObjectId(file_id) if not isinstance(file_id, _ObjectId) else file_id
+    await fs.delete(oid)
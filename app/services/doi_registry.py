@@ -1,19 +1,134 @@
+import importlib.util
+import json
+import os
+import re
 import time
 import logging
-from typing import Optional, Tuple, Dict, Any
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, Any, FrozenSet
 
 import httpx
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from app.core.config import settings
+from app.services import shared_io_executor
 
 logger = logging.getLogger(__name__)
 
+# Statuses worth one more polite attempt (rate limiting / transient gateway errors)
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_RETRY_DELAYS = (0.5, 1.0)
+# Cached in place of a record when Crossref answers 404, so unknown DOIs aren't re-queried
+_NOT_FOUND: Dict[str, Any] = {"not_found": True}
+
+_TITLE_TOKEN_RE = re.compile(r"[a-z0-9]{3,}")
+# Resolver/"doi:" forms of the same DOI share one cache entry
+_DOI_KEY_PREFIX_RE = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+
+# HTTP/2 (multiplexed requests over one connection per registry host) needs the optional h2 package
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _json_body(resp: httpx.Response) -> Any:
+    """Decode a JSON response body, straight from the raw bytes with orjson when it is installed."""
+    if orjson is None:
+        return resp.json()
+    return orjson.loads(resp.content)
+
+
+@lru_cache(maxsize=1)
+def _shared_client() -> httpx.Client:
+    """
+    Process-wide pooled HTTP client for Crossref/OpenAlex. Reusing it keeps connections
+    alive across lookups so repeated requests to the same host skip TCP/TLS setup.
+    Connection failures are retried by the transport, which also carries the pool limits
+    (httpx ignores client-level limits when a transport is given) and HTTP/2 when available.
+    """
+    return httpx.Client(
+        timeout=float(settings.DOI_HTTP_TIMEOUT_SECONDS),
+        transport=httpx.HTTPTransport(
+            retries=2,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.ENRICHMENT_MAX_CONCURRENCY * 2,
+                max_keepalive_connections=settings.ENRICHMENT_MAX_CONCURRENCY,
+            ),
+        ),
+    )
+
+
+class _DiskCache:
+    """Small SQLite key/value store backing the DOI cache when DOI_CACHE_PATH is set."""
+
+    def __init__(self, path: str) -> None:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS doi_cache (key TEXT PRIMARY KEY, ts REAL, data TEXT)")
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute("SELECT ts, data FROM doi_cache WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return float(row[0]), json.loads(row[1])
+
+    def set(self, key: str, ts: float, data: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO doi_cache (key, ts, data) VALUES (?, ?, ?)",
+                (key, ts, json.dumps(data)),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM doi_cache WHERE key = ?", (key,))
+
+
+@lru_cache(maxsize=None)
+def _open_disk_cache(path: str) -> _DiskCache:
+    # Failures raise and are not cached, so an unavailable path is retried on the next lookup
+    return _DiskCache(path)
+
+
+def _disk_cache() -> Optional[_DiskCache]:
+    path = (settings.DOI_CACHE_PATH or "").strip()
+    if not path:
+        return None
+    try:
+        return _open_disk_cache(path)
+    except Exception as e:
+        logger.warning("doi_disk_cache_unavailable %s: %s", path, e)
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _title_tokens(title: str) -> FrozenSet[str]:
+    """
+    Alphanumeric tokens (len>=3) of a lowercased title. A title search scores the same query
+    title against every returned item, so the query is tokenized once, not once per item.
+    """
+    return frozenset(_TITLE_TOKEN_RE.findall(title.lower()))
+
 
 class DOIRegistry:
     """
     Minimal Crossref-backed DOI lookup with simple in-memory cache.
     Used to verify DOI existence and fetch title metadata for similarity checks.
-    Also supports title-based search to find candidate DOIs.
+    Also supports title-based search to find candidate DOIs; search results share the
+    same TTL cache, keyed by the normalized title. When DOI_CACHE_PATH is set, entries are
+    also written through to a SQLite file so re-runs skip already-seen lookups. DOIs that
+    Crossref reports as unknown are remembered for DOI_NEGATIVE_CACHE_TTL seconds. The in-memory
+    cache holds at most DOI_MEMORY_CACHE_SIZE entries, evicting the oldest first.
     """
 
     _cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
@@ -21,34 +136,76 @@ class DOIRegistry:
     def __init__(self, timeout_sec: Optional[int] = None, cache_ttl: Optional[int] = None) -> None:
         self.timeout = float(timeout_sec if timeout_sec is not None else settings.DOI_HTTP_TIMEOUT_SECONDS)
         self.cache_ttl = int(cache_ttl if cache_ttl is not None else settings.DOI_CACHE_TTL)
+        self.negative_ttl = int(settings.DOI_NEGATIVE_CACHE_TTL)
+        self._request_headers = self._build_headers()
 
     @staticmethod
     def _norm_doi(doi: str) -> str:
-        return (doi or "").strip().lower()
+        return _DOI_KEY_PREFIX_RE.sub("", (doi or "").strip()).lower()
 
     def _get_cached(self, doi: str) -> Optional[Dict[str, Any]]:
         key = self._norm_doi(doi)
         if not key:
             return None
         item = self._cache.get(key)
+        disk = None
         if not item:
-            return None
+            disk = _disk_cache()
+            if disk is None:
+                return None
+            try:
+                item = disk.get(key)
+            except Exception as e:
+                logger.debug("doi_disk_cache_read_error %s", e)
+                item = None
+            if not item:
+                return None
         ts, data = item
-        if self.cache_ttl <= 0 or (time.time() - ts) <= self.cache_ttl:
+        if data.get("not_found"):
+            fresh = (time.time() - ts) <= self.negative_ttl
+        else:
+            fresh = self.cache_ttl <= 0 or (time.time() - ts) <= self.cache_ttl
+        if fresh:
+            if disk is not None:
+                self._remember(key, item)
             return data
         try:
             del self._cache[key]
         except Exception:
             pass
+        if disk is not None:
+            try:
+                disk.delete(key)
+            except Exception:
+                pass
         return None
 
+    def _remember(self, key: str, item: Tuple[float, Dict[str, Any]]) -> None:
+        cache = self._cache
+        cache.pop(key, None)
+        while len(cache) >= settings.DOI_MEMORY_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            try:
+                del cache[next(iter(cache))]
+            except (StopIteration, KeyError, RuntimeError):
+                break
+        cache[key] = item
+
     def _set_cached(self, doi: str, data: Dict[str, Any]) -> None:
         key = self._norm_doi(doi)
         if not key:
             return
-        self._cache[key] = (time.time(), data)
+        ts = time.time()
+        self._remember(key, (ts, data))
+        disk = _disk_cache()
+        if disk is not None:
+            try:
+                disk.set(key, ts, data)
+            except Exception as e:
+                logger.debug("doi_disk_cache_write_error %s", e)
 
-    def _headers(self) -> Dict[str, str]:
+    @staticmethod
+    def _build_headers() -> Dict[str, str]:
         ua_email = (settings.ENRICHMENT_CONTACT_EMAIL or "").strip()
         if ua_email:
             ua = f"EcoOpen/1.0 (+mailto:{ua_email})"
@@ -59,6 +216,20 @@ class DOIRegistry:
             "User-Agent": ua,
         }
 
+    def _headers(self) -> Dict[str, str]:
+        return self._request_headers
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """GET via the shared client, backing off briefly on 429/5xx gateway responses."""
+        client = _shared_client()
+        resp = client.get(url, headers=self._headers(), params=params, timeout=self.timeout)
+        for delay in _RETRY_DELAYS:
+            if resp.status_code not in _RETRY_STATUSES:
+                break
+            time.sleep(delay)
+            resp = client.get(url, headers=self._headers(), params=params, timeout=self.timeout)
+        return resp
+
     def lookup(self, doi: str) -> Optional[Dict[str, Any]]:
         """
         Fetch Crossref metadata for a DOI. Returns None on errors.
@@ -67,15 +238,16 @@ class DOIRegistry:
         """
         cached = self._get_cached(doi)
         if cached is not None:
-            return cached
+            return None if cached.get("not_found") else cached
         url = f"https://api.crossref.org/works/{doi}"
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                resp = client.get(url, headers=self._headers())
+            resp = self._get(url)
+            if resp.status_code == 404 and self.negative_ttl > 0:
+                self._set_cached(doi, dict(_NOT_FOUND))
             if resp.status_code != 200:
                 logger.debug("crossref_non_200 %s %s", resp.status_code, resp.text[:200])
                 return None
-            data = resp.json()
+            data = _json_body(resp)
             msg = data.get("message") or {}
             titles = msg.get("title") or []
             title = titles[0] if titles else None
@@ -101,12 +273,10 @@ class DOIRegistry:
             return None
 
     @staticmethod
-    def _tokenize_title(s: Optional[str]) -> set:
+    def _tokenize_title(s: Optional[str]) -> FrozenSet[str]:
         if not s:
-            return set()
-        import re as _re
-        tokens = [t for t in _re.findall(r"[A-Za-z0-9]+", s.lower()) if len(t) >= 3]
-        return set(tokens)
+            return frozenset()
+        return _title_tokens(s)
 
     def title_similarity(self, a: Optional[str], b: Optional[str]) -> float:
         """Compute a simple Jaccard similarity over alphanumeric tokens (len>=3)."""
@@ -126,16 +296,11 @@ class DOIRegistry:
             # Be polite: include contact email if provided
             if settings.ENRICHMENT_CONTACT_EMAIL:
                 params["mailto"] = settings.ENRICHMENT_CONTACT_EMAIL
-            with httpx.Client(timeout=self.timeout) as client:
-                resp = client.get(
-                    "https://api.crossref.org/works",
-                    headers=self._headers(),
-                    params=params,
-                )
+            resp = self._get("https://api.crossref.org/works", params=params)
             if resp.status_code != 200:
                 logger.debug("crossref_title_search_non_200 %s %s", resp.status_code, resp.text[:200])
                 return None
-            data = resp.json()
+            data = _json_body(resp)
             items = (data.get("message") or {}).get("items") or []
             best = None
             best_sim = 0.0
@@ -163,16 +328,11 @@ class DOIRegistry:
     def _search_openalex_by_title(self, title: str, rows: int = 5) -> Optional[Dict[str, Any]]:
         try:
             params = {"search": title, "per_page": rows}
-            with httpx.Client(timeout=self.timeout) as client:
-                resp = client.get(
-                    "https://api.openalex.org/works",
-                    headers=self._headers(),
-                    params=params,
-                )
+            resp = self._get("https://api.openalex.org/works", params=params)
             if resp.status_code != 200:
                 logger.debug("openalex_title_search_non_200 %s %s", resp.status_code, resp.text[:200])
                 return None
-            data = resp.json() or {}
+            data = _json_body(resp) or {}
             items = data.get("results") or []
             best = None
             best_sim = 0.0
@@ -207,19 +367,31 @@ class DOIRegistry:
         q = title.strip()
         if not q:
             return None
-        # Try Crossref first, then OpenAlex; pick the better score
-        best_cr = self._search_crossref_by_title(q, rows=rows)
-        best_oa = self._search_openalex_by_title(q, rows=rows)
+        cache_key = self._title_cache_key(q, rows)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        top = self._search_by_title_uncached(q, rows=rows)
+        if top:
+            self._set_cached(cache_key, top)
+        return top
+
+    @staticmethod
+    def _title_cache_key(title: str, rows: int) -> str:
+        return f"title:{rows}:{' '.join(title.lower().split())}"
+
+    def _search_by_title_uncached(self, q: str, rows: int) -> Optional[Dict[str, Any]]:
+        # Query Crossref and OpenAlex side by side (both network-bound, sharing the pooled
+        # client), then pick the better score
+        pool = shared_io_executor()
+        cr_future = pool.submit(self._search_crossref_by_title, q, rows=rows)
+        oa_future = pool.submit(self._search_openalex_by_title, q, rows=rows)
+        best_cr = cr_future.result()
+        best_oa = oa_future.result()
         candidates = [b for b in [best_cr, best_oa] if b and b.get("doi")]
         if not candidates:
             return best_cr or best_oa
         # choose highest score; tie-breaker by configured preference
-        candidates.sort(key=lambda d: float(d.get("score", 0.0)), reverse=True)
-        top = candidates[0]
-        if len(candidates) > 1 and candidates[0].get("score") == candidates[1].get("score"):
-            preferred = (settings.DOI_TITLE_SEARCH_PREFERRED_SOURCE or "crossref").lower()
-            other = candidates[1]
-            if other.get("source") == preferred:
-                top = other
-        return top
+        preferred = (settings.DOI_TITLE_SEARCH_PREFERRED_SOURCE or "crossref").lower()
+        return max(candidates, key=lambda d: (float(d.get("score", 0.0)), d.get("source") == preferred))
  
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+_HTTP_SCHEME_RE = re.compile(r"https?://", re.IGNORECASE)
 
 
 @dataclass
@@ -16,15 +19,47 @@ class LinkInspector:
 
     DATA_HINTS = ("zenodo.org", "figshare.com", "dryad", "dataverse", "osf.io", "openneuro", "doi.org/10.")
     CODE_HINTS = ("github.com", "gitlab", "bitbucket", "huggingface.co", "codeberg.org")
+    # Known repository hosts (and their subdomains)
+    HOST_KINDS: Dict[str, str] = {
+        "zenodo.org": "data",
+        "figshare.com": "data",
+        "datadryad.org": "data",
+        "osf.io": "data",
+        "openneuro.org": "data",
+        "github.com": "code",
+        "gitlab.com": "code",
+        "bitbucket.org": "code",
+        "huggingface.co": "code",
+        "codeberg.org": "code",
+    }
+
+    # All known hosts as one end-anchored alternation: the leftmost match is the longest known
+    # suffix of the hostname, found in one scan instead of a dict lookup per joined suffix
+    _HOST_KIND_RE = re.compile(r"(?:^|\.)(" + "|".join(map(re.escape, HOST_KINDS)) + r")$")
+    # Each fallback hint family as one alternation: a single scan per family instead of one per hint
+    _DATA_HINT_RE = re.compile("|".join(map(re.escape, DATA_HINTS)))
+    _CODE_HINT_RE = re.compile("|".join(map(re.escape, CODE_HINTS)))
 
     def __init__(self) -> None:
         pass
 
+    def _host_kind(self, url: str) -> Optional[str]:
+        try:
+            host = (urlsplit(url).hostname or "").lower()
+        except ValueError:
+            return None
+        match = self._HOST_KIND_RE.search(host)
+        return self.HOST_KINDS[match.group(1)] if match else None
+
     def _classify(self, url: str) -> str:
+        kind = self._host_kind(url)
+        if kind:
+            return kind
+        # Fallback for hosts not in the table (institutional Dataverse/Dryad mirrors, doi.org/10.x, ...)
         low = url.lower()
-        if any(h in low for h in self.DATA_HINTS):
+        if self._DATA_HINT_RE.search(low):
             return "data"
-        if any(h in low for h in self.CODE_HINTS):
+        if self._CODE_HINT_RE.search(low):
             return "code"
         return "other"
 
@@ -34,7 +69,7 @@ class LinkInspector:
             return None
         if url.startswith("www."):
             url = "https://" + url
-        if not re.match(r"^https?://", url, flags=re.IGNORECASE):
+        if not _HTTP_SCHEME_RE.match(url):
             return None
         # strip trailing punctuation
         url = url.rstrip("),.;]")
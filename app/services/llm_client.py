@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional
 import httpx
 import logging
@@ -14,6 +15,16 @@ from app.services import log_timing
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _shared_client() -> httpx.Client:
+    """
+    Process-wide pooled client for LLM chat calls. Every analysis issues several chat
+    requests to the same endpoint; keeping the connection alive avoids a new TCP/TLS
+    handshake per request and per retry attempt.
+    """
+    return httpx.Client(timeout=float(settings.AGENT_TIMEOUT_SECONDS))
+
+
 @dataclass
 class ChatMessage:
     role: str
@@ -32,12 +43,13 @@ class HttpLLMClient(LLMClient):
         self._base = base_url.rstrip("/")
         self._api_key = api_key or None
         self._model = model
+        # Request headers never change for a client; build them once instead of per attempt
+        self._request_headers: Dict[str, str] = {"Content-Type": "application/json"}
+        if self._api_key:
+            self._request_headers["Authorization"] = f"Bearer {self._api_key}"
 
     def _headers(self) -> Dict[str, str]:
-        h: Dict[str, str] = {"Content-Type": "application/json"}
-        if self._api_key:
-            h["Authorization"] = f"Bearer {self._api_key}"
-        return h
+        return self._request_headers
 
     def _retry_delays(self) -> List[float]:
         return [0.5, 1.0, 2.0, 4.0]
@@ -62,25 +74,26 @@ class HttpLLMClient(LLMClient):
                 if delay:
                     time.sleep(delay)
                 try:
-                    with httpx.Client(timeout=float(settings.AGENT_TIMEOUT_SECONDS)) as client:
-                        r = client.post(url, json=payload, headers=self._headers())
-                        status_val = r.status_code
-                        if 200 <= r.status_code < 300:
-                            data = r.json()
-                            if isinstance(data, dict) and "choices" in data:
-                                try:
-                                    content = data["choices"][0]["message"]["content"]
-                                    return (content or "").strip()
-                                except Exception:
-                                    raise LLMServiceError("Invalid OpenAI response format")
-                            raise LLMServiceError("Unexpected response: missing choices")
-                        if r.status_code in (404, 405):
-                            raise LLMServiceError("LLM endpoint /v1/chat/completions not found on AGENT_BASE_URL")
-                        if r.status_code in (408, 429) or 500 <= r.status_code < 600:
-                            last_err = LLMServiceError(f"LLM error {r.status_code}: {r.text[:200]}")
-                            continue
-                        body = r.text if r.text else ""
-                        raise LLMServiceError(f"LLM error {r.status_code}: {body[:200]}")
+                    r = _shared_client().post(
+                        url, json=payload, headers=self._headers(), timeout=float(settings.AGENT_TIMEOUT_SECONDS)
+                    )
+                    status_val = r.status_code
+                    if 200 <= r.status_code < 300:
+                        data = r.json()
+                        if isinstance(data, dict) and "choices" in data:
+                            try:
+                                content = data["choices"][0]["message"]["content"]
+                                return (content or "").strip()
+                            except Exception:
+                                raise LLMServiceError("Invalid OpenAI response format")
+                        raise LLMServiceError("Unexpected response: missing choices")
+                    if r.status_code in (404, 405):
+                        raise LLMServiceError("LLM endpoint /v1/chat/completions not found on AGENT_BASE_URL")
+                    if r.status_code in (408, 429) or 500 <= r.status_code < 600:
+                        last_err = LLMServiceError(f"LLM error {r.status_code}: {r.text[:200]}")
+                        continue
+                    body = r.text if r.text else ""
+                    raise LLMServiceError(f"LLM error {r.status_code}: {body[:200]}")
                 except (httpx.TimeoutException, httpx.ConnectError) as e:
                     last_err = LLMServiceError(f"LLM service unavailable: {e}")
                     continue
@@ -134,8 +147,23 @@ class McpLLMClient(LLMClient):
             raise LLMServiceError(f"MCP client error: {e}")
 
 
+@lru_cache(maxsize=4)
+def _llm_client_for(
+    mcp_enabled: bool, base_url: str, api_key: Optional[str], model: str, server_url: str, tool_name: str
+) -> LLMClient:
+    """One client per distinct LLM configuration, reused by every chat call instead of rebuilt each time."""
+    if mcp_enabled:
+        return McpLLMClient(server_url, tool_name, model)
+    return HttpLLMClient(base_url, api_key, model)
+
+
 def get_llm_client() -> LLMClient:
-    if settings.MCP_ENABLED:
-        return McpLLMClient(settings.MCP_SERVER_URL, settings.MCP_TOOL_NAME, settings.AGENT_MODEL)
-    return HttpLLMClient(settings.AGENT_BASE_URL, settings.AGENT_API_KEY, settings.AGENT_MODEL)
+    return _llm_client_for(
+        settings.MCP_ENABLED,
+        settings.AGENT_BASE_URL,
+        settings.AGENT_API_KEY,
+        settings.AGENT_MODEL,
+        settings.MCP_SERVER_URL,
+        settings.MCP_TOOL_NAME,
+    )
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import bisect
 import datetime as dt
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from bson import ObjectId
 from pydantic import BaseModel
@@ -49,9 +50,10 @@ async def set_document_analysis(doc_id: str, analysis: Dict[str, Any]) -> None:
     await db["documents"].update_one({"_id": ObjectId(doc_id)}, {"$set": {"analysis": analysis, "updated_at": now_utc(), "status": "done"}})
 
 
-async def get_document(doc_id: str) -> Optional[Dict[str, Any]]:
+async def get_document(doc_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Fetch a document; pass a projection to read only a few fields (e.g. when polling status)."""
     db = get_db()
-    return await db["documents"].find_one({"_id": ObjectId(doc_id)})
+    return await db["documents"].find_one({"_id": ObjectId(doc_id)}, projection)
 
 async def get_document_for_user(doc_id: str, user_id: str) -> Optional[Dict[str, Any]]:
     db = get_db()
@@ -76,13 +78,16 @@ async def create_job(total: int, document_ids: List[str], user_id: Optional[str]
     return str(res.inserted_id)
 
 
-async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+async def get_job(job_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Fetch a job; pass a projection to read only a few fields (e.g. for existence checks)."""
     db = get_db()
-    return await db["jobs"].find_one({"_id": ObjectId(job_id)})
+    return await db["jobs"].find_one({"_id": ObjectId(job_id)}, projection)
 
-async def get_job_for_user(job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+async def get_job_for_user(
+    job_id: str, user_id: str, projection: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
     db = get_db()
-    return await db["jobs"].find_one({"_id": ObjectId(job_id), "user_id": user_id})
+    return await db["jobs"].find_one({"_id": ObjectId(job_id), "user_id": user_id}, projection)
 
 
 async def inc_job_progress(job_id: str, by: int = 1) -> None:
@@ -106,9 +111,20 @@ async def set_job_status(job_id: str, status: str, error: Optional[str] = None)
     await db["jobs"].update_one({"_id": ObjectId(job_id)}, {"$set": update})
 
 
-async def list_job_documents(job_id: str) -> List[Dict[str, Any]]:
+async def list_job_documents(
+    job_id: str,
+    projection: Optional[Dict[str, Any]] = None,
+    statuses: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    List a job's documents. Pass a projection to skip fields the caller does not read and
+    statuses to let Mongo drop documents in other states instead of filtering them here.
+    """
     db = get_db()
-    cur = db["documents"].find({"job_id": job_id})
+    q: Dict[str, Any] = {"job_id": job_id}
+    if statuses:
+        q["status"] = {"$in": list(statuses)}
+    cur = db["documents"].find(q, projection)
     return await cur.to_list(length=10000)
 
 async def list_user_jobs(user_id: str, limit: int = 100, status: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -133,6 +149,25 @@ async def set_document_job_id(doc_id: str, job_id: str) -> None:
     await db["documents"].update_one({"_id": ObjectId(doc_id)}, {"$set": {"job_id": job_id, "updated_at": now_utc()}})
 
 
+async def queue_documents(doc_ids: List[str], job_id: str) -> None:
+    """Attach documents to a job and mark them queued with a single update_many round trip."""
+    if not doc_ids:
+        return
+    db = get_db()
+    await db["documents"].update_many(
+        {"_id": {"$in": [ObjectId(x) for x in doc_ids]}},
+        {"$set": {"job_id": job_id, "status": "queued", "error": None, "updated_at": now_utc()}},
+    )
+
+
+
+async def delete_documents(doc_ids: List[str]) -> None:
+    """Delete document records in one round trip (used to undo a batch that failed to store)."""
+    if not doc_ids:
+        return
+    db = get_db()
+    await db["documents"].delete_many({"_id": {"$in": [ObjectId(x) for x in doc_ids]}})
+
 # --- Job logs ---
 async def append_job_log(
     job_id: str,
@@ -336,3 +371,24 @@ async def get_queue_position(job_id: str) -> Optional[int]:
     
     # Position is 1-indexed (1 = next to run)
     return position + 1
+
+
+async def get_queue_positions(job_ids: Sequence[str]) -> Dict[str, int]:
+    """Queue positions for several pending jobs from a single scan of the pending queue.
+
+    Same numbering as get_queue_position; jobs that are not pending are left out.
+    """
+    wanted = set(job_ids)
+    if not wanted:
+        return {}
+    db = get_db()
+    cur = db["jobs"].find({"status": "pending"}, {"created_at": 1}).sort("created_at", 1)
+    pending = await cur.to_list(length=None)
+    stamps = [j.get("created_at") for j in pending if j.get("created_at")]
+    positions: Dict[str, int] = {}
+    for j in pending:
+        jid = str(j.get("_id"))
+        created_at = j.get("created_at")
+        if jid in wanted and created_at:
+            positions[jid] = bisect.bisect_left(stamps, created_at) + 1
+    return positions
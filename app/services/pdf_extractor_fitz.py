@@ -6,23 +6,36 @@ Optimized for clear text PDFs (non-OCR scientific papers).
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 try:
     import fitz  # PyMuPDF
 except ImportError:
     fitz = None
 
+from app.services.text_normalizer import normalize_extracted_text
+
 logger = logging.getLogger(__name__)
 
+# Plain-text extraction flags: clip to the media box and map unknown glyphs, but let MuPDF
+# expand ligatures ("ﬁ" -> "fi") and normalize whitespace instead of preserving them. This is
+# cheaper than the "text" defaults and keeps keywords like "ﬁgshare" matchable downstream.
+_TEXT_FLAGS = (fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE) if fitz is not None else 0
+
 
-@dataclass
+@dataclass(slots=True)
 class ParagraphBlock:
     text: str
     page: int
     column: int
     seq: int
+    normalized: Optional[str] = None
 
 
 class PyMuPDFExtractor:
@@ -37,42 +50,35 @@ class PyMuPDFExtractor:
         blocks: List[ParagraphBlock] = []
         
         try:
-            doc = fitz.open(pdf_path)
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Extract text with layout preservation
-                # flags=0 gives clean text, flags=fitz.TEXT_PRESERVE_WHITESPACE preserves layout
-                text = page.get_text("text")
-                
-                if not text.strip():
-                    continue
-                
-                # Split into paragraphs (double newline = paragraph break)
-                paragraphs = self._split_paragraphs(text)
-                
-                for seq, para in enumerate(paragraphs):
-                    if para.strip():
+            # Context manager closes the document even when a page fails, so long-lived
+            # extraction workers don't accumulate open MuPDF handles
+            with fitz.open(pdf_path) as doc:
+                for page_num, page in enumerate(doc, start=1):
+                    text = page.get_text("text", flags=_TEXT_FLAGS)
+
+                    if not text.strip():
+                        continue
+
+                    # Split into paragraphs (double newline = paragraph break); parts are
+                    # built from stripped, non-empty lines
+                    for seq, para in enumerate(self._split_paragraphs(text)):
                         blocks.append(
                             ParagraphBlock(
-                                text=para.strip(),
-                                page=page_num + 1,
+                                text=para,
+                                page=page_num,
                                 column=0,
                                 seq=seq,
                             )
                         )
-            
-            doc.close()
-            
+
             if not blocks:
                 raise ValueError("No text content found in PDF")
             
-            logger.debug(f"PyMuPDF extracted {len(blocks)} blocks from PDF")
+            logger.debug("PyMuPDF extracted %d blocks from PDF", len(blocks))
             return blocks
             
         except Exception as e:
-            logger.error(f"PyMuPDF extraction failed: {e}")
+            logger.error("PyMuPDF extraction failed: %s", e)
             raise
     
     def _split_paragraphs(self, text: str) -> List[str]:
@@ -101,3 +107,60 @@ class PyMuPDFExtractor:
             paragraphs.append(' '.join(current))
         
         return paragraphs
+
+
+@lru_cache(maxsize=1)
+def _shared_process_pool(processes: int) -> ProcessPoolExecutor:
+    # spawn: never fork a process that already runs the event loop, DB and HTTP client threads
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+_process_pool_reset_lock = threading.Lock()
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor, processes: int) -> None:
+    """
+    Forget a broken pool so the next call starts fresh workers. Callers that hit the same
+    broken pool concurrently reset it only once, never dropping a replacement already made.
+    """
+    with _process_pool_reset_lock:
+        if _shared_process_pool(processes) is pool:
+            _shared_process_pool.cache_clear()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_in_worker(pdf_path: str) -> List[ParagraphBlock]:
+    blocks = PyMuPDFExtractor().extract(pdf_path)
+    for block in blocks:
+        block.normalized = normalize_extracted_text(block.text)
+    return blocks
+
+
+def _extract_in_pool(pdf_path: str, processes: int, timeout: Optional[float]) -> List[ParagraphBlock]:
+    pool = _shared_process_pool(processes)
+    try:
+        return pool.submit(_extract_in_worker, pdf_path).result(timeout=timeout)
+    except BrokenProcessPool:
+        _discard_process_pool(pool, processes)
+        raise
+
+
+def extract_in_process(pdf_path: str, processes: int, timeout: Optional[float] = None) -> List[ParagraphBlock]:
+    """
+    Run PyMuPDFExtractor.extract in a shared worker process pool. Only the path goes in and the
+    small paragraph list comes back, so several PDFs can be parsed on separate cores. The
+    blocks' text normalization, pure-Python regex work that would otherwise hold the analyzing
+    process's GIL, runs in the worker too and comes back in ``normalized``.
+
+    A worker that dies (e.g. MuPDF crashing on a malformed PDF) breaks the whole pool; it is
+    then replaced and the document retried once. Waits longer than ``timeout`` seconds raise
+    concurrent.futures.TimeoutError.
+    """
+    try:
+        return _extract_in_pool(pdf_path, processes, timeout)
+    except BrokenProcessPool:
+        logger.warning("PDF extraction pool is broken (a worker died); restarting it and retrying %s", pdf_path)
+    return _extract_in_pool(pdf_path, processes, timeout)
@@ -1,23 +1,193 @@
 from __future__ import annotations
 
+import importlib.util
 import itertools
+import logging
 import statistics
 import re
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence, Tuple
-
-try:
-    import pdfplumber  # type: ignore
-except ImportError:  # pragma: no cover - handled by caller
-    pdfplumber = None  # type: ignore
-
-
-@dataclass
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# pdfplumber (with pdfminer) is only a fallback behind PyMuPDF; check that it is installed
+# without importing it, and import it on first use
+PDFPLUMBER_AVAILABLE = importlib.util.find_spec("pdfplumber") is not None
+
+
+@lru_cache(maxsize=1)
+def _pdfplumber() -> Optional[Any]:
+    try:
+        import pdfplumber  # type: ignore
+    except ImportError:  # pragma: no cover - handled by caller
+        return None
+    return pdfplumber
+
+
+# One character pass per paragraph: en and em dashes folded to ASCII hyphens, and ZWSP, ZWNJ,
+# ZWJ, soft hyphen and BOM (which break URLs) dropped
+_PARAGRAPH_CHARS = str.maketrans(
+    {"\u2013": "-", "\u2014": "-", **dict.fromkeys("\u200b\u200c\u200d\u00ad\ufeff")}
+)
+_URL_SCHEME_RE = re.compile(r'https?://', re.IGNORECASE)
+# Paragraph-cleaning and URL-repair patterns, compiled once for every paragraph of every PDF
+_DANGLING_SCHEME_RE = re.compile(r'https?:\s*$', re.IGNORECASE)
+_SPACED_SCHEME_RE = re.compile(r'(https?)\s*:\s*/\s*/', re.IGNORECASE)
+_SPACED_SCHEME_TRAILING_RE = re.compile(r'(https?)\s*:\s*/\s*/\s*', re.IGNORECASE)
+_COMPLETE_URL_RE = re.compile(r'https?://[\w\-]+\.[\w\-]+', re.IGNORECASE)
+_EXTRA_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_LINE_BREAK_HYPHEN_RE = re.compile(r"(\w)-\s*\n\s*(\w)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_SPACE_BEFORE_PERIOD_RE = re.compile(r"\s+\.")
+_SPACE_BEFORE_COMMA_RE = re.compile(r"\s+,")
+_URL_TOKEN_RE = re.compile(r'https?://[^\s]+', re.IGNORECASE)
+_SPACED_LETTERS_RE = re.compile(r"(?:\b[a-zA-Z]\b\s+){4,}[a-zA-Z]\b")
+_FUSED_URL_RE = re.compile(r"(https?://[^\s]{10,}?)(https?://)")
+_URLDEFENSE_RE = re.compile(r'https?://\s*urlde\s*fense\s*\.\s*com\s*/\s*v3\s*/\s*__\s*/?', re.IGNORECASE)
+# Agent-side block normalization (normalize_extracted_text)
+_NEWLINE_HYPHEN_RE = re.compile(r"(\w)-\n(\w)")
+_BROKEN_SCHEME_RE = re.compile(r"(https?)\s*:\s*//\s*", re.IGNORECASE)
+_BLANK_RUN_RE = re.compile(r"[ \t]{2,}")
+_SENTENCE_END_SPLIT_RE = re.compile(r"([.!?;])\s+")
+# A space followed by one of these words ends a spaced-out URL
+_URL_STOP_WORDS = (' and ', ' the ', ' on ', ' at ', ' in ', ' from ', ' or ', ' to ', ' are ', ' is ')
+
+
+def _compact_spaced_letters(match: re.Match) -> str:
+    seq = match.group(0)
+    parts = seq.strip().split()
+    # Only compact if we have 5+ single letters in sequence
+    if len(parts) >= 5 and all(len(p) == 1 and p.isalpha() for p in parts):
+        return "".join(parts)
+    return seq
+
+
+# slots: a long paper yields thousands of blocks, each otherwise carrying its own __dict__
+@dataclass(slots=True)
 class ParagraphBlock:
     text: str
     page: int
     column: int
     seq: int
+    # normalize_extracted_text(text), when already computed by the extraction worker
+    normalized: Optional[str] = None
+
+
+def normalize_extracted_text(text: str) -> str:
+    """
+    Agent-side text normalization of one extracted block: de-hyphenation, URL repair, line
+    merging, OCR letter compaction and one sentence per line. Module-level so PDF extraction
+    workers can run it next to the extraction instead of on the analyzing thread.
+    """
+    # de-hyphenate across line breaks
+    t = _NEWLINE_HYPHEN_RE.sub(r"\1\2", text)
+    # join URLs broken across line breaks (e.g., http-\n s://)
+    t = _BROKEN_SCHEME_RE.sub(r"\1://", t)
+    # normalize newlines and spaces
+    t = t.replace("\r\n", "\n").replace("\r", "\n")
+    t = _BLANK_RUN_RE.sub(" ", t)
+
+    # Join lines that don't end with sentence-ending punctuation
+    # This handles text that wraps across lines mid-sentence
+    lines = t.split("\n")
+    merged_lines: List[str] = []
+    # Fragments of the line being merged; joined once instead of repeated str +=
+    current_line: List[str] = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            # Preserve paragraph breaks
+            if current_line:
+                merged_lines.append(" ".join(current_line))
+                current_line = []
+            if merged_lines and merged_lines[-1] != "":
+                merged_lines.append("")
+            continue
+
+        # Check if previous line ended with sentence-ending punctuation
+        if current_line and current_line[-1][-1] in ".!?;":
+            merged_lines.append(" ".join(current_line))
+            current_line = [line]
+        else:
+            # Continue the sentence from previous line
+            current_line.append(line)
+
+    # Add any remaining line
+    if current_line:
+        merged_lines.append(" ".join(current_line))
+
+    # Join merged lines
+    t = "\n".join(merged_lines)
+
+    # Protect URLs from OCR repair by temporarily replacing them
+    url_placeholders: List[Tuple[str, str]] = []
+    for idx, match in enumerate(_URL_TOKEN_RE.finditer(t)):
+        placeholder = f"__URL_PLACEHOLDER_{idx}__"
+        url_placeholders.append((placeholder, match.group(0)))
+    for placeholder, url in url_placeholders:
+        t = t.replace(url, placeholder, 1)
+
+    # Repair intra-word spaced letters caused by OCR (e.g., 't r o p i c a l i z a t i o n')
+    # (same repair as paragraph cleaning; only sequences of 5+ single letters are compacted)
+    t = _SPACED_LETTERS_RE.sub(_compact_spaced_letters, t)
+
+    # Restore URLs
+    for placeholder, url in url_placeholders:
+        t = t.replace(placeholder, url)
+
+    # Now extract sentences and ensure proper separation
+    # Split on sentence-ending punctuation (. ! ? ;) followed by whitespace
+    parts = _SENTENCE_END_SPLIT_RE.split(t)
+
+    sentences: List[str] = []
+    # Fragments of the sentence being built; joined when a sentence boundary is reached
+    pieces: List[str] = []
+
+    for i, part in enumerate(parts):
+        if not part:
+            continue
+
+        # If this is a punctuation mark
+        if part in ".!?;":
+            # Attach the mark directly to the preceding text (drop trailing whitespace)
+            while pieces and not pieces[-1].strip():
+                pieces.pop()
+            if pieces:
+                pieces[-1] = pieces[-1].rstrip()
+            pieces.append(part)
+            current_sentence = "".join(pieces).strip()
+            # Check if next part starts with capital letter or is empty (end of text)
+            if i + 1 < len(parts):
+                next_part = parts[i + 1].strip()
+                # Add sentence if it's complete (next part starts with capital/digit or is empty)
+                if current_sentence and (not next_part or next_part[0].isupper() or next_part[0].isdigit()):
+                    sentences.append(current_sentence)
+                    pieces = []
+                elif current_sentence:
+                    # Keep building the sentence (e.g., for abbreviations)
+                    pieces.append(" ")
+            else:
+                # Last punctuation mark
+                if current_sentence:
+                    sentences.append(current_sentence)
+                    pieces = []
+        else:
+            pieces.append(part.strip() + " ")
+
+    # Add any remaining text as final sentence
+    remaining = "".join(pieces).strip()
+    if remaining:
+        sentences.append(remaining)
+
+    # Join sentences with newlines to ensure proper separation
+    result = "\n".join(sentences)
+
+    # Clean up excessive newlines
+    result = _EXTRA_BLANK_LINES_RE.sub("\n\n", result)
+
+    return result
 
 
 class PDFTextNormalizer:
@@ -36,6 +206,7 @@ class PDFTextNormalizer:
         self._counter = itertools.count()
 
     def extract(self, path: str) -> List[ParagraphBlock]:
+        pdfplumber = _pdfplumber()
         if pdfplumber is None:
             raise RuntimeError("pdfplumber is required for PDFTextNormalizer")
 
@@ -76,13 +247,14 @@ class PDFTextNormalizer:
                     for paragraph in self._words_to_paragraphs(column_words):
                         cleaned = self._clean_paragraph(paragraph)
                         if cleaned:
-                            # Debug log for paragraphs containing URL patterns
-                            if 'http' in cleaned.lower() and cleaned.endswith((':', 'https:', 'http:')):
-                                import logging
-                                logger = logging.getLogger(__name__)
+                            # Debug log for paragraphs containing URL patterns (cheap suffix check first,
+                            # so the lowercase copy is only made for the few paragraphs ending in ':')
+                            if cleaned.endswith(':') and 'http' in cleaned.lower():
                                 logger.warning(
-                                    f"Incomplete URL detected in paragraph (page {page_idx}, col {column_index}): "
-                                    f"'{cleaned[-50:]}'"
+                                    "Incomplete URL detected in paragraph (page %s, col %s): '%s'",
+                                    page_idx,
+                                    column_index,
+                                    cleaned[-50:],
                                 )
                             blocks.append(
                                 ParagraphBlock(
@@ -218,7 +390,7 @@ class PDFTextNormalizer:
             current = paragraphs[i].strip()
             
             # Check if current paragraph ends with incomplete URL (https: or http:)
-            if re.search(r'https?:\s*$', current, re.IGNORECASE):
+            if _DANGLING_SCHEME_RE.search(current):
                 # Merge with next paragraph until we have a complete URL
                 combined = current
                 j = i + 1
@@ -228,10 +400,10 @@ class PDFTextNormalizer:
                     combined = combined.rstrip() + " " + next_para
                     
                     # Normalize the combined text to fix URL spacing before checking
-                    normalized = re.sub(r'(https?)\s*:\s*/\s*/', r'\1://', combined, flags=re.IGNORECASE)
+                    normalized = _SPACED_SCHEME_RE.sub(r'\1://', combined)
                     
                     # Check for complete URL with domain and TLD
-                    if re.search(r'https?://[\w\-]+\.[\w\-]+', normalized, re.IGNORECASE):
+                    if _COMPLETE_URL_RE.search(normalized):
                         # Found complete URL - use normalized version
                         merged.append(normalized)
                         i = j + 1
@@ -241,7 +413,7 @@ class PDFTextNormalizer:
                 
                 if not found_complete:
                     # Didn't find complete URL, normalize and add what we have
-                    normalized = re.sub(r'(https?)\s*:\s*/\s*/', r'\1://', combined, flags=re.IGNORECASE)
+                    normalized = _SPACED_SCHEME_RE.sub(r'\1://', combined)
                     merged.append(normalized)
                     i = j
             else:
@@ -254,28 +426,26 @@ class PDFTextNormalizer:
         if not text:
             return []
         normalized = text.replace("\r\n", "\n").replace("\r", "\n")
-        normalized = re.sub(r"\n{3,}", "\n\n", normalized)
+        normalized = _EXTRA_BLANK_LINES_RE.sub("\n\n", normalized)
         return [chunk.strip() for chunk in normalized.split("\n\n") if chunk.strip()]
 
     # ------------------------------------------------------------------ cleaning helpers
     def _clean_paragraph(self, text: str) -> str:
         if not text:
             return ""
-        cleaned = text
-        cleaned = cleaned.replace("\u2013", "-").replace("\u2014", "-")
-        cleaned = re.sub(r"(\w)-\s*\n\s*(\w)", r"\1\2", cleaned)
-        cleaned = cleaned.replace("\n", " ")
-        cleaned = re.sub(r"\s+", " ", cleaned)
-        cleaned = re.sub(r"\s+\.", ".", cleaned)
-        cleaned = re.sub(r"\s+,", ",", cleaned)
+        cleaned = text.translate(_PARAGRAPH_CHARS)
+        cleaned = _LINE_BREAK_HYPHEN_RE.sub(r"\1\2", cleaned)
+        # Newlines are whitespace too; one collapse pass turns them into single spaces
+        cleaned = _WHITESPACE_RE.sub(" ", cleaned)
+        cleaned = _SPACE_BEFORE_PERIOD_RE.sub(".", cleaned)
+        cleaned = _SPACE_BEFORE_COMMA_RE.sub(",", cleaned)
         
         # Canonicalize URLs FIRST before any other transformations
         cleaned = self._canonicalize_urls(cleaned)
         
         # Protect URLs from further processing by temporarily replacing them
         url_placeholders: List[Tuple[str, str]] = []
-        url_pattern = re.compile(r'https?://[^\s]+', re.IGNORECASE)
-        for idx, match in enumerate(url_pattern.finditer(cleaned)):
+        for idx, match in enumerate(_URL_TOKEN_RE.finditer(cleaned)):
             placeholder = f"__URL_PLACEHOLDER_{idx}__"
             url_placeholders.append((placeholder, match.group(0)))
         for placeholder, url in url_placeholders:
@@ -283,21 +453,14 @@ class PDFTextNormalizer:
         
         # Compact OCR spaced letter sequences (e.g., 't r o p i c a l') into single words
         # Only match sequences that are clearly OCR artifacts (single letters with spaces)
-        def _compact(match: re.Match) -> str:
-            seq = match.group(0)
-            parts = seq.strip().split()
-            # Only compact if we have 5+ single letters in sequence
-            if len(parts) >= 5 and all(len(p) == 1 and p.isalpha() for p in parts):
-                return "".join(parts)
-            return seq
-        cleaned = re.sub(r"(?:\b[a-zA-Z]\b\s+){4,}[a-zA-Z]\b", _compact, cleaned)
+        cleaned = _SPACED_LETTERS_RE.sub(_compact_spaced_letters, cleaned)
         
         # Restore URLs
         for placeholder, url in url_placeholders:
             cleaned = cleaned.replace(placeholder, url)
         
         # Split fused URLs introduced by missing whitespace (multiple http occurrences).
-        cleaned = re.sub(r"(https?://[^\s]{10,}?)(https?://)", r"\1 \2", cleaned)
+        cleaned = _FUSED_URL_RE.sub(r"\1 \2", cleaned)
 
         lower = cleaned.lower()
         if lower.startswith(("orcid", "keywords", "received", "accepted", "submitted", "correspondence")):
@@ -309,66 +472,48 @@ class PDFTextNormalizer:
         return cleaned.strip()
 
     def _canonicalize_urls(self, text: str) -> str:
-        # Step 0: Remove invisible Unicode characters that break URLs
-        invisible_chars = [
-            '\u200B',  # Zero-width space
-            '\u200C',  # Zero-width non-joiner  
-            '\u200D',  # Zero-width joiner
-            '\u00AD',  # Soft hyphen
-            '\uFEFF',  # Zero-width no-break space
-        ]
-        for char in invisible_chars:
-            text = text.replace(char, '')
-        
+        # Invisible characters are already dropped by _clean_paragraph's translate pass
+
         # Step 1: Remove urldefense wrappers (handle spaces in urldefense itself)
-        cleaned = re.sub(
-            r'https?://\s*urlde\s*fense\s*\.\s*com\s*/\s*v3\s*/\s*__\s*/?',
-            '',
-            text,
-            flags=re.IGNORECASE,
-        )
+        cleaned = _URLDEFENSE_RE.sub('', text)
         
         # Step 2: Fix protocol splits: "http : / /" or "http:/ /" -> "http://"
-        cleaned = re.sub(r'(https?)\s*:\s*/\s*/\s*', r'\1://', cleaned, flags=re.IGNORECASE)
+        cleaned = _SPACED_SCHEME_TRAILING_RE.sub(r'\1://', cleaned)
         
-        # Step 3: Remove spaces within URLs (simple character-by-character)
+        # Step 3: Remove spaces within URLs. Jump between scheme matches with one regex search
+        # and only walk characters inside URL bodies (no re-slicing of the remaining text).
         result = []
         i = 0
-        while i < len(cleaned):
-            # Look for http:// or https://
-            match = re.match(r'(https?://)', cleaned[i:], re.IGNORECASE)
-            if match:
-                # Found a URL start
-                result.append(match.group(1))
-                i += match.end()
-                
-                # Collect URL characters, removing spaces
-                url_chars = []
-                while i < len(cleaned) and len(url_chars) < 200:
-                    # Check for end of URL: space + common word
-                    remaining = cleaned[i:]
-                    if remaining.startswith((' and ', ' the ', ' on ', ' at ', ' in ', ' from ', ' or ', ' to ', ' are ', ' is ')):
-                        break
-                    
-                    ch = cleaned[i]
-                    # Skip whitespace in URLs
-                    if ch in ' \t\n\r':
-                        i += 1
-                        continue
-                    # Collect URL characters
-                    elif ch.isalnum() or ch in '.-_/=?&:#%':
-                        url_chars.append(ch)
-                        i += 1
-                    else:
-                        # Non-URL character, stop
-                        break
-                
-                result.append(''.join(url_chars))
-            else:
-                # Regular character, just copy it
-                result.append(cleaned[i])
-                i += 1
-        
+        n = len(cleaned)
+        while i < n:
+            match = _URL_SCHEME_RE.search(cleaned, i)
+            if not match:
+                result.append(cleaned[i:])
+                break
+            # Copy the text before the URL plus the scheme itself
+            result.append(cleaned[i:match.end()])
+            i = match.end()
+
+            # Collect URL characters, removing spaces
+            url_chars = []
+            while i < n and len(url_chars) < 200:
+                # Check for end of URL: space + common word
+                if cleaned.startswith(_URL_STOP_WORDS, i):
+                    break
+                ch = cleaned[i]
+                # Skip whitespace in URLs
+                if ch in ' \t\n\r':
+                    i += 1
+                    continue
+                # Collect URL characters
+                elif ch.isalnum() or ch in '.-_/=?&:#%':
+                    url_chars.append(ch)
+                    i += 1
+                else:
+                    # Non-URL character, stop
+                    break
+            result.append(''.join(url_chars))
+
         return ''.join(result)
 
     # ------------------------------------------------------------------ helpers
@@ -6,6 +6,13 @@ from typing import List, Optional, Sequence
 
 from app.services.text_normalizer import ParagraphBlock
 
+# Author/affiliation cues that end the title lines on the first page
+_AFFILIATION_CUE_RE = re.compile(
+    r"\b(author|affiliation|department|correspondence|university|institute)\b", re.IGNORECASE
+)
+# Journal running headers such as "Molecular Ecology (2000) 9, 1319-1324"
+_JOURNAL_HEADER_RE = re.compile(r"^[a-zA-Z\s]+\(\d{4}\)\s+\d+,\s+\d+-\d+$", re.IGNORECASE)
+
 
 @dataclass
 class TitleResolution:
@@ -30,9 +37,9 @@ class TitleResolver:
         return s
 
     def _is_bad(self, s: str) -> bool:
-        l = s.lower()
         if not s or len(s) < 8 or len(s) > 280:  # Increased max length
             return True
+        l = s.lower()
         # use whole-word stopword matching to avoid false positives
         if re.search(r"\b(abstract|introduction|copyright|license|doi|keywords)\b", l):
             return True
@@ -50,10 +57,9 @@ class TitleResolver:
 
     def _merge_first_page(self, blocks: Sequence[ParagraphBlock]) -> List[str]:
         lines: List[str] = []
-        cue_re = re.compile(r"\b(author|affiliation|department|correspondence|university|institute)\b", re.IGNORECASE)
-        # Pattern to detect journal headers that should be skipped
-        journal_header_re = re.compile(r"^[a-zA-Z\s]+\(\d{4}\)\s+\d+,\s+\d+-\d+$", re.IGNORECASE)
-        
+        cue_re = _AFFILIATION_CUE_RE
+        journal_header_re = _JOURNAL_HEADER_RE
+
         for b in blocks:
             if b.page != 1:
                 break
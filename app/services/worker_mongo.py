@@ -6,6 +6,7 @@ import os
 import tempfile
 import traceback
 import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from typing import Optional, List, Any, Dict
 from pymongo import ReturnDocument
 
@@ -29,6 +30,14 @@ from app.services.mongo_ops import (
 
 logger = logging.getLogger(__name__)
 
+# Job reads made for every processed document; the document_ids array is never needed here
+_JOB_EXISTS_PROJECTION = {"_id": 1}
+_JOB_PROGRESS_PROJECTION = {"progress": 1, "status": 1}
+
+# Spare analysis threads beyond the worker count. An analysis that outlives its timeout keeps
+# its thread until analyze returns; once this many have timed out the pool is replaced.
+_STUCK_THREAD_HEADROOM = 4
+
 # Claim only queued documents that belong to the currently running job (or have no job)
 _claim_filter = {"status": "queued"}
 _claim_update = {"$set": {"status": "processing"}}
@@ -102,91 +111,107 @@ async def _claim_next_document() -> Optional[dict]:
     return None
 
 
-async def _process_one(doc: dict) -> None:
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        # File already removed or doesn't exist
+        pass
+
+
+async def _process_one(doc: dict, executor: Executor) -> None:
     grid_id = str(doc.get("gridfs_id"))
     filename = (doc.get("filename") or "document.pdf").replace(os.sep, "_")
     doc_id = str(doc.get("_id"))
     job_id: Optional[str] = doc.get("job_id")
 
-    with tempfile.TemporaryDirectory(prefix="ecoopen_") as td:
-        tmp_path = os.path.join(td, filename)
-        try:
-            # GridFS read with job log instrumentation
-            if job_id:
-                try:
-                    await append_job_log(job_id, op="gridfs_read_start", phase="read", message="GridFS read start", doc_id=doc_id, filename=filename, worker=f"pid:{os.getpid()}", progress_current=None, progress_total=None)
-                except Exception:
-                    pass
-            with log_timing(logger, "gridfs_read", doc_id=doc_id, job_id=job_id, filename=filename):
-                t0 = time.perf_counter()
-                await read_file_to_path(grid_id, tmp_path)
-                if job_id:
-                    try:
-                        dt_ms = int((time.perf_counter() - t0) * 1000)
-                        await append_job_log(
-                            job_id,
-                            op="gridfs_read_end", phase="read", message="GridFS read complete", worker=f"pid:{os.getpid()}",
-                            doc_id=doc_id,
-                            filename=filename,
-                            duration_ms=dt_ms,
-                        )
-                    except Exception:
-                        pass
-
-            # Analyze with job log instrumentation
-            agent = AgentRunner(context={"doc_id": doc_id, "job_id": job_id, "filename": filename})
+    # A single unique temp file per document; the finally below removes it, so there is no
+    # per-document scratch directory to create and tree-delete. The stored filename is not part
+    # of the temp name (it may already be near the filesystem's name length limit).
+    tmp_path: Optional[str] = None
+    analysis: Optional[Future] = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix="ecoopen_", suffix=".pdf")
+        os.close(fd)
+        # GridFS read with job log instrumentation
+        if job_id:
+            try:
+                await append_job_log(job_id, op="gridfs_read_start", phase="read", message="GridFS read start", doc_id=doc_id, filename=filename, worker=f"pid:{os.getpid()}", progress_current=None, progress_total=None)
+            except Exception:
+                pass
+        with log_timing(logger, "gridfs_read", doc_id=doc_id, job_id=job_id, filename=filename):
+            t0 = time.perf_counter()
+            await read_file_to_path(grid_id, tmp_path)
             if job_id:
                 try:
-                    await append_job_log(job_id, op="analyze_pdf_start", phase="analyze", message="Analyze start", doc_id=doc_id, filename=filename, worker=f"pid:{os.getpid()}")
+                    dt_ms = int((time.perf_counter() - t0) * 1000)
+                    await append_job_log(
+                        job_id,
+                        op="gridfs_read_end", phase="read", message="GridFS read complete", worker=f"pid:{os.getpid()}",
+                        doc_id=doc_id,
+                        filename=filename,
+                        duration_ms=dt_ms,
+                    )
                 except Exception:
                     pass
-            with log_timing(logger, "analyze_pdf", doc_id=doc_id, job_id=job_id, filename=filename):
-                t1 = time.perf_counter()
-                model_res = await asyncio.to_thread(agent.analyze, tmp_path)
-                if job_id:
-                    try:
-                        dt_ms = int((time.perf_counter() - t1) * 1000)
-                        await append_job_log(
-                            job_id,
-                            op="analyze_pdf_end", phase="analyze", message="Analyze complete", worker=f"pid:{os.getpid()}",
-                            doc_id=doc_id,
-                            filename=filename,
-                            duration_ms=dt_ms,
-                        )
-                    except Exception:
-                        pass
 
-            await set_document_analysis(doc_id, model_res.model_dump())
-        except Exception as e:
-            # Capture stack for easier debugging and surface a descriptive error message
-            tb = traceback.format_exc()
-            err_text = f"{e.__class__.__name__}: {e}"
-            logger.exception("Worker failed processing doc_id=%s file=%s", doc_id, filename)
-            # Truncate to avoid oversized Mongo docs; include tail of traceback where the error is
-            tail = tb[-2000:]
+        # Analyze with job log instrumentation
+        agent = AgentRunner(context={"doc_id": doc_id, "job_id": job_id, "filename": filename})
+        if job_id:
+            try:
+                await append_job_log(job_id, op="analyze_pdf_start", phase="analyze", message="Analyze start", doc_id=doc_id, filename=filename, worker=f"pid:{os.getpid()}")
+            except Exception:
+                pass
+        with log_timing(logger, "analyze_pdf", doc_id=doc_id, job_id=job_id, filename=filename):
+            t1 = time.perf_counter()
+            analysis = executor.submit(agent.analyze, tmp_path)
+            model_res = await asyncio.wrap_future(analysis)
             if job_id:
                 try:
+                    dt_ms = int((time.perf_counter() - t1) * 1000)
                     await append_job_log(
                         job_id,
-                        level="error", phase="error", worker=f"pid:{os.getpid()}",
-                        op="error",
-                        message=err_text,
+                        op="analyze_pdf_end", phase="analyze", message="Analyze complete", worker=f"pid:{os.getpid()}",
                         doc_id=doc_id,
                         filename=filename,
-                        extra={"traceback_tail": tail},
+                        duration_ms=dt_ms,
                     )
                 except Exception:
                     pass
-            await set_document_status(doc_id, "error", error=f"{err_text}\n{tail}")
-        finally:
+
+        await set_document_analysis(doc_id, model_res.model_dump())
+    except Exception as e:
+        # Capture stack for easier debugging and surface a descriptive error message
+        tb = traceback.format_exc()
+        err_text = f"{e.__class__.__name__}: {e}"
+        logger.exception("Worker failed processing doc_id=%s file=%s", doc_id, filename)
+        # Truncate to avoid oversized Mongo docs; include tail of traceback where the error is
+        tail = tb[-2000:]
+        if job_id:
             try:
-                os.remove(tmp_path)
-            except OSError:
-                # File already removed or doesn't exist
+                await append_job_log(
+                    job_id,
+                    level="error", phase="error", worker=f"pid:{os.getpid()}",
+                    op="error",
+                    message=err_text,
+                    doc_id=doc_id,
+                    filename=filename,
+                    extra={"traceback_tail": tail},
+                )
+            except Exception:
                 pass
+        await set_document_status(doc_id, "error", error=f"{err_text}\n{tail}")
+    finally:
+        if tmp_path is not None:
+            if analysis is not None and not analysis.done():
+                # Timed out mid-analysis: the thread may still reopen the file in a fallback
+                # loader, so remove it once analyze returns
+                analysis.add_done_callback(lambda _f, path=tmp_path: _remove_quietly(path))
+            else:
+                _remove_quietly(tmp_path)
 
     # On success, append a completion log
-    if job_id and (await get_job(job_id)):
+    if job_id and (await get_job(job_id, projection=_JOB_EXISTS_PROJECTION)):
         try:
             await append_job_log(job_id, op="doc_done", phase="complete", message="Document processing complete", doc_id=doc_id, filename=filename, worker=f"pid:{os.getpid()}")
         except Exception:
@@ -195,7 +220,7 @@ async def _process_one(doc: dict) -> None:
     # Update job progress regardless of success or error
     if job_id:
         await inc_job_progress(job_id, by=1)
-        job = await get_job(job_id)
+        job = await get_job(job_id, projection=_JOB_PROGRESS_PROJECTION)
         if job:
             cur = ((job.get("progress") or {}).get("current")) or 0
             total = ((job.get("progress") or {}).get("total")) or 0
@@ -222,11 +247,35 @@ async def _process_one(doc: dict) -> None:
 
 
 class MongoWorker:
-    def __init__(self, concurrency: int = 1, poll_interval: float = 0.5) -> None:
+    def __init__(self, concurrency: int = 1, poll_interval: float = 0.5, max_poll_interval: float = 1.0) -> None:
         self.concurrency = max(1, concurrency)
         self.poll_interval = poll_interval
+        # Idle workers back off up to this interval; the first claimed document resets it. Kept
+        # near 1s: a fresh /analyze upload waits up to this long to be claimed, out of the route's
+        # short poll window before it falls back to analyzing synchronously.
+        self.max_poll_interval = max(poll_interval, max_poll_interval)
         self._stop = asyncio.Event()
         self._tasks: List[asyncio.Task] = []
+        # Analyses run on the worker's own threads so they never occupy the loop's default
+        # executor, which Motor and other to_thread callers rely on
+        self._executor = self._new_executor()
+        self._stuck_threads = 0
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.concurrency + _STUCK_THREAD_HEADROOM, thread_name_prefix="ecoopen-analyze")
+
+    def _note_timed_out_analysis(self) -> None:
+        """
+        Count a thread left behind by a timeout and swap in a fresh pool before such threads can
+        fill it. Threads that later finish are not subtracted, so this errs towards replacing
+        early; the old pool is shut down without waiting and its threads exit as analyses return.
+        """
+        self._stuck_threads += 1
+        if self._stuck_threads >= _STUCK_THREAD_HEADROOM:
+            old, self._executor = self._executor, self._new_executor()
+            self._stuck_threads = 0
+            old.shutdown(wait=False)
+            logger.warning("Replaced analysis thread pool after %d timed-out analyses", _STUCK_THREAD_HEADROOM)
 
     async def start(self) -> None:
         for _ in range(self.concurrency):
@@ -238,17 +287,22 @@ class MongoWorker:
         for t in self._tasks:
             t.cancel()
         await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
 
     async def _run(self) -> None:
+        idle_delay = self.poll_interval
         try:
             while not self._stop.is_set():
                 doc = await _claim_next_document()
                 if not doc:
-                    await asyncio.sleep(self.poll_interval)
+                    await asyncio.sleep(idle_delay)
+                    idle_delay = min(idle_delay * 2, self.max_poll_interval)
                     continue
+                idle_delay = self.poll_interval
                 try:
-                    await asyncio.wait_for(_process_one(doc), timeout=settings.DOC_PROCESS_TIMEOUT_SECONDS)
+                    await asyncio.wait_for(_process_one(doc, self._executor), timeout=settings.DOC_PROCESS_TIMEOUT_SECONDS)
                 except asyncio.TimeoutError:
+                    self._note_timed_out_analysis()
                     # Mark timed-out document as error and continue
                     try:
                         did = str(doc.get("_id"))
@@ -271,7 +325,7 @@ class MongoWorker:
                         # Update progress and possibly finish the job
                         if job_id:
                             await inc_job_progress(job_id, by=1)
-                            job = await get_job(job_id)
+                            job = await get_job(job_id, projection=_JOB_PROGRESS_PROJECTION)
                             if job:
                                 cur = ((job.get("progress") or {}).get("current")) or 0
                                 total = ((job.get("progress") or {}).get("total")) or 0
@@ -1,10 +1,20 @@
 """
 Pytest configuration and fixtures for testing EcoOpen LLM.
 """
+from functools import lru_cache
+
 import pytest
 from fastapi.testclient import TestClient
 
 
+@pytest.fixture(autouse=True)
+def _availability_diagnostics_to_tmp(monkeypatch, tmp_path):
+    """Write the per-analysis diagnostics JSON under tmp_path instead of app/logs in the source tree."""
+    from app.services import agent as agent_mod
+
+    monkeypatch.setattr(agent_mod, "_diagnostics_dir", lru_cache(maxsize=1)(lambda: tmp_path))
+
+
 @pytest.fixture
 def client():
     """
@@ -8,10 +8,10 @@ def _install_minimal_mongo(monkeypatch):
     # Provide minimal async functions used in /analyze path when queue fallback occurs
     db_mod = types.ModuleType("app.services.db")
 
-    async def put_file(content: bytes, filename: str, content_type: str, metadata: dict) -> str:
+    async def put_file_from_path(path: str, filename: str, content_type: str, metadata: dict) -> str:
         return "gridfs-id-1"
 
-    db_mod.put_file = put_file  # type: ignore
+    db_mod.put_file_from_path = put_file_from_path  # type: ignore
 
     mo_mod = types.ModuleType("app.services.mongo_ops")
 
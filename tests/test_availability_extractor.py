@@ -118,3 +118,13 @@ def test_heading_only_does_not_return_statement():
 
     result = engine.extract(pages, chat_fn=empty_chat, diagnostics=False)
     assert result.data_statement is None
+
+
+def test_infer_heading_matches_token_prefixes_case_insensitively():
+    engine = _engine()
+    assert engine._infer_heading("Data Availability Statement") == "data"
+    assert engine._infer_heading("availability of supporting data: see below") == "data"
+    assert engine._infer_heading("Code and Data Availability") == "code"
+    assert engine._infer_heading("SOFTWARE AVAILABILITY") == "code"
+    assert engine._infer_heading("METHODS") == "generic"
+    assert engine._infer_heading("The data availability was limited") is None
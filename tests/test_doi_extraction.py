@@ -1,3 +1,4 @@
+import json
 import os
 import types
 import pytest
@@ -165,6 +166,9 @@ def test_doi_registry_caching_and_ttl(monkeypatch):
                     "issued": {"date-parts": [[2024]]},
                 }
             }
+        @property
+        def content(self):
+            return json.dumps(self.json()).encode("utf-8")
 
     class _FakeClient:
         def __init__(self, timeout=None):
@@ -173,12 +177,12 @@ def test_doi_registry_caching_and_ttl(monkeypatch):
             return self
         def __exit__(self, exc_type, exc, tb):
             return False
-        def get(self, url, headers=None):
+        def get(self, url, headers=None, params=None, timeout=None):
             calls["count"] += 1
             return _FakeResp(title="Cached Title")
 
-    # Monkeypatch httpx.Client used in DOIRegistry
-    monkeypatch.setattr(mod.httpx, "Client", _FakeClient, raising=False)
+    # Monkeypatch the shared client used by DOIRegistry
+    monkeypatch.setattr(mod, "_shared_client", lambda: _FakeClient(), raising=False)
 
     # Control time progression
     base = 1000.0
@@ -199,3 +203,182 @@ def test_doi_registry_caching_and_ttl(monkeypatch):
     rec3 = reg.lookup("10.4242/cached")
     assert rec3 and rec3.get("title") == "Cached Title"
     assert calls["count"] == 2
+
+
+def test_doi_registry_title_search_is_cached(monkeypatch):
+    from app.services import doi_registry as mod
+
+    calls = {"crossref": 0, "openalex": 0}
+
+    class _Reg(mod.DOIRegistry):
+        def _search_crossref_by_title(self, title, rows=5):
+            calls["crossref"] += 1
+            return {"doi": "10.1234/abc", "title": title, "issued_year": 2021, "score": 0.9, "source": "crossref"}
+
+        def _search_openalex_by_title(self, title, rows=5):
+            calls["openalex"] += 1
+            return None
+
+    monkeypatch.setattr(mod.DOIRegistry, "_cache", {}, raising=False)
+    reg = _Reg(timeout_sec=2, cache_ttl=60)
+    first = reg.search_by_title("A Cached  Title Search")
+    second = reg.search_by_title("a cached title search")
+    assert first and second and second["doi"] == "10.1234/abc"
+    assert calls == {"crossref": 1, "openalex": 1}
+
+
+def test_doi_registry_persists_to_disk_cache(monkeypatch, tmp_path):
+    from app.services import doi_registry as mod
+
+    monkeypatch.setattr(settings, "DOI_CACHE_PATH", str(tmp_path / "doi_cache.sqlite3"), raising=False)
+    monkeypatch.setattr(mod.DOIRegistry, "_cache", {}, raising=False)
+    reg = mod.DOIRegistry(timeout_sec=2, cache_ttl=60)
+    reg._set_cached("10.1234/Disk", {"title": "Persisted"})
+
+    # Simulate a restart: the in-memory cache is empty, the SQLite file is not
+    monkeypatch.setattr(mod.DOIRegistry, "_cache", {}, raising=False)
+    monkeypatch.setattr(mod, "_shared_client", lambda: (_ for _ in ()).throw(AssertionError("network used")))
+    assert mod.DOIRegistry(timeout_sec=2, cache_ttl=60).lookup("10.1234/disk") == {"title": "Persisted"}
+
+
+def test_doi_registry_cache_key_ignores_doi_form(monkeypatch):
+    from app.services import doi_registry as mod
+
+    monkeypatch.setattr(settings, "DOI_CACHE_PATH", None, raising=False)
+    monkeypatch.setattr(mod.DOIRegistry, "_cache", {}, raising=False)
+    reg = mod.DOIRegistry(timeout_sec=2, cache_ttl=60)
+    reg._set_cached("10.1234/Abc", {"title": "Cached"})
+    monkeypatch.setattr(mod, "_shared_client", lambda: (_ for _ in ()).throw(AssertionError("network used")))
+    assert reg.lookup("https://doi.org/10.1234/ABC") == {"title": "Cached"}
+    assert reg.lookup("doi: 10.1234/abc") == {"title": "Cached"}
+
+
+def test_doi_registry_caches_unknown_doi(monkeypatch):
+    from app.services import doi_registry as mod
+
+    monkeypatch.setattr(settings, "DOI_CACHE_PATH", None, raising=False)
+    monkeypatch.setattr(mod.DOIRegistry, "_cache", {}, raising=False)
+    calls = {"n": 0}
+
+    class _Resp:
+        status_code = 404
+        text = "Resource not found."
+
+    def _get(self, url, params=None):
+        calls["n"] += 1
+        return _Resp()
+
+    monkeypatch.setattr(mod.DOIRegistry, "_get", _get)
+    reg = mod.DOIRegistry(timeout_sec=2, cache_ttl=60)
+    assert reg.lookup("10.1234/missing") is None
+    assert reg.lookup("10.1234/missing") is None
+    assert calls["n"] == 1
+
+
+def test_doi_verified_by_lookup_skips_title_search(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "ENABLE_DOI_VERIFICATION", True, raising=False)
+
+    blocks = _blocks([
+        "Sample Ecological Study",
+        "https://doi.org/10.5678/verify.match",
+    ])
+    _patch_minimal(monkeypatch, blocks)
+
+    from app.services import doi_registry as mod
+
+    calls = {"search": 0}
+
+    class _FakeReg(mod.DOIRegistry):
+        def __init__(self):
+            pass
+        def lookup(self, doi: str):
+            return {"title": "Sample Ecological Study"}
+        def search_by_title(self, title, rows=5):
+            calls["search"] += 1
+            return None
+
+    monkeypatch.setattr(mod, "DOIRegistry", _FakeReg, raising=False)
+
+    result = AgentRunner().analyze(os.path.join(tmp_path, "dummy.pdf"))
+
+    assert result.doi == "10.5678/verify.match"
+    assert calls["search"] == 0
+
+
+def test_license_extraction_skipped_without_license_text(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "ENABLE_DOI_VERIFICATION", False, raising=False)
+    labels = []
+
+    def _fake_extract(self, vs, query, system, label, k=6):
+        labels.append(label)
+        return "Creative Commons Attribution 4.0"
+
+    monkeypatch.setattr(AgentRunner, "_extract_single", _fake_extract, raising=False)
+
+    _patch_minimal(monkeypatch, _blocks(["Sample Ecological Study", "Results and discussion."]))
+    result = AgentRunner().analyze(os.path.join(tmp_path, "dummy.pdf"))
+    assert not any("license" in label for label in labels)
+    assert result.data_sharing_license is None
+
+    _patch_minimal(monkeypatch, _blocks(["Sample Ecological Study", "Data are licensed under CC BY 4.0."]))
+    result = AgentRunner().analyze(os.path.join(tmp_path, "dummy.pdf"))
+    assert "data sharing license" in labels
+    assert result.data_sharing_license == "CC-BY-4.0"
+
+
+def test_license_prompts_cancelled_when_availability_step_fails(monkeypatch, tmp_path):
+    from concurrent.futures import Future
+    from app.services import agent as agent_mod
+    from app.services.availability import AvailabilityEngine
+
+    submitted = []
+
+    class _IdlePool:
+        # Queued work that never starts, like prompts waiting behind a busy shared pool
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(Future())
+            return submitted[-1]
+
+    def _boom(self, *args, **kwargs):
+        raise RuntimeError("availability failed")
+
+    monkeypatch.setattr(agent_mod, "shared_io_executor", lambda: _IdlePool())
+    monkeypatch.setattr(AvailabilityEngine, "extract", _boom)
+    _patch_minimal(monkeypatch, _blocks(["Sample Ecological Study", "Data are licensed under CC BY 4.0."]))
+
+    with pytest.raises(RuntimeError, match="availability failed"):
+        AgentRunner().analyze(os.path.join(tmp_path, "dummy.pdf"))
+    assert len(submitted) == 2
+    assert all(f.cancelled() for f in submitted)
+
+
+def test_doi_title_search_prefers_configured_source_on_tie(monkeypatch):
+    from app.services import doi_registry as mod
+
+    cr = {"doi": "10.1/cr", "score": 0.8, "source": "crossref"}
+    oa = {"doi": "10.1/oa", "score": 0.8, "source": "openalex"}
+    monkeypatch.setattr(mod.DOIRegistry, "_search_crossref_by_title", lambda self, q, rows=5: cr, raising=False)
+    monkeypatch.setattr(mod.DOIRegistry, "_search_openalex_by_title", lambda self, q, rows=5: oa, raising=False)
+    reg = mod.DOIRegistry(timeout_sec=2, cache_ttl=1)
+
+    monkeypatch.setattr(settings, "DOI_TITLE_SEARCH_PREFERRED_SOURCE", "openalex", raising=False)
+    assert reg._search_by_title_uncached("t", rows=5) is oa
+    monkeypatch.setattr(settings, "DOI_TITLE_SEARCH_PREFERRED_SOURCE", "crossref", raising=False)
+    assert reg._search_by_title_uncached("t", rows=5) is cr
+
+    oa["score"] = 0.9
+    assert reg._search_by_title_uncached("t", rows=5) is oa
+
+
+def test_doi_registry_memory_cache_is_bounded(monkeypatch):
+    from app.services import doi_registry as mod
+
+    monkeypatch.setattr(settings, "DOI_CACHE_PATH", None, raising=False)
+    monkeypatch.setattr(settings, "DOI_MEMORY_CACHE_SIZE", 2, raising=False)
+    monkeypatch.setattr(mod.DOIRegistry, "_cache", {}, raising=False)
+    reg = mod.DOIRegistry(timeout_sec=2, cache_ttl=60)
+    for i in range(3):
+        reg._set_cached(f"10.1234/{i}", {"title": str(i)})
+    assert list(mod.DOIRegistry._cache) == ["10.1234/1", "10.1234/2"]
+    assert reg._get_cached("10.1234/0") is None
+    assert reg._get_cached("10.1234/2") == {"title": "2"}
@@ -23,7 +23,7 @@ def _install_fake_mongo_with_flag(monkeypatch):
     async def get_job(job_id):
         return {"_id": job_id, "status": "done", "progress": {"current": 1, "total": 1}}
 
-    async def list_job_documents(job_id):
+    async def list_job_documents(job_id, projection=None, statuses=None):
         return [
             {
                 "status": "done",
@@ -44,3 +44,18 @@ def test_link_inspector_split_kinds():
     assert data == ["https://zenodo.org/record/1"]
     assert code == ["https://github.com/a/b"]
     assert other == ["https://example.com/x"]
+
+
+def test_link_inspector_classifies_by_host_first():
+    insp = LinkInspector()
+    infos = insp.inspect([
+        "https://github.com/lab/zenodo.org-export",
+        "https://sandbox.zenodo.org/record/5",
+        "https://dataverse.harvard.edu/dataset.xhtml?id=1",
+        "https://doi.org/10.5061/dryad.abc",
+    ])
+    kinds = {i.url: i.kind for i in infos}
+    assert kinds["https://github.com/lab/zenodo.org-export"] == "code"
+    assert kinds["https://sandbox.zenodo.org/record/5"] == "data"
+    assert kinds["https://dataverse.harvard.edu/dataset.xhtml?id=1"] == "data"
+    assert kinds["https://doi.org/10.5061/dryad.abc"] == "data"
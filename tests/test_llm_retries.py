@@ -2,6 +2,9 @@ import types
 import httpx
 import pytest
 
+from app.core.config import settings
+from app.services import agent as agent_mod
+from app.services import llm_client as llm_client_mod
 from app.services.llm_client import HttpLLMClient, ChatMessage
 from app.services.agent import EndpointEmbeddings
 
@@ -29,7 +32,7 @@ class _FakeClient:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def post(self, url, json=None, headers=None):
+    def post(self, url, json=None, headers=None, timeout=None):
         self.calls += 1
         eff = self._effects.pop(0)
         if isinstance(eff, BaseException):
@@ -44,6 +47,9 @@ def _patch_httpx_client(monkeypatch, side_effects):
         return fake
 
     monkeypatch.setattr(httpx, "Client", _fake_ctor)
+    # Chat and embedding calls go through their modules' shared pooled clients
+    monkeypatch.setattr(llm_client_mod, "_shared_client", lambda: fake)
+    monkeypatch.setattr(agent_mod, "_shared_embeddings_client", lambda: fake)
     return fake
 
 
@@ -104,3 +110,134 @@ def test_embeddings_retries_then_succeeds(monkeypatch):
     assert vecs == [[0.1, 0.2]]
     assert fake.calls == 2
     assert sleep_calls["count"] >= 1
+
+
+def test_cached_embeddings_only_embeds_misses(monkeypatch):
+    from app.services.agent import CachedEmbeddings
+
+    class _Inner:
+        def __init__(self):
+            self.batches = []
+
+        def embed_documents(self, texts):
+            self.batches.append(list(texts))
+            return [[float(len(t))] for t in texts]
+
+        def embed_query(self, text):
+            self.batches.append([text])
+            return [float(len(text))]
+
+    monkeypatch.setattr(CachedEmbeddings, "_cache", {}, raising=False)
+    inner = _Inner()
+    emb = CachedEmbeddings(inner, namespace="test:model")
+    assert emb.embed_documents(["aa", "bbb"]) == [[2.0], [3.0]]
+    assert emb.embed_documents(["bbb", "cccc"]) == [[3.0], [4.0]]
+    assert emb.embed_query("aa") == [2.0]
+    assert emb.embed_query("aa") == [2.0]
+    assert inner.batches == [["aa", "bbb"], ["cccc"], ["aa"]]
+
+
+def test_cached_embeddings_embeds_repeated_texts_once(monkeypatch):
+    from app.services.agent import CachedEmbeddings
+
+    class _Inner:
+        def __init__(self):
+            self.batches = []
+
+        def embed_documents(self, texts):
+            self.batches.append(list(texts))
+            return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(CachedEmbeddings, "_cache", {}, raising=False)
+    inner = _Inner()
+    emb = CachedEmbeddings(inner, namespace="test:model")
+    assert emb.embed_documents(["aa", "bbb", "aa"]) == [[2.0], [3.0], [2.0]]
+    assert inner.batches == [["aa", "bbb"]]
+
+
+def test_chat_responses_are_cached_per_prompt(monkeypatch):
+    class _LLM:
+        def __init__(self):
+            self.prompts = []
+
+        def chat_complete(self, messages, model=None, temperature=0.0):
+            self.prompts.append(messages[-1].content)
+            return "" if messages[-1].content == "empty" else f"re: {messages[-1].content}"
+
+    llm = _LLM()
+    monkeypatch.setattr(agent_mod, "get_llm_client", lambda: llm, raising=False)
+    monkeypatch.setattr(agent_mod, "_chat_cache", {}, raising=False)
+    monkeypatch.setattr(settings, "AGENT_RESPONSE_CACHE_SIZE", 256, raising=False)
+    monkeypatch.setattr(settings, "MCP_ENABLED", False, raising=False)
+    monkeypatch.setattr(settings, "AGENT_BASE_URL", "http://llm-a/v1", raising=False)
+    runner = agent_mod.AgentRunner()
+    assert runner._chat("sys", "a") == "re: a"
+    assert runner._chat("sys", "a") == "re: a"
+    assert runner._chat("other", "a") == "re: a"
+    assert runner._chat("sys", "empty") == ""
+    assert runner._chat("sys", "empty") == ""
+    assert llm.prompts == ["a", "a", "empty", "empty"]
+    # Another endpoint serving the same model name gets its own entries
+    monkeypatch.setattr(settings, "AGENT_BASE_URL", "http://llm-b/v1", raising=False)
+    assert runner._chat("sys", "a") == "re: a"
+    assert llm.prompts == ["a", "a", "empty", "empty", "a"]
+
+
+def test_chat_response_cache_is_off_by_default(monkeypatch):
+    class _LLM:
+        def __init__(self):
+            self.calls = 0
+
+        def chat_complete(self, messages, model=None, temperature=0.0):
+            self.calls += 1
+            return "answer"
+
+    llm = _LLM()
+    monkeypatch.setattr(agent_mod, "get_llm_client", lambda: llm, raising=False)
+    monkeypatch.setattr(agent_mod, "_chat_cache", {}, raising=False)
+    assert type(settings).model_fields["AGENT_RESPONSE_CACHE_SIZE"].default == 0
+    monkeypatch.setattr(settings, "AGENT_RESPONSE_CACHE_SIZE", 0, raising=False)
+    runner = agent_mod.AgentRunner()
+    runner._chat("sys", "a")
+    runner._chat("sys", "a")
+    assert llm.calls == 2 and agent_mod._chat_cache == {}
+
+
+def test_embeddings_are_sent_in_batches(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EMBEDDINGS_BATCH_SIZE", 2, raising=False)
+    fake = _patch_httpx_client(monkeypatch, [
+        _FakeResponse(200, json_data={"data": [{"embedding": [1.0]}, {"embedding": [2.0]}]}),
+        _FakeResponse(200, json_data={"data": [{"embedding": [3.0]}]}),
+    ])
+
+    emb = EndpointEmbeddings(base_url="http://example.com/v1", api_key=None, model="embed-x")
+    assert emb.embed_documents(["a", "b", "c"]) == [[1.0], [2.0], [3.0]]
+    assert fake.calls == 2
+
+
+def test_cached_embeddings_respects_cache_size(monkeypatch):
+    from app.services.agent import CachedEmbeddings
+
+    class _Inner:
+        def __init__(self):
+            self.calls = 0
+
+        def embed_query(self, text):
+            self.calls += 1
+            return [0.5, float(len(text))]
+
+    monkeypatch.setattr(CachedEmbeddings, "_cache", {}, raising=False)
+    monkeypatch.setattr(settings, "EMBEDDINGS_CACHE_SIZE", 0, raising=False)
+    inner = _Inner()
+    emb = CachedEmbeddings(inner, namespace="test:model")
+    emb.embed_query("aa")
+    emb.embed_query("aa")
+    assert inner.calls == 2 and CachedEmbeddings._cache == {}
+
+    monkeypatch.setattr(settings, "EMBEDDINGS_CACHE_SIZE", 1, raising=False)
+    assert emb.embed_query("aa") == [0.5, 2.0]
+    assert emb.embed_query("aa") == [0.5, 2.0]
+    emb.embed_query("bbb")
+    assert inner.calls == 4 and len(CachedEmbeddings._cache) == 1
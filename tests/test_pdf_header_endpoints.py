@@ -4,13 +4,17 @@ import pytest
 
 
 def _install_fake_mongo_modules(monkeypatch):
-    # Create fake app.services.db with put_file
+    # Create fake app.services.db with put_file_from_path
     db_mod = types.ModuleType("app.services.db")
 
-    async def put_file(content: bytes, filename: str, content_type: str, metadata: dict) -> str:
+    async def put_file_from_path(path: str, filename: str, content_type: str, metadata: dict) -> str:
         return "gridfs-id-1"
 
-    db_mod.put_file = put_file  # type: ignore
+    async def delete_file(file_id: str) -> None:
+        return None
+
+    db_mod.put_file_from_path = put_file_from_path  # type: ignore
+    db_mod.delete_file = delete_file  # type: ignore
 
     # Create fake app.services.mongo_ops with required functions
     mo_mod = types.ModuleType("app.services.mongo_ops")
@@ -27,10 +31,18 @@ def _install_fake_mongo_modules(monkeypatch):
     async def set_document_status(doc_id, status):
         return None
 
+    async def queue_documents(doc_ids, job_id):
+        return None
+
+    async def delete_documents(doc_ids):
+        return None
+
     mo_mod.create_document = create_document  # type: ignore
     mo_mod.create_job = create_job  # type: ignore
     mo_mod.set_document_job_id = set_document_job_id  # type: ignore
     mo_mod.set_document_status = set_document_status  # type: ignore
+    mo_mod.queue_documents = queue_documents  # type: ignore
+    mo_mod.delete_documents = delete_documents  # type: ignore
 
     sys.modules["app.services.db"] = db_mod
     sys.modules["app.services.mongo_ops"] = mo_mod
@@ -52,6 +64,53 @@ def test_single_analyze_rejects_non_pdf(client):
     assert "bad header" in r.text
 
 
+def test_single_analyze_sync_timeout_returns_504(client, monkeypatch):
+    from app.main import app as fastapi_app
+    from app.routes import analyze as analyze_module
+    _override_auth(fastapi_app)
+
+    async def _timed_out(tmp_path):
+        raise TimeoutError("Processing timed out after 60 seconds")
+
+    monkeypatch.setattr(analyze_module, "_run_analysis", _timed_out)
+    files = {"file": ("paper.pdf", b"%PDF-1.4\n%%EOF", "application/pdf")}
+    r = client.post("/analyze?mode=sync", files=files)
+    assert r.status_code == 504
+    assert "timed out" in r.text
+
+
+def test_sync_timeout_keeps_upload_until_analysis_returns(client, monkeypatch):
+    import os
+    import threading
+    import time
+    from app.main import app as fastapi_app
+    from app.routes import analyze as analyze_module
+    _override_auth(fastapi_app)
+
+    release = threading.Event()
+    seen = {}
+
+    def _slow_analyze(self, path):
+        seen["path"] = path
+        release.wait(5)
+        assert os.path.exists(path)
+
+    monkeypatch.setattr(analyze_module.AgentRunner, "__init__", lambda self: None)
+    monkeypatch.setattr(analyze_module.AgentRunner, "analyze", _slow_analyze)
+    monkeypatch.setattr(analyze_module.settings, "DOC_PROCESS_TIMEOUT_SECONDS", 0.2)
+    files = {"file": ("paper.pdf", b"%PDF-1.4\n%%EOF", "application/pdf")}
+    r = client.post("/analyze?mode=sync", files=files)
+    assert r.status_code == 504
+    # The abandoned thread may still reopen the file, so it outlives the request
+    assert os.path.exists(seen["path"])
+    release.set()
+    deadline = time.monotonic() + 5
+    while os.path.exists(seen["path"]) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(seen["path"])
+    assert not analyze_module._abandoned_analyses
+
+
 def test_batch_analyze_rejects_non_pdf(client, monkeypatch):
     from app.main import app as fastapi_app
     _override_auth(fastapi_app)
@@ -61,3 +120,138 @@ def test_batch_analyze_rejects_non_pdf(client, monkeypatch):
     r = client.post("/analyze/batch", files=files)
     assert r.status_code == 400
     assert "not a valid PDF" in r.text or "bad header" in r.text
+
+
+def test_batch_analyze_validates_all_files_before_upload(client, monkeypatch):
+    from app.main import app as fastapi_app
+    _override_auth(fastapi_app)
+
+    _install_fake_mongo_modules(monkeypatch)
+    uploads = []
+
+    async def put_file_from_path(path, filename, content_type, metadata):
+        uploads.append(filename)
+        return "gridfs-id-1"
+
+    sys.modules["app.services.db"].put_file_from_path = put_file_from_path  # type: ignore
+    files = [
+        ("files", ("good.pdf", b"%PDF-1.4 ok", "application/pdf")),
+        ("files", ("bad.pdf", b"BAD!!", "application/pdf")),
+    ]
+    r = client.post("/analyze/batch", files=files)
+    assert r.status_code == 400
+    assert "bad.pdf" in r.text
+    assert uploads == []
+
+
+def test_batch_analyze_stores_spooled_files_in_order(client, monkeypatch):
+    import hashlib
+    import os
+    from app.main import app as fastapi_app
+    _override_auth(fastapi_app)
+
+    _install_fake_mongo_modules(monkeypatch)
+    stored = []
+    queued = {}
+
+    async def put_file_from_path(path, filename, content_type, metadata):
+        with open(path, "rb") as fh:
+            stored.append((filename, fh.read(), metadata["sha256"], path))
+        return f"grid-{filename}"
+
+    async def create_document(**kwargs):
+        return f"doc-{kwargs['filename']}"
+
+    async def queue_documents(doc_ids, job_id):
+        queued["doc_ids"] = doc_ids
+
+    sys.modules["app.services.db"].put_file_from_path = put_file_from_path  # type: ignore
+    sys.modules["app.services.mongo_ops"].create_document = create_document  # type: ignore
+    sys.modules["app.services.mongo_ops"].queue_documents = queue_documents  # type: ignore
+    bodies = {"a.pdf": b"%PDF-1.4 first", "b.pdf": b"%PDF-1.4 second"}
+    files = [("files", (name, body, "application/pdf")) for name, body in bodies.items()]
+    r = client.post("/analyze/batch", files=files)
+    assert r.status_code == 200, r.text
+    assert queued["doc_ids"] == ["doc-a.pdf", "doc-b.pdf"]
+    assert sorted((name, body, sha) for name, body, sha, _ in stored) == [
+        (name, body, hashlib.sha256(body).hexdigest()) for name, body in bodies.items()
+    ]
+    assert not any(os.path.exists(path) for *_, path in stored)
+
+
+def test_batch_analyze_rolls_back_stored_files_on_failure(client, monkeypatch):
+    from app.main import app as fastapi_app
+    _override_auth(fastapi_app)
+
+    _install_fake_mongo_modules(monkeypatch)
+    deleted_files = []
+    deleted_docs = []
+    created_jobs = []
+
+    async def put_file_from_path(path, filename, content_type, metadata):
+        return f"grid-{filename}"
+
+    async def create_document(**kwargs):
+        if kwargs["filename"] == "b.pdf":
+            raise RuntimeError("insert failed")
+        return f"doc-{kwargs['filename']}"
+
+    async def delete_file(file_id):
+        deleted_files.append(file_id)
+
+    async def delete_documents(doc_ids):
+        deleted_docs.extend(doc_ids)
+
+    async def create_job(**kwargs):
+        created_jobs.append(kwargs)
+        return "job-1"
+
+    sys.modules["app.services.db"].put_file_from_path = put_file_from_path  # type: ignore
+    sys.modules["app.services.db"].delete_file = delete_file  # type: ignore
+    sys.modules["app.services.mongo_ops"].create_document = create_document  # type: ignore
+    sys.modules["app.services.mongo_ops"].delete_documents = delete_documents  # type: ignore
+    sys.modules["app.services.mongo_ops"].create_job = create_job  # type: ignore
+    files = [("files", (name, b"%PDF-1.4 body", "application/pdf")) for name in ("a.pdf", "b.pdf", "c.pdf")]
+    with pytest.raises(RuntimeError, match="insert failed"):
+        client.post("/analyze/batch", files=files)
+    assert sorted(deleted_files) == ["grid-a.pdf", "grid-b.pdf", "grid-c.pdf"]
+    assert sorted(deleted_docs) == ["doc-a.pdf", "doc-c.pdf"]
+    assert created_jobs == []
+
+
+def test_single_analyze_queue_uploads_spooled_file(client, monkeypatch):
+    import hashlib
+    import os
+    from app.main import app as fastapi_app
+    _override_auth(fastapi_app)
+
+    _install_fake_mongo_modules(monkeypatch)
+    payload = b"%PDF-1.4 queued body"
+    seen = {}
+
+    async def put_file_from_path(path, filename, content_type, metadata):
+        with open(path, "rb") as fh:
+            seen["content"] = fh.read()
+        seen["path"] = path
+        seen["metadata"] = metadata
+        return "gridfs-id-1"
+
+    async def get_document(doc_id, projection=None):
+        return {"status": "done", "filename": "paper.pdf", "analysis": {"title": "Queued Paper"}}
+
+    async def _noop(*args, **kwargs):
+        return None
+
+    sys.modules["app.services.db"].put_file_from_path = put_file_from_path  # type: ignore
+    mo_mod = sys.modules["app.services.mongo_ops"]
+    mo_mod.get_document = get_document  # type: ignore
+    for name in ("set_document_analysis", "inc_job_progress", "set_job_status", "append_job_log", "get_job"):
+        setattr(mo_mod, name, _noop)
+
+    r = client.post("/analyze?mode=queue", files={"file": ("paper.pdf", payload, "application/pdf")})
+    assert r.status_code == 200, r.text
+    assert r.json()["title"] == "Queued Paper"
+    assert seen["content"] == payload
+    assert seen["metadata"]["size"] == len(payload)
+    assert seen["metadata"]["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert not os.path.exists(seen["path"])
@@ -69,3 +69,17 @@ def test_status_future_availability():
     data_stmt = "All datasets will be made available upon publication."
     ds, _ = _infer_status(data_stmt, None, [], [])
     assert ds == "future"
+
+
+def _phrase_families(statement: str) -> set:
+    from app.services.agent import _STATUS_PHRASES_RE
+    return {m.lastgroup for m in _STATUS_PHRASES_RE.finditer(statement.lower())}
+
+
+def test_status_phrases_start_at_word_boundaries():
+    # Glued onto the previous word, "reasonable request" is not a phrase match
+    assert _phrase_families("Described in the papereasonable request") == {"embedded"}
+    assert "restricted" not in _phrase_families("unreasonable request")
+    # The phrase end stays open, so plurals still count
+    assert _phrase_families("Data are available upon requests.") == {"restricted"}
+    assert _phrase_families("Provided in the paper and will be made available later.") == {"embedded", "future"}
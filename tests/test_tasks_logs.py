@@ -12,7 +12,7 @@ def _patch_no_mongo(monkeypatch):
 def _install_fake_mongo_ops(monkeypatch, *, get_job_returns=None, list_job_logs_returns=None):
     mod = types.ModuleType("app.services.mongo_ops")
 
-    async def get_job(job_id: str):  # type: ignore
+    async def get_job(job_id: str, projection=None):  # type: ignore
         return get_job_returns
 
     async def list_job_logs(job_id: str, **kwargs):  # type: ignore
@@ -0,0 +1,22 @@
+import pytest
+
+from app.services.text_normalizer import PDFTextNormalizer
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        # Invisible characters are dropped before de-hyphenation, so they no longer block the join
+        ("data-\n\u00adset", "dataset"),
+        ("Data\u200b-\nset", "Dataset"),
+        # ...and before whitespace collapsing, so they no longer leave double spaces behind
+        ("a \u200b b", "a b"),
+        ("a\u200b b", "a b"),
+        ("x \ufeff, y", "x, y"),
+        # Unchanged: dashes fold to hyphens and URLs are still repaired
+        ("2010\u20132020", "2010-2020"),
+        ("https://doi.org/10.\u200b5061/dryad", "https://doi.org/10.5061/dryad"),
+    ],
+)
+def test_clean_paragraph_drops_invisible_characters_first(raw, expected):
+    assert PDFTextNormalizer()._clean_paragraph(raw) == expected
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+
+@pytest.mark.skipif(__import__("importlib").util.find_spec("pymongo") is None, reason="pymongo not installed")
+@pytest.mark.asyncio
+async def test_worker_keeps_processing_after_hung_analyses(monkeypatch):
+    from app.services import worker_mongo
+
+    release = threading.Event()
+    queue = [{"_id": f"hung-{i}", "gridfs_id": "g", "filename": f"hung-{i}.pdf"} for i in range(6)]
+    queue.append({"_id": "good", "gridfs_id": "g", "filename": "good.pdf"})
+    statuses = {}
+    analyzed = []
+    readable_after_timeout = []
+
+    class _Result:
+        def model_dump(self):
+            return {"title": "ok"}
+
+    class _Agent:
+        def __init__(self, context=None):
+            self.doc_id = context["doc_id"]
+
+        def analyze(self, path):
+            if self.doc_id.startswith("hung"):
+                release.wait(5)
+                # The worker gave up long ago, but a fallback loader may still reopen the file
+                readable_after_timeout.append(os.path.exists(path))
+            return _Result()
+
+    async def _claim_next_document():
+        return queue.pop(0) if queue else None
+
+    async def read_file_to_path(grid_id, path):
+        return None
+
+    async def set_document_status(doc_id, status, error=None):
+        statuses[doc_id] = status
+
+    async def set_document_analysis(doc_id, analysis):
+        analyzed.append(doc_id)
+
+    monkeypatch.setattr(worker_mongo, "_claim_next_document", _claim_next_document)
+    monkeypatch.setattr(worker_mongo, "read_file_to_path", read_file_to_path)
+    monkeypatch.setattr(worker_mongo, "set_document_status", set_document_status)
+    monkeypatch.setattr(worker_mongo, "set_document_analysis", set_document_analysis)
+    monkeypatch.setattr(worker_mongo, "AgentRunner", _Agent)
+    monkeypatch.setattr(worker_mongo.settings, "DOC_PROCESS_TIMEOUT_SECONDS", 0.05)
+
+    worker = worker_mongo.MongoWorker(concurrency=1, poll_interval=0.01)
+    await worker.start()
+    try:
+        for _ in range(500):
+            if analyzed:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        release.set()
+        await worker.stop()
+    for _ in range(500):
+        if len(readable_after_timeout) == 6:
+            break
+        await asyncio.sleep(0.01)
+
+    # Six hung analyses exceed the pool's spare threads; the document queued behind them still runs
+    assert analyzed == ["good"]
+    assert all(statuses[f"hung-{i}"] == "error" for i in range(6))
+    assert readable_after_timeout == [True] * 6